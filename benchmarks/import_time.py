@@ -0,0 +1,70 @@
+"""
+Import-time benchmark for the pipeline stages.
+
+Starts a fresh interpreter for every sample and times how long it takes to
+import what each stage needs. "legacy" is the import block every old script
+paid at startup (selenium, webdriver_manager, pdfplumber, pandas, winotify).
+
+    python benchmarks/import_time.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules imported per target; a trailing "?" marks modules that may be
+# missing on this platform (winotify is Windows-only)
+TARGETS = {
+    "legacy": ["selenium.webdriver", "webdriver_manager.chrome", "pdfplumber", "pandas", "winotify?"],
+    "cli": ["sldc_pipeline.cli"],
+    "merge": ["sldc_pipeline.merge"],
+    "convert": ["sldc_pipeline.convert"],
+    "scrape": ["sldc_pipeline.scrape"],
+    "run": ["sldc_pipeline.pipeline", "sldc_pipeline.scrape"],
+}
+
+SNIPPET = """
+import importlib, time
+t = time.perf_counter()
+for name in {modules!r}:
+    try:
+        importlib.import_module(name.rstrip("?"))
+    except ImportError:
+        if not name.endswith("?"):
+            raise
+print(time.perf_counter() - t)
+"""
+
+def sample(modules):
+    result = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(modules=modules)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        last = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"
+        return None, last
+    return float(result.stdout.strip()), None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'target':<10}{'median ms':>12}{'min ms':>10}")
+    for name, modules in TARGETS.items():
+        times, error = [], None
+        for _ in range(args.repeat):
+            seconds, error = sample(modules)
+            if seconds is None:
+                break
+            times.append(seconds * 1000)
+        if not times:
+            print(f"{name:<10}{'n/a':>12}  ({error})")
+            continue
+        print(f"{name:<10}{statistics.median(times):>12.1f}{min(times):>10.1f}")
+
+if __name__ == "__main__":
+    main()
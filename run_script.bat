@@ -1,5 +1,8 @@
 @echo off
 
+REM Combined workbooks go to the shared OneDrive folder
+set "SLDC_COMBINED_DIR=D:\OneDrive - CMES\SLDCGuj all Combined Excel"
+
 REM Run the Python script using the globally installed Python
 "D:\Projects\SLDC Gujarat Web Scraping + Excel Conversion\.venv\Scripts\python.exe" "D:\Projects\SLDC Gujarat Web Scraping + Excel Conversion\Everything Combined.py"
 
@@ -0,0 +1,7 @@
+"""
+SLDC Gujarat energy data pipeline.
+
+Run a stage with ``python -m sldc_pipeline <scrape|convert|merge|run|watch>``.
+Stage modules are imported lazily by the CLI, so a merge-only run never loads
+Selenium or pdfplumber.
+"""
@@ -0,0 +1,153 @@
+import os
+import queue
+import shutil
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+# ================= CHROME =================
+
+def make_chrome(download_dir, driver_path):
+    prefs = {
+        "download.default_directory": download_dir,
+        "download.prompt_for_download": False,
+        "plugins.always_open_pdf_externally": True,
+    }
+
+    options = Options()
+    options.add_experimental_option("prefs", prefs)
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1400,900")
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+    return webdriver.Chrome(service=Service(driver_path), options=options)
+
+# ================= SESSION =================
+
+class BrowserSession:
+    """
+    One headless Chrome with its own download folder, so parallel downloads
+    never race each other in wait_for_download().
+    """
+
+    def __init__(self, index, root_dir, driver_path, timeout=30):
+        self.index = index
+        self.download_dir = os.path.join(root_dir, f"session_{index}")
+        self.driver_path = driver_path
+        self.timeout = timeout
+        self.driver = None
+        self.wait = None
+        # Energy currently selected on the loaded page (None = reload needed)
+        self.loaded_energy = None
+
+    def start(self):
+        os.makedirs(self.download_dir, exist_ok=True)
+        self.driver = make_chrome(self.download_dir, self.driver_path)
+        self.wait = WebDriverWait(self.driver, self.timeout)
+        self.loaded_energy = None
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = None
+        self.wait = None
+        self.loaded_energy = None
+
+    def recycle(self):
+        self.close()
+        # Drop half-finished downloads left behind by the crashed browser
+        shutil.rmtree(self.download_dir, ignore_errors=True)
+        self.start()
+
+# ================= POOL =================
+
+class BrowserPool:
+    """
+    Pool of N reusable browser sessions fed from a shared work queue.
+
+    handler(session, task) is called for every task on whichever session is
+    free and must return a status. A session that crashes (WebDriverException)
+    is recycled and the task is re-queued up to max_attempts times.
+    """
+
+    def __init__(self, size, root_dir, max_attempts=2, timeout=30):
+        self.size = max(1, size)
+        self.root_dir = root_dir
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+
+    def run(self, tasks, handler):
+        os.makedirs(self.root_dir, exist_ok=True)
+        driver_path = ChromeDriverManager().install()  # resolve once, not per session
+
+        work = queue.Queue()
+        for task in tasks:
+            work.put((task, 1))
+
+        results = []
+        lock = threading.Lock()
+
+        def worker(index):
+            session = BrowserSession(index, self.root_dir, driver_path, self.timeout)
+            try:
+                session.start()
+            except Exception as e:
+                print(f"❌ Browser session {index} failed to start: {e}")
+                return
+
+            try:
+                while True:
+                    try:
+                        task, attempt = work.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    try:
+                        status = handler(session, task)
+                    except TimeoutException:
+                        status = "timeout"
+                    except WebDriverException as e:
+                        print(f"♻️ Session {index} crashed on {task}: {e.msg}")
+                        try:
+                            session.recycle()
+                        except Exception as e2:
+                            print(f"❌ Could not restart session {index}: {e2}")
+                            work.put((task, attempt))
+                            return
+                        if attempt < self.max_attempts:
+                            work.put((task, attempt + 1))
+                            continue
+                        status = "error"
+                    except Exception as e:
+                        print(f"❌ Error on {task}: {e}")
+                        status = "error"
+
+                    with lock:
+                        results.append((task, status))
+            finally:
+                session.close()
+                shutil.rmtree(session.download_dir, ignore_errors=True)
+
+        threads = [
+            threading.Thread(target=worker, args=(i,), daemon=True)
+            for i in range(self.size)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Anything left means every session died before finishing the queue
+        while not work.empty():
+            task, _ = work.get_nowait()
+            results.append((task, "error"))
+
+        return results
@@ -0,0 +1,119 @@
+"""Command line entry point. Each subcommand imports only the stage it runs."""
+import argparse
+
+def cmd_scrape(args):
+    from .scrape import pdf_extraction
+    pdf_extraction(sites=args.sites, refresh_catalog=args.refresh_catalog)
+
+def cmd_sites(args):
+    from .site_catalog import print_catalog
+    print_catalog(args.names, refresh=args.refresh)
+
+def cmd_convert(args):
+    from .convert import excel_conversion
+    excel_conversion(force=args.force)
+
+def cmd_merge(args):
+    from .merge import excel_merging
+    excel_merging(force=args.force, workers=args.workers)
+
+def cmd_run(args):
+    if args.sequential:
+        from .scrape import pdf_extraction
+        from .convert import excel_conversion
+        from .merge import excel_merging
+        pdf_extraction()
+        excel_conversion(force=args.force)
+        excel_merging(force=args.force)
+    else:
+        from .pipeline import streaming_pipeline
+        streaming_pipeline(force=args.force)
+
+def cmd_watch(args):
+    from .pipeline import watch_downloads
+    watch_downloads()
+
+def cmd_queue(args):
+    from . import job_queue
+    if args.action == "submit":
+        job_queue.submit(force=args.force)
+    elif args.action == "work":
+        job_queue.work_processes(args.processes, follow=args.follow)
+    else:
+        job_queue.print_status()
+
+def cmd_dashboard(args):
+    import os
+    import subprocess
+    import sys
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    # streamlit runs dashboard.py as a script, so the package root must be importable
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (os.path.dirname(here), env.get("PYTHONPATH")) if p)
+    subprocess.run(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(here, "dashboard.py"),
+         "--server.port", str(args.port)],
+        env=env,
+    )
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="sldc_pipeline",
+        description="Scrape, convert and merge SLDC Gujarat energy PDFs."
+    )
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the command (cProfile, sampled stacks, tracemalloc) into PROFILE_DIR")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scrape = sub.add_parser("scrape", help="download monthly PDFs")
+    scrape.add_argument("--sites", default=None,
+                        help='"all" or comma-separated site names (default SLDC_SITES, else ENERGY_NAMES)')
+    scrape.add_argument("--refresh-catalog", action="store_true",
+                        help="re-read the site list from the SLDC page even if the cached one is recent")
+    scrape.set_defaults(func=cmd_scrape)
+    convert = sub.add_parser("convert", help="convert downloaded PDFs to Excel")
+    convert.set_defaults(func=cmd_convert)
+    merge = sub.add_parser("merge", help="merge monthly Excel files per site")
+    merge.add_argument("--workers", type=int, default=None,
+                       help="sites merged in parallel (default MERGE_WORKERS, 1 = one by one)")
+    merge.set_defaults(func=cmd_merge)
+
+    run = sub.add_parser("run", help="scrape, convert and merge with the stages overlapping")
+    run.add_argument("--sequential", action="store_true",
+                     help="run the three stages one after another instead")
+    run.set_defaults(func=cmd_run)
+
+    for stage in (convert, merge, run):
+        stage.add_argument("--force", action="store_true",
+                           help="rebuild outputs even if their source PDFs did not change")
+
+    sites = sub.add_parser("sites", help="list the SLDC dropdown's sites, or resolve names against it")
+    sites.add_argument("names", nargs="*", help="names to look up (matched loosely)")
+    sites.add_argument("--refresh", action="store_true", help="re-read the site list from the SLDC page")
+    sites.set_defaults(func=cmd_sites)
+
+    sub.add_parser("watch", help="convert PDFs dropped into the downloads folder").set_defaults(func=cmd_watch)
+
+    jobs = sub.add_parser("queue", help="distributed convert/merge over a shared job queue (QUEUE_PATH)")
+    jobs.add_argument("action", choices=["submit", "work", "status"],
+                      help="submit: queue pending work, work: run jobs, status: show the queue")
+    jobs.add_argument("--force", action="store_true", help="submit: queue every PDF and site")
+    jobs.add_argument("--processes", type=int, default=1, help="work: worker processes on this host")
+    jobs.add_argument("--follow", action="store_true",
+                      help="work: keep waiting for new jobs instead of exiting when the queue drains")
+    jobs.set_defaults(func=cmd_queue)
+
+    dashboard = sub.add_parser("dashboard", help="browse the merged data in a local Streamlit app")
+    dashboard.add_argument("--port", type=int, default=8501)
+    dashboard.set_defaults(func=cmd_dashboard)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        from .profiling import profile_run
+        with profile_run(args.command):
+            args.func(args)
+    else:
+        args.func(args)
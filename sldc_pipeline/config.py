@@ -0,0 +1,200 @@
+"""
+Paths and site list shared by every stage.
+
+The folders default to the project layout on the scheduling machine and can be
+overridden with SLDC_PDF_DIR / SLDC_EXCEL_DIR / SLDC_COMBINED_DIR.
+"""
+import os
+
+# ================= PATHS =================
+
+PROJECT_DIR = "D:/Projects/SLDC Gujarat Web Scraping + Excel Conversion"
+
+PDF_DIR = os.environ.get("SLDC_PDF_DIR", f"{PROJECT_DIR}/downloads")
+EXCEL_DIR = os.environ.get("SLDC_EXCEL_DIR", f"{PROJECT_DIR}/excel_conversion")
+COMBINED_DIR = os.environ.get("SLDC_COMBINED_DIR", f"{PROJECT_DIR}/all_combined_excel_files")
+
+ICON_PATH = r"C:\Users\Hari.Srinivas\Downloads\images.png"
+
+# ================= SCRAPING =================
+
+ENERGY_NAMES = [
+    "HETENERGY(BHILDI-HYBRID)",
+    "66KVYASHASWA(HYBRID)",
+    "SANATHAL(HEM_URJA_HYBRID)",
+    "MOTA_DEVLIYA(HETENERGY_HYBRID)",
+    "66KVCLEANMAXPIPARADI(HYBRID)",
+    "SEPC(HYBRID)",
+    "66_KV_MOTA_KHIJADIYA(SALPIPALIYA_WF)",
+    "66_KV_MOTA_KHIJADIYA(SALPIPALIYA_HYBRID)",
+    "DHARAGAR(GNESL)",
+    "66 KV GHELDA(GNESL)",
+    "220KV_NAGPUR(OP_WIND)HYBRID"
+]
+
+YEAR = "2025"
+
+MONTH_INDEX = {
+    "JAN": "1", "FEB": "2", "MAR": "3", "APR": "4",
+    "MAY": "5", "JUN": "6", "JUL": "7", "AUG": "8",
+    "SEP": "9", "OCT": "10", "NOV": "11", "DEC": "12"
+}
+
+BASE_URL = "https://www.sldcguj.com/Energy_Block_New.php"
+
+# Sites to scrape: "" = ENERGY_NAMES, "all" = every site in the page's dropdown,
+# or a comma-separated list of names (matched loosely, see site_catalog.py)
+SCRAPE_SITES = os.environ.get("SLDC_SITES", "")
+# The dropdown's site list, cached between runs and re-read when older than this
+CATALOG_PATH = os.path.join(PDF_DIR, ".site_catalog.json")
+CATALOG_TTL_HOURS = float(os.environ.get("SLDC_CATALOG_TTL_HOURS", "24"))
+
+# Number of headless Chrome sessions working the (energy, month) queue
+POOL_SIZE = 3
+# Each session downloads into its own sub-folder here before the file is moved
+SESSION_DIR = os.path.join(PDF_DIR, ".sessions")
+# Months that failed (timeout / site down) are retried first on the next run
+RETRY_QUEUE_PATH = os.path.join(PDF_DIR, "retry_queue.json")
+# Content-addressed copies of every PDF revision, see pdf_store.py
+STORE_DIR = os.path.join(PDF_DIR, ".store")
+
+# ================= PIPELINE =================
+
+# Bounded hand-off between the scraper and the conversion workers
+PIPELINE_QUEUE_SIZE = 8
+CONVERT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# `convert` hands each PDF's tables to a write-behind stage (write_behind.py):
+# OUTPUT_WRITERS processes serialize them while the next PDF is parsed, with at
+# most OUTPUT_QUEUE_SIZE tables waiting. 0 writes inline. OUTPUT_SINKS lists the
+# formats written per PDF: "xlsx" and/or "csv" (one <name>.<sheet>.csv per sheet)
+OUTPUT_WRITERS = 2
+OUTPUT_QUEUE_SIZE = 4
+OUTPUT_SINKS = [sink.strip() for sink in os.environ.get("SLDC_OUTPUT_SINKS", "xlsx").split(",") if sink.strip()]
+
+# Sites merged at once by excel_merging(); 1 merges them one by one in-process
+MERGE_WORKERS = CONVERT_WORKERS
+
+# Parallel conversions and merges are admitted while their estimated memory
+# stays under this budget and the machine keeps MEMORY_RESERVE_MB free; the
+# worker count also shrinks under memory pressure or a saturated CPU (governor.py)
+MEMORY_BUDGET_MB = int(os.environ.get("SLDC_MEMORY_BUDGET_MB", os.environ.get("SLDC_MERGE_MEMORY_MB", "2048")))
+MEMORY_RESERVE_MB = int(os.environ.get("SLDC_MEMORY_RESERVE_MB", "512"))
+# Starting estimates per job, corrected by the peak memory jobs actually reach:
+# PDF bytes x CONVERT_MEMORY_FACTOR + CONVERT_PAGE_MB per page (pdfplumber keeps
+# every char object of a page), workbook bytes x MERGE_MEMORY_FACTOR (openpyxl's
+# in-memory blow-up) + MERGE_ROW_KB per row
+CONVERT_MEMORY_FACTOR = 20
+CONVERT_PAGE_MB = 6
+MERGE_MEMORY_FACTOR = 40
+MERGE_ROW_KB = 2
+# How often memory and CPU load are re-checked, and the load per core above
+# which no workers are added
+GOVERNOR_INTERVAL = 1.0
+GOVERNOR_CPU_HIGH = 0.9
+# How <site>_combined.xlsx is split once a site's history grows (merge.py):
+#   "rows" - one file while every sheet fits in COMBINED_MAX_ROWS, then files of
+#            whole months of at most that many rows per sheet
+#   "year" - one file per year (a year over COMBINED_MAX_ROWS is split further)
+#   "none" - always a single file (Excel stops at 1,048,576 rows per sheet)
+# A split site's <site>_combined.xlsx holds only an Index sheet of its partitions.
+COMBINED_PARTITION = os.environ.get("SLDC_COMBINED_PARTITION", "rows")
+COMBINED_MAX_ROWS = int(os.environ.get("SLDC_COMBINED_MAX_ROWS", "250000"))
+
+# Distributed mode (job_queue.py): SQLite job queue on storage every worker
+# host reaches, e.g. a share mounted as the SLDC_*_DIR folders
+QUEUE_PATH = os.environ.get("SLDC_QUEUE_PATH", os.path.join(PDF_DIR, ".queue", "jobs.sqlite3"))
+# A worker that stops sending heartbeats loses its job after QUEUE_LEASE_SECONDS
+QUEUE_LEASE_SECONDS = 120
+QUEUE_HEARTBEAT_SECONDS = 20
+QUEUE_MAX_ATTEMPTS = 3
+QUEUE_POLL_SECONDS = 2.0
+
+# Quiet period before a dropped-in PDF is considered complete (watch mode)
+WATCH_DEBOUNCE_SECONDS = 2.0
+
+# Per-PDF data-quality reports (validation.py); a summed column may differ from
+# the PDF's TOTAL row by this fraction of the total
+QUALITY_DIR = os.path.join(EXCEL_DIR, "quality_reports")
+VALIDATION_TOLERANCE = 0.001
+
+# `--profile` runs (profiling.py) write cProfile output, sampled stacks and
+# tracemalloc reports to PROFILE_DIR/<time>_<command>/, next to the quality reports
+PROFILE_DIR = os.path.join(EXCEL_DIR, "profiles")
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+PROFILE_TRACEBACK_DEPTH = 10     # frames kept per tracemalloc allocation
+
+# OCR fallback for scanned pages (ocr.py); needs pytesseract + tesseract installed
+OCR_ENABLED = os.environ.get("SLDC_OCR", "1") != "0"
+OCR_WORKERS = 2
+OCR_DPI = 300
+OCR_CACHE_DIR = os.path.join(PDF_DIR, ".ocr_cache")
+
+# ================= MASTER DATASET =================
+
+# All sites' rows + monthly aggregates, written to COMBINED_DIR as
+# <MASTER_NAME>.xlsx and <MASTER_NAME>.parquet after merging (master.py)
+MASTER_NAME = "SLDC_master"
+# Master column -> (header keyword, keyword the header must not contain, numeric)
+MASTER_FIELDS = {
+    "DISCOM": ("DISCOM", None, False),
+    "Installed Capacity": ("CAPACITY", None, True),
+    "Active Energy": ("ACTIVE", "REACTIVE", True),
+    "Reactive Energy": ("REACTIVE", None, True),
+}
+
+# ================= NOTIFICATIONS =================
+
+# auto | winotify | stdout | webhook | file | none (see notify.py)
+NOTIFY_BACKEND = os.environ.get("SLDC_NOTIFY", "auto")
+NOTIFY_WEBHOOK_URL = os.environ.get("SLDC_NOTIFY_WEBHOOK", "")
+NOTIFY_FILE = os.environ.get("SLDC_NOTIFY_FILE", os.path.join(PDF_DIR, "notifications.jsonl"))
+# Longest time process exit waits for queued notifications
+NOTIFY_FLUSH_SECONDS = 5.0
+
+# ================= PDF TABLE SECTIONS =================
+
+# One entry per table type in the SLDC PDF. extract_sections() reads them all
+# in a single pass, so adding a type (hybrid, storage, REC, ...) is just a new
+# entry here.
+#   start         text of the row that opens the section
+#   header        every marker must be in the row that is captured as header
+#   name_column   header text of the owner/entity column (ROW_FILTERS drop texts)
+#   continuation  cell positions of data rows on page 2+ whose blank columns
+#                 collapsed, or None to use align_to_header() for them too
+SECTIONS = [
+    {
+        "name": "wind",
+        "sheet": "Wind Energy",
+        "start": "SHARE OF WIND FARM OWNER",
+        "header": ["SR NO", "WIND FARM OWNER"],
+        "name_column": "WIND FARM OWNER",
+        "continuation": [0, 2, 3, 4, 5, 6, 7],
+    },
+    {
+        "name": "solar",
+        "sheet": "Solar Energy",
+        "start": "SHARE OF SOLAR GENERATOR",
+        "header": ["SOLAR ENTITY NAME"],
+        "name_column": "SOLAR ENTITY NAME",
+        "continuation": None,
+    },
+]
+
+# A row containing this ends the current section
+TOTAL_MARKER = "TOTAL"
+
+# Row filters, checked on every raw table row before it is aligned to the
+# section header (row_filters.py). Each entry whose key is in the PDF's name
+# applies, "*" to every PDF:
+#   keep  only rows mentioning one of these texts are kept (e.g. the owners
+#         a site is scraped for)
+#   drop  rows whose owner/entity column (name_column) contains one of these
+#         texts, in any case, are left out
+ROW_FILTERS = {
+    "*": {"drop": ["Period Considered for the month",
+                   "Active Energy Received From",
+                   "Reactive Energy Supplied to",
+                   "GUJARAT ENERGY TRANSMISSION CORPORATION LIMITED"]},
+    "SEPC": {"keep": ["CLEAN MAX", "CLEANMAX"]},
+}
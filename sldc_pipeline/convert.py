@@ -0,0 +1,378 @@
+"""Stage 2: extract the Wind / Solar tables from each PDF into one workbook per PDF."""
+import os
+from collections import namedtuple
+from contextlib import nullcontext
+
+import pandas as pd
+
+from .config import EXCEL_DIR, OUTPUT_WRITERS, PDF_DIR, SECTIONS
+from .notify import toast
+from .ocr import ocr_pages
+from .pdf_access import MappedPdf
+from .partitions import date_string, index_for
+from .pdf_store import get_store
+from .profiling import profiled
+from .row_filters import name_index, row_filter_for
+from .sections import RowClassifier, row_text
+from .stable_output import write_outputs
+from .validation import write_report
+from .write_behind import WriteBehind
+
+# --- FIXED clean_empty_columns ---
+def clean_empty_columns(df):
+    """
+    Removes columns from a DataFrame that have a blank header (None or '')
+    AND contain no data (all values are None, NA, or '').
+    """
+    if df.empty:
+        return df
+
+    # 1. Find columns where the header name is blank ('' or None)
+    is_blank_col = (df.columns.astype(str).str.strip() == '') | (df.columns.isna())
+    
+    # 2. Find columns where all values are NA or blank strings
+    # .replace handles both '' and None, .isna() catches all
+    is_all_na_col = df.replace('', pd.NA).isna().all()
+    
+    # 3. We want to drop columns that are BOTH blank AND all-NA
+    is_to_drop = is_blank_col & is_all_na_col
+    
+    # 4. Select columns that are NOT to be dropped
+    return df.loc[:, ~is_to_drop]
+
+def align_to_header(row, full_header):
+    """
+    (This is your provided function, unchanged)
+    """
+    header_len = len(full_header)
+
+    data_values = [cell for cell in row]
+
+    if len(row) == header_len:
+        return row
+
+    header_nonempty_indices = [i for i, h in enumerate(full_header) if h and h.strip()]
+    nonempty_count = len(header_nonempty_indices)
+
+    if len(data_values) == nonempty_count:
+        aligned = [""] * header_len
+        di = 0
+        for idx in header_nonempty_indices:
+            aligned[idx] = data_values[di]
+            di += 1
+        return aligned
+
+    aligned_row = [""] * header_len
+    data_index = 0
+    for i in range(header_len):
+        if full_header[i] and full_header[i].strip():
+            if data_index < len(data_values):
+                aligned_row[i] = data_values[data_index]
+                data_index += 1
+            else:
+                aligned_row[i] = ""
+        else:
+            aligned_row[i] = ""
+
+    if data_index < len(data_values) and len(data_values) > 0:
+        print(f"DEBUG WARNING: Row has unmapped data: {data_values[data_index:]}. Returning None.")
+        return None
+
+    return aligned_row
+
+# header   captured header row, or None
+# rows     data rows aligned to the header
+# totals   the section's TOTAL rows, aligned to the header
+# dropped  {"page", "row"} of rows whose cells could not be mapped to the header
+# unwanted rows left out by a ROW_FILTERS drop text, aligned to the header; they
+#          still count for clean_empty_columns() and the last Sr No, as before
+Section = namedtuple("Section", "header rows totals dropped unwanted")
+
+@profiled("extract_sections")
+def extract_sections(pdf_path, sections=SECTIONS, mapped=None, row_filter=None):
+    """
+    Reads every table row of the PDF once and sorts data rows into the
+    configured sections (config.SECTIONS). Each row is normalized and tagged
+    once by a RowClassifier (section start, header, TOTAL, data, keep
+    filter); the normalized text is kept with the row for the final
+    header-remnant check. The PDF's row filter (ROW_FILTERS, or `row_filter`)
+    is applied before a row is aligned, see row_filters.py.
+
+    `mapped` is a MappedPdf of pdf_path that the caller already opened.
+
+    Returns {section name: Section}. Besides the header and rows, a Section
+    keeps the section's TOTAL rows (aligned to the header) and the rows that
+    could not be mapped onto the header, for validation.py.
+    """
+    specs = {spec["name"]: spec for spec in sections}
+    headers = {name: None for name in specs}
+    header_slots = {}  # name -> indices of non-empty header cells
+    header_texts = {}
+    name_slots = {}  # name -> index of the owner/entity column in the header
+    rows = {name: [] for name in specs}
+    row_texts = {name: [] for name in specs}
+    totals = {name: [] for name in specs}
+    dropped = {name: [] for name in specs}
+    unwanted = {name: [] for name in specs}
+    unwanted_texts = {name: [] for name in specs}
+    current = None
+    total_count = 0
+
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    if row_filter is None:
+        row_filter = row_filter_for(base_name)
+    classifier = RowClassifier(sections, row_filter.keep, row_filter.drop_markers)
+
+    def continues(name, clean_row, page_num):
+        """Page 2+ row whose blank columns collapsed, rebuilt from the continuation map."""
+        return bool(specs[name]["continuation"]) and page_num > 0 and len(clean_row) < len(headers[name])
+
+    def fit_to_header(name, clean_row, page_num):
+        """
+        (row stretched to the section header or None, rebuilt) where rebuilt
+        means only some of the cells were kept (Page 2+ continuation map).
+        """
+        header = headers[name]
+        continuation = specs[name]["continuation"]
+        if continues(name, clean_row, page_num):
+            print(f"DEBUG: Applying Page 2+ {name} row logic for Sr No '{clean_row[0].strip()}'")
+            try:
+                # Manually extract the data values from their known positions
+                data_list = [clean_row[i] for i in continuation]
+                slots = header_slots[name]
+
+                if len(data_list) == len(slots):
+                    norm_row = [""] * len(header)
+                    for idx, val in zip(slots, data_list):
+                        norm_row[idx] = val
+                    return norm_row, True
+                print(f"DEBUG WARNING: Page 2 data map mismatch. Data({len(data_list)}) vs Header({len(slots)})")
+
+            except IndexError:
+                print(f"DEBUG WARNING: Page 2 {name} row IndexError. Row: {clean_row}")
+            return None, False
+
+        # Keeps every non-empty cell in order
+        return align_to_header(clean_row, header), False
+
+    map_ctx = MappedPdf(pdf_path) if mapped is None else nullcontext(mapped)
+    with map_ctx as mapped, mapped.open() as pdf:
+        page_tables = [page.extract_tables() for page in pdf.pages]
+
+        # No tables and not a single character: a scanned page, read it with OCR
+        scanned = [i for i, page in enumerate(pdf.pages) if not page_tables[i] and not page.chars]
+        if scanned:
+            print(f"🔍 {len(scanned)} page(s) without a text layer, trying OCR")
+            for page_num, ocr_rows in ocr_pages(pdf_path, scanned, mapped).items():
+                page_tables[page_num] = [ocr_rows]
+
+        for page_num, tables in enumerate(page_tables):
+            print(f"--- Processing page {page_num + 1} ---")
+
+            for table in tables:
+                if not table: continue
+
+                for row in table:
+                    if not row: continue
+
+                    # FIX: Use un-stripped row data, as per your note
+                    clean_row = [cell if cell else "" for cell in row]
+
+                    if all(cell == "" for cell in clean_row):
+                        continue
+
+                    tags = classifier.classify(clean_row)
+
+                    # Section detection (first configured section wins)
+                    if tags.start:
+                        current = tags.start
+                        print(f"DEBUG: Found {current} section header on page {page_num + 1}.")
+                        continue
+
+                    # Stop when TOTAL encountered, keeping the row to check the data against
+                    if tags.total and current is not None:
+                        total_count += 1
+                        print(f"DEBUG: Found 'TOTAL' row (Count: {total_count}) on page {page_num + 1}.")
+                        if headers[current]:
+                            total_row, _ = fit_to_header(current, clean_row, page_num)
+                            if total_row and len(total_row) == len(headers[current]):
+                                totals[current].append(total_row)
+                            else:
+                                dropped[current].append({"page": page_num + 1, "row": clean_row, "total": True})
+                        current = None
+                        continue
+
+                    if current is None:
+                        continue
+                    header = headers[current]
+
+                    # Capture headers
+                    if not header and current in tags.headers:
+                        header = headers[current] = clean_row
+                        header_slots[current] = [i for i, h in enumerate(header) if h and h.strip()]
+                        header_texts[current] = tags.text
+                        name_slots[current] = name_index(header, specs[current]["name_column"])
+                        print(f"DEBUG: Captured {current} header. Length: {len(header)}")
+                        if row_filter.drop and name_slots[current] is None:
+                            print(f"DEBUG WARNING: Could not find '{specs[current]['name_column']}' column in {base_name} to filter.")
+                        continue
+
+                    if not header:
+                        continue
+
+                    # --- Data Capture Logic (with Page 2+ continuation fix) ---
+                    if not tags.data: # Only process data rows
+                        continue
+
+                    # Keep filter on the raw row: never aligned if it fails. A
+                    # continuation row keeps only some cells, it is checked once rebuilt
+                    if not tags.owner and not continues(current, clean_row, page_num):
+                        continue
+
+                    norm_row, rebuilt = fit_to_header(current, clean_row, page_num)
+                    text = tags.text
+                    owner = tags.owner
+                    if rebuilt:
+                        # Only some cells were kept, so the row text changes
+                        text = row_text(norm_row)
+                        owner = classifier.owner_ok(norm_row)
+
+                    # --- Append logic ---
+                    if not norm_row or len(norm_row) != len(header):
+                        dropped[current].append({"page": page_num + 1, "row": clean_row})
+                    elif owner:
+                        # Drop texts: only rows whose raw text has one need their owner cell checked
+                        if (tags.drop and name_slots[current] is not None
+                                and row_filter.drops(norm_row[name_slots[current]])):
+                            unwanted[current].append(norm_row)
+                            unwanted_texts[current].append(text)
+                            continue
+                        rows[current].append(norm_row)
+                        row_texts[current].append(text)
+
+    # Final check: Remove any rows that are just header remnants
+    for name, header_text in header_texts.items():
+        rows[name] = [r for r, text in zip(rows[name], row_texts[name]) if text != header_text]
+        unwanted[name] = [r for r, text in zip(unwanted[name], unwanted_texts[name]) if text != header_text]
+
+    counts = ", ".join(f"{len(rows[name])} {name}" for name in specs)
+    print(f"--- Final Count for {base_name}: {counts} ---")
+    return {
+        name: Section(headers[name], rows[name], totals[name], dropped[name], unwanted[name])
+        for name in specs
+    }
+
+def convert_pdf(pdf_path, output_folder, mapped=None, writer=None):
+    """
+    Extracts one PDF into <output_folder>/<name>.xlsx. Returns False when it
+    has no data. With a WriteBehind `writer` the workbook is only queued
+    (keyed by `pdf_path`) and written in the background.
+    """
+    filename = os.path.basename(pdf_path)
+    base_name = os.path.splitext(filename)[0]
+    excel_path = os.path.join(output_folder, f"{base_name}.xlsx")
+
+    print(f"\n--- Processing {filename} ---")
+    sections = extract_sections(pdf_path, mapped=mapped)
+
+    if not any(section.rows or section.unwanted for section in sections.values()):
+        print(f"❌ No Wind/Solar data in: {filename}")
+        return False
+
+    date_str = date_string(base_name)
+
+    frames = {}
+    for spec in SECTIONS:
+        section = sections[spec["name"]]
+        df = pd.DataFrame(section.rows + section.unwanted, columns=section.header) if section.header else pd.DataFrame()
+        df = clean_empty_columns(df)
+        # Rows left out by a drop text only count for the columns kept above
+        df = df.iloc[:len(section.rows)]
+
+        df = df.replace(r'^\s*$', pd.NA, regex=True)
+        df = df.dropna(thresh=2).reset_index(drop=True)
+
+        if not df.empty:
+            df.insert(1, "Date", date_str)
+            df.rename(columns={"SSr No": "Sr No"}, inplace=True)
+            if "Sr No" in df.columns:
+                df["Sr No"] = range(1, len(df)+1)
+
+        frames[spec["name"]] = df
+
+    # The report is a by-product, a failed check must not cost the workbook
+    try:
+        write_report(base_name, sections, frames, bool(row_filter_for(base_name).keep))
+    except Exception as e:
+        print(f"⚠️ Could not write the quality report for {filename}: {e}")
+
+    # Every row can be filtered out above; openpyxl can't save a workbook without sheets
+    if all(df.empty for df in frames.values()):
+        print(f"❌ No Wind/Solar data left after filtering in: {filename}")
+        return False
+
+    sheets = {spec["sheet"]: frames[spec["name"]] for spec in SECTIONS if not frames[spec["name"]].empty}
+    if writer is not None:
+        writer.submit(pdf_path, excel_path, sheets)
+        return True
+    if write_outputs(excel_path, sheets):
+        print(f"✅ Saved Excel for → {filename}")
+    else:
+        print(f"⏭️ Excel for {filename} unchanged, not rewritten")
+    return True
+
+@profiled("excel_conversion", snapshot=True)
+def excel_conversion(force=False):
+    """Converts every PDF in PDF_DIR whose content changed since its last conversion (all with force)."""
+    input_folder = PDF_DIR
+    output_folder = EXCEL_DIR
+    os.makedirs(output_folder, exist_ok=True) # Ensure output folder exists
+
+    store = get_store()
+    unchanged = 0
+    failed = 0
+    digests = {}  # pdf path -> hash of the content being written
+
+    def written(pdf_path, changed, error):
+        nonlocal failed
+        digest = digests.pop(pdf_path)
+        if error is not None:
+            # Not marked converted, so the next run tries again
+            print(f"❌ Could not write Excel for {os.path.basename(pdf_path)}: {error}")
+            failed += 1
+            return
+        store.mark_converted(pdf_path, True, digest=digest)
+        if changed:
+            print(f"✅ Saved Excel for → {os.path.basename(pdf_path)}")
+        else:
+            print(f"⏭️ Excel for {os.path.basename(pdf_path)} unchanged, not rewritten")
+
+    # Workbooks are written in the background while the next PDF is parsed
+    writer = WriteBehind(on_done=written) if OUTPUT_WRITERS > 0 else nullcontext()
+    with writer:
+        for filename in index_for(input_folder, "pdf").names():
+            pdf_path = os.path.join(input_folder, filename)
+            # The change check and the extraction read the same mapping
+            with MappedPdf(pdf_path) as mapped:
+                if not force and not store.needs_conversion(pdf_path, output_folder, mapped):
+                    unchanged += 1
+                    continue
+                if OUTPUT_WRITERS <= 0:
+                    store.mark_converted(pdf_path, convert_pdf(pdf_path, output_folder, mapped), mapped)
+                    continue
+                digests[pdf_path] = store.digest(pdf_path, mapped)
+                if not convert_pdf(pdf_path, output_folder, mapped, writer=writer):
+                    store.mark_converted(pdf_path, False, digest=digests.pop(pdf_path))
+
+    if unchanged:
+        print(f"⏭️ {unchanged} PDF(s) unchanged since their last conversion, skipped")
+    if failed:
+        print(f"⚠️ {failed} workbook(s) could not be written, they are retried on the next run")
+
+    # ✅ Toast Notification
+    toast(
+        app_id="SLDC Gujarat Data Extraction",
+        title="PDF to Excel Conversion Complete",
+        msg="Wind & Solar data successfully extracted and saved to Excel.",
+        duration="short"
+    )
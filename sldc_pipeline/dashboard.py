@@ -0,0 +1,98 @@
+"""
+Local dashboard over the merged data: `python -m sldc_pipeline dashboard`.
+
+This file is a Streamlit script (streamlit runs it top to bottom on every
+interaction); all data access goes through query.py, so a rerun only reads
+parquet files that changed since the last merge.
+"""
+import altair as alt
+import streamlit as st
+
+from sldc_pipeline import query
+from sldc_pipeline.config import MASTER_FIELDS, SECTIONS
+
+st.set_page_config(page_title="SLDC Gujarat Energy", page_icon="⚡", layout="wide")
+st.title("⚡ SLDC Gujarat Energy")
+
+site_list = query.sites()
+by_site = query.aggregate("Monthly by Site")
+if not site_list or by_site.empty:
+    st.warning("No merged data yet. Run `python -m sldc_pipeline merge` first.")
+    st.stop()
+
+# ================= FILTERS =================
+
+sections = {spec["sheet"]: spec["name"] for spec in SECTIONS}
+measures = [field for field, (_, _, numeric) in MASTER_FIELDS.items() if numeric]
+
+with st.sidebar:
+    sheet = st.radio("Section", list(sections))
+    section = sections[sheet]
+    chosen_sites = st.multiselect("Sites", site_list, default=site_list)
+    months = sorted(by_site["Month"].dropna().unique())
+    if len(months) > 1:
+        first, last = st.select_slider("Months", options=months, value=(months[0], months[-1]))
+    else:
+        first = last = months[0]
+    measure = st.selectbox("Measure", measures, index=measures.index("Active Energy") if "Active Energy" in measures else 0)
+
+in_range = by_site["Month"].between(first, last) & (by_site["Section"] == section)
+view = by_site[in_range & by_site["Site"].isin(chosen_sites)]
+
+# ================= MONTHLY TOTALS =================
+
+st.subheader(f"{measure} by month")
+st.altair_chart(
+    alt.Chart(view).mark_bar().encode(
+        x=alt.X("Month:O", title=None),
+        y=alt.Y(field=measure, type="quantitative", aggregate="sum", title=measure),
+        color=alt.Color("Site:N"),
+        tooltip=["Month", "Site", alt.Tooltip(field=measure, type="quantitative", format=",.3f")],
+    ),
+    width="stretch",
+)
+
+left, right = st.columns(2)
+
+with left:
+    st.subheader("Top owners")
+    by_owner = query.aggregate("Monthly by Owner")
+    owners = (
+        by_owner[by_owner["Month"].between(first, last) & (by_owner["Section"] == section)]
+        .groupby("Owner", dropna=False)[measure].sum()
+        .nlargest(15)
+        .reset_index()
+    )
+    st.altair_chart(
+        alt.Chart(owners).mark_bar().encode(
+            x=alt.X(field=measure, type="quantitative"),
+            y=alt.Y("Owner:N", sort="-x", title=None),
+        ),
+        width="stretch",
+    )
+
+with right:
+    st.subheader("By DISCOM")
+    by_discom = query.aggregate("Monthly by DISCOM")
+    discoms = by_discom[by_discom["Month"].between(first, last) & (by_discom["Section"] == section)]
+    st.dataframe(
+        discoms.pivot_table(index="DISCOM", columns="Month", values=measure, aggfunc="sum"),
+        width="stretch",
+    )
+
+# ================= ROWS OF ONE SITE / MONTH =================
+
+st.subheader("Rows")
+pick_site, pick_month = st.columns(2)
+site_name = pick_site.selectbox("Site", chosen_sites or site_list)
+month = pick_month.selectbox("Month", [m for m in months if first <= m <= last][::-1])
+
+rows = query.site_rows(site_name, months=[month], section=section)
+st.caption(f"{len(rows)} rows")
+st.dataframe(rows, width="stretch", hide_index=True)
+st.download_button(
+    "Download CSV",
+    rows.to_csv(index=False).encode("utf-8"),
+    file_name=f"{site_name}_{month}_{section}.csv",
+    mime="text/csv",
+)
@@ -0,0 +1,98 @@
+"""
+Archive-wide dictionary of the repeating text columns (owner / entity names,
+DISCOM).
+
+The same few hundred names repeat in every month of every site. As plain
+string columns, each repetition is its own Python object. Encoded as pandas
+categoricals, each row holds only a small integer code into one shared list
+of values, and concat / groupby work on those codes.
+
+The dictionary lives in COMBINED_DIR/.master/dictionary.json as
+{field: [values]}. It is append-only, so a value keeps its code for good and
+frames encoded in different processes or runs share one dtype. Merges only
+read it; their new values are added in memory. build_master(), which runs
+once after the merges, adds the stripped names of the master dataset and
+writes the grown dictionary back.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .stable_output import write_json
+
+DICTIONARY_NAME = "dictionary.json"
+
+class GlobalDictionary:
+    def __init__(self, path):
+        self.path = path
+        self.values = {}    # field -> [value, ...], position = code
+        self.dtypes = {}    # field -> CategoricalDtype of the current values
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.values = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable dictionary {path}: {e}")
+
+    def add(self, field, values):
+        """Appends the values `field` doesn't know yet (NaN is not a value)."""
+        if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+            values = values.cat.categories
+        known = self.values.setdefault(field, [])
+        seen = set(known)
+        new = [v for v in pd.unique(pd.Series(values, dtype=object).dropna()) if v not in seen]
+        if new:
+            known.extend(new)
+            self.dtypes.pop(field, None)
+            self.dirty = True
+
+    def dtype(self, field):
+        """Shared CategoricalDtype of `field`; frames cast to it concat without recoding."""
+        if field not in self.dtypes:
+            self.dtypes[field] = pd.CategoricalDtype(self.values.get(field, []))
+        return self.dtypes[field]
+
+    def encode(self, series, field):
+        """`series` as codes into the dictionary of `field`, adding unseen values."""
+        self.add(field, series)
+        return series.astype(self.dtype(field))
+
+    def save(self):
+        """Writes the dictionary back if values were added."""
+        if self.dirty:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_json(self.path, self.values)
+            self.dirty = False
+
+def load_dictionary(folder):
+    """
+    A fresh copy of the dictionary in `folder`. Each merge gets its own, so
+    what it adds (e.g. names still padded with spaces) never reaches the file.
+    """
+    return GlobalDictionary(os.path.join(folder, DICTIONARY_NAME))
+
+def decode(series):
+    """A categorical column back as plain values of its categories' dtype."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(series.cat.categories.dtype)
+    return series
+
+def strip(series):
+    """
+    series.str.strip() as a categorical with sorted categories. Only the
+    distinct values are stripped; names that differ just in padding merge.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Only the values in use: a column encoded with the shared dictionary
+        # lists every site's names, which must not reach this site's slice
+        series = series.cat.remove_unused_categories()
+        codes, values = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, values = pd.factorize(series)
+    remap, stripped = pd.factorize(pd.Index(values, dtype=object).str.strip(), sort=True)
+    # code -1 (missing) picks the appended -1
+    codes = np.append(remap, -1)[codes]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=stripped), index=series.index)
@@ -0,0 +1,167 @@
+import json
+import os
+import threading
+import time
+
+from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+# ================= ADAPTIVE TIMEOUT =================
+
+class LatencyTracker:
+    """
+    Keeps the last `window` response times and derives the next timeout from
+    their high percentile, so a healthy site is waited on for seconds, not 30 s.
+    """
+
+    def __init__(self, initial=30.0, minimum=5.0, maximum=60.0, percentile=95, factor=3.0, window=200):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentile = percentile
+        self.factor = factor
+        self.window = window
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+            if len(self.samples) > self.window:
+                self.samples.pop(0)
+
+    def timeout(self):
+        with self.lock:
+            # Too few samples to trust a percentile yet
+            if len(self.samples) < 5:
+                return self.initial
+            ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.minimum, min(self.maximum, ordered[idx] * self.factor))
+
+# ================= CIRCUIT BREAKER =================
+
+class CircuitOpen(Exception):
+    pass
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for
+    `cooldown` seconds. After that a single probe is let through (half-open);
+    it either closes the circuit again or re-opens it.
+    """
+
+    def __init__(self, threshold=5, cooldown=120.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.cooldown and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"🚫 Circuit opened after {self.failures} consecutive failures")
+                self.opened_at = time.time()
+
+    @property
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None
+
+# ================= RESILIENT CALL =================
+
+def resilient_call(fn, breaker, tracker, retry_on, attempts=3, max_backoff=30):
+    """
+    Calls fn(timeout) with the tracker's current timeout, retrying `retry_on`
+    exceptions with jittered exponential backoff. Latency of successful calls
+    feeds the tracker; every outcome feeds the breaker. Raises CircuitOpen
+    without calling fn when the site is considered down.
+    """
+    retrying = Retrying(
+        stop=stop_after_attempt(attempts),
+        wait=wait_random_exponential(multiplier=1, max=max_backoff),
+        retry=retry_if_exception_type(retry_on),
+        reraise=True,
+    )
+    for attempt in retrying:
+        with attempt:
+            if not breaker.allow():
+                raise CircuitOpen()
+            start = time.time()
+            try:
+                result = fn(tracker.timeout())
+            except retry_on:
+                breaker.failure()
+                raise
+            tracker.record(time.time() - start)
+            breaker.success()
+            return result
+
+# ================= PERSISTENT RETRY QUEUE =================
+
+class RetryQueue:
+    """
+    JSON file of tasks that failed in a previous run. drain() hands them back
+    at the start of the next run; tasks that keep failing are dropped after
+    `max_runs` runs.
+    """
+
+    def __init__(self, path, max_runs=7):
+        self.path = path
+        self.max_runs = max_runs
+        self.pending = {}
+
+    def drain(self):
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read retry queue {self.path}: {e}")
+            return []
+
+        tasks = []
+        for entry in entries:
+            task = tuple(entry["task"])
+            runs = entry.get("runs", 1)
+            if runs >= self.max_runs:
+                print(f"🗑️ Giving up on {task} after {runs} runs")
+                continue
+            self.pending[task] = runs
+            tasks.append(task)
+        return tasks
+
+    def save(self, failed):
+        """Rewrites the queue with this run's failures (drained tasks that succeeded drop out)."""
+        entries = []
+        for task in failed:
+            task = tuple(task)
+            entries.append({"task": list(task), "runs": self.pending.get(task, 0) + 1})
+        if not entries:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, self.path)
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+# ================= DEBOUNCED PDF WATCHER =================
+
+class _PdfEvents(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.touch(event.src_path)
+
+    def on_moved(self, event):
+        # Browsers and os.replace() land files by renaming them into place
+        if not event.is_directory:
+            self.watcher.touch(event.dest_path)
+
+class PdfFolderWatcher:
+    """
+    Watches `folder` (not its sub-folders) for new or replaced PDFs.
+
+    A file is handed to on_ready(paths) once it has had no events for
+    `debounce` seconds and its size has stopped changing, so half-written
+    copies are never converted. Files that settle together are delivered
+    as one batch.
+    """
+
+    def __init__(self, folder, on_ready, debounce=2.0):
+        self.folder = folder
+        self.on_ready = on_ready
+        self.debounce = debounce
+        self.pending = {}  # path -> (last event time, size at that time)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def touch(self, path):
+        if not path.lower().endswith(".pdf"):
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self.lock:
+            self.pending[path] = (time.time(), size)
+
+    def _settled(self):
+        now = time.time()
+        ready = []
+        with self.lock:
+            for path, (last, size) in list(self.pending.items()):
+                if now - last < self.debounce:
+                    continue
+                try:
+                    current = os.path.getsize(path)
+                except OSError:
+                    del self.pending[path]  # deleted or moved away again
+                    continue
+                if current != size:
+                    self.pending[path] = (now, current)  # still being written
+                    continue
+                del self.pending[path]
+                ready.append(path)
+        return sorted(ready)
+
+    def run(self):
+        observer = Observer()
+        observer.schedule(_PdfEvents(self), self.folder, recursive=False)
+        observer.start()
+        print(f"👀 Watching {self.folder} for new PDFs (Ctrl+C to stop)")
+        try:
+            while not self.stop_event.wait(0.5):
+                ready = self._settled()
+                if ready:
+                    try:
+                        self.on_ready(ready)
+                    except Exception as e:
+                        print(f"❌ Error handling {ready}: {e}")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            observer.stop()
+            observer.join()
+
+    def stop(self):
+        self.stop_event.set()
@@ -0,0 +1,215 @@
+"""
+Memory-budget-aware admission of parallel jobs (conversions, merges).
+
+Every job gets a memory estimate from what is cheap to know before it runs:
+the PDF's size and page count, or the workbooks' sizes and row counts. A
+Governor admits a job while the estimates of the running jobs plus its own
+fit in MEMORY_BUDGET_MB and the machine keeps MEMORY_RESERVE_MB free. A job
+bigger than the whole budget runs alone instead of never running.
+
+The limit on running jobs adapts. It drops when free memory falls under the
+reserve, holds while the CPU is saturated, and grows back one worker per
+check up to the pool size. Workers report the peak memory each job reached
+(run_measured), and the estimates of that kind of job are scaled to match.
+They jump up at once and only drift down slowly.
+
+psutil is used when installed. Without it, free memory and peaks come from
+/proc (Linux) or GlobalMemoryStatusEx (Windows), and CPU load from
+os.getloadavg() where it exists.
+"""
+import os
+import re
+import sys
+import threading
+import time
+import zipfile
+from collections import namedtuple
+
+from .config import (CONVERT_MEMORY_FACTOR, CONVERT_PAGE_MB, GOVERNOR_CPU_HIGH, GOVERNOR_INTERVAL,
+                     MEMORY_BUDGET_MB, MEMORY_RESERVE_MB, MERGE_MEMORY_FACTOR, MERGE_ROW_KB)
+
+MB = 1024 * 1024
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# ================= SYSTEM READINGS =================
+
+def free_memory():
+    """Bytes of memory available to new work, or None if unknown."""
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            return None
+    if sys.platform == "win32":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+    return None
+
+def cpu_load():
+    """Busy fraction of the CPUs (1.0 = every core busy), or None if unknown."""
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None) / 100
+    if hasattr(os, "getloadavg"):
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    return None
+
+def _status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return None
+
+def _reset_peak():
+    """Current RSS after resetting the peak-RSS mark, or None where peaks can't be measured per job."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")  # resets VmHWM to the current RSS
+        return _status_kb("VmRSS")
+    except OSError:
+        return None
+
+def run_measured(func, *args):
+    """
+    Runs `func(*args)` (in a pool worker) and returns (result, bytes the job
+    added at its peak, or None when that can't be measured here).
+    """
+    before = _reset_peak()
+    result = func(*args)
+    peak = _status_kb("VmHWM") if before is not None else None
+    return result, (max(0, peak - before) if peak is not None else None)
+
+# ================= ESTIMATES =================
+
+PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+SHEET_DIMENSION = re.compile(rb'<dimension ref="[A-Z]+\d+(?::[A-Z]+(\d+))?"')
+
+def pdf_pages(path):
+    """Page count from the /Type /Page objects, 0 when they sit in compressed object streams."""
+    from .pdf_access import MappedPdf
+
+    with MappedPdf(path) as pdf:
+        return len(PAGE_OBJECT.findall(pdf.map)) if pdf.map is not None else 0
+
+def workbook_rows(path):
+    """Rows of all sheets, from the <dimension> each sheet starts with (no sheet is parsed)."""
+    rows = 0
+    with zipfile.ZipFile(path) as book:
+        for name in book.namelist():
+            if name.startswith("xl/worksheets/") and name.endswith(".xml"):
+                with book.open(name) as sheet:
+                    match = SHEET_DIMENSION.search(sheet.read(2048))
+                if match and match.group(1):
+                    rows += int(match.group(1))
+    return rows
+
+def estimate_convert(pdf_path):
+    size = os.path.getsize(pdf_path)
+    try:
+        pages = pdf_pages(pdf_path)
+    except (OSError, ValueError):
+        pages = 0
+    return size * CONVERT_MEMORY_FACTOR + pages * CONVERT_PAGE_MB * MB
+
+def estimate_merge(file_data_list, input_folder):
+    total = 0
+    for file, _ in file_data_list:
+        path = os.path.join(input_folder, file)
+        try:
+            rows = workbook_rows(path)
+        except (OSError, zipfile.BadZipFile):
+            rows = 0
+        total += os.path.getsize(path) * MERGE_MEMORY_FACTOR + rows * MERGE_ROW_KB * 1024
+    return total
+
+# ================= GOVERNOR =================
+
+# kind: "convert" / "merge"; cost: bytes reserved; estimate: unscaled estimate;
+# reading: the free-memory reading the job was admitted against
+Ticket = namedtuple("Ticket", ["kind", "cost", "estimate", "reading"])
+
+class Governor:
+    def __init__(self, max_workers, budget_mb=MEMORY_BUDGET_MB, reserve_mb=MEMORY_RESERVE_MB,
+                 interval=GOVERNOR_INTERVAL):
+        self.max_workers = max(1, max_workers)
+        self.limit = self.max_workers
+        self.budget = budget_mb * MB
+        self.reserve = reserve_mb * MB
+        self.interval = interval
+        self.scale = {}     # kind -> observed / estimated memory
+        self.in_use = 0
+        self.running = 0
+        self.checked = 0.0
+        self.free = None
+        self.reading = 0    # count of free-memory readings taken
+        self.pending = 0    # bytes admitted since the last reading, not in it yet
+        self.lock = threading.Lock()
+
+    def adjust(self):
+        """Re-reads free memory and CPU load (at most every `interval`) and moves the worker limit."""
+        now = time.monotonic()
+        if now - self.checked < self.interval:
+            return
+        self.checked = now
+        self.free = free_memory()
+        self.reading += 1
+        self.pending = 0
+        load = cpu_load()
+        if self.free is not None and self.free < self.reserve:
+            limit = max(1, self.running - 1)
+            if limit < self.limit:
+                print(f"⚠️ Low memory ({self.free // MB} MB free), running at most {limit} job(s)")
+            self.limit = limit
+        elif load is not None and load > GOVERNOR_CPU_HIGH:
+            self.limit = max(1, min(self.limit, self.running))
+        elif self.limit < self.max_workers:
+            self.limit += 1
+
+    def admit(self, kind, estimate):
+        """A Ticket if the job may start now, else None. Pass the ticket to release()."""
+        with self.lock:
+            self.adjust()
+            cost = int(estimate * self.scale.get(kind, 1.0))
+            if self.running:
+                if self.running >= self.limit or self.in_use + cost > self.budget:
+                    return None
+                # Memory other programs took since the last check is seen here too
+                if self.free is not None and self.free - self.pending - cost < self.reserve:
+                    return None
+            self.in_use += cost
+            self.running += 1
+            self.pending += cost
+            return Ticket(kind, cost, estimate, self.reading)
+
+    def release(self, ticket, observed=None):
+        """Frees a ticket; `observed` is the peak bytes the job really used, if measured."""
+        with self.lock:
+            self.in_use -= ticket.cost
+            self.running -= 1
+            # A later reading already sees what the job left behind
+            if ticket.reading == self.reading:
+                self.pending -= ticket.cost
+            if observed and ticket.estimate:
+                ratio = observed / ticket.estimate
+                # Up at once, down slowly: an underestimate is what gets a runner killed
+                self.scale[ticket.kind] = max(ratio, 0.8 * self.scale.get(ticket.kind, 1.0))
@@ -0,0 +1,366 @@
+"""
+Distributed conversion and merging over a shared-filesystem job queue.
+
+`queue submit` puts one job per PDF that needs converting (site, year, month)
+and one merge job per affected site into a SQLite database on shared storage
+(QUEUE_PATH). Any number of `queue work` processes, on one host or many, then
+lease jobs from it. There is no broker: a lease is a row update inside a
+write transaction, so two workers never get the same job. A worker renews its
+lease with a heartbeat while the job runs. If it dies, the lease runs out
+after QUEUE_LEASE_SECONDS and the job goes back to pending (failed after
+QUEUE_MAX_ATTEMPTS). A site's merge job is only handed out once all of its
+conversions are done.
+
+When the queue drains, exactly one worker finalizes the batch: it records the
+results in the PDF store and builds the master dataset, so index.json and
+the master files have a single writer.
+
+SQLite's locking works on SMB/NFS shares that support file locks, but WAL
+mode does not, so the default rollback journal is used.
+"""
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from .config import (COMBINED_DIR, EXCEL_DIR, PDF_DIR, QUEUE_HEARTBEAT_SECONDS,
+                     QUEUE_LEASE_SECONDS, QUEUE_MAX_ATTEMPTS, QUEUE_PATH, QUEUE_POLL_SECONDS)
+from .partitions import index_for, parse_name
+
+Job = namedtuple("Job", ["id", "kind", "site", "year", "month", "payload"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,           -- "convert:<pdf name>" / "merge:<site>"
+    kind        TEXT NOT NULL,              -- convert | merge
+    site        TEXT NOT NULL,
+    year        INTEGER,
+    month       INTEGER,
+    payload     TEXT NOT NULL,              -- JSON
+    state       TEXT NOT NULL,              -- pending | leased | done | failed
+    worker      TEXT,
+    lease_until REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    result      TEXT,                       -- JSON, set when done
+    error       TEXT,
+    recorded    INTEGER NOT NULL DEFAULT 0, -- result written to the PDF store
+    updated     REAL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+# ================= QUEUE =================
+
+class JobQueue:
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        con = sqlite3.connect(path, timeout=30)
+        try:
+            con.executescript(SCHEMA)
+        finally:
+            con.close()
+
+    def _connect(self):
+        # Short-lived connections: safe from any thread, and no handle stays open on the share
+        con = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        con.row_factory = sqlite3.Row
+        return _Transaction(con)
+
+    def submit(self, jobs):
+        """
+        Adds Jobs as pending. A job that already finished is queued again; one
+        that is pending or leased is left alone. Starts a new batch.
+        """
+        if not jobs:
+            return
+        now = time.time()
+        with self._connect() as con:
+            con.executemany(
+                """INSERT INTO jobs (id, kind, site, year, month, payload, state, updated)
+                   VALUES (?, ?, ?, ?, ?, ?, 'pending', ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       payload = excluded.payload, state = 'pending', worker = NULL,
+                       lease_until = NULL, attempts = 0, result = NULL, error = NULL,
+                       recorded = 0, updated = excluded.updated
+                   WHERE jobs.state IN ('done', 'failed')""",
+                [(job.id, job.kind, job.site, job.year, job.month, json.dumps(job.payload), now)
+                 for job in jobs],
+            )
+            con.execute("INSERT OR REPLACE INTO meta VALUES ('finalized', '0')")
+
+    def lease(self, worker):
+        """Next runnable job for `worker`, or None. Expired leases are reclaimed first."""
+        now = time.time()
+        with self._connect() as con:
+            con.execute(
+                """UPDATE jobs SET worker = NULL, lease_until = NULL, updated = ?,
+                       state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                       error = 'lease expired (worker ' || worker || ' stopped responding)'
+                   WHERE state = 'leased' AND lease_until < ?""",
+                (now, QUEUE_MAX_ATTEMPTS, now),
+            )
+            row = con.execute(
+                """SELECT * FROM jobs AS j
+                   WHERE state = 'pending' AND (kind = 'convert' OR NOT EXISTS (
+                       SELECT 1 FROM jobs AS c WHERE c.kind = 'convert' AND c.site = j.site
+                       AND c.state IN ('pending', 'leased')))
+                   ORDER BY kind = 'merge', year, month, id LIMIT 1"""
+            ).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                """UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?,
+                       attempts = attempts + 1, updated = ? WHERE id = ?""",
+                (worker, now + QUEUE_LEASE_SECONDS, now, row["id"]),
+            )
+        return Job(row["id"], row["kind"], row["site"], row["year"], row["month"], json.loads(row["payload"]))
+
+    def heartbeat(self, job_id, worker):
+        """Extends the lease; False if `worker` no longer holds it."""
+        now = time.time()
+        with self._connect() as con:
+            cur = con.execute(
+                "UPDATE jobs SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (now + QUEUE_LEASE_SECONDS, now, job_id, worker),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        with self._connect() as con:
+            cur = con.execute(
+                """UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_until = NULL, updated = ?
+                   WHERE id = ? AND worker = ? AND state = 'leased'""",
+                (json.dumps(result), time.time(), job_id, worker),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        with self._connect() as con:
+            con.execute(
+                """UPDATE jobs SET worker = NULL, lease_until = NULL, error = ?, updated = ?,
+                       state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END
+                   WHERE id = ? AND worker = ? AND state = 'leased'""",
+                (error, time.time(), QUEUE_MAX_ATTEMPTS, job_id, worker),
+            )
+
+    def drained(self):
+        with self._connect() as con:
+            return con.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'leased')"
+            ).fetchone()[0] == 0
+
+    def claim_finalize(self):
+        """True for exactly one caller per batch."""
+        with self._connect() as con:
+            cur = con.execute("UPDATE meta SET value = '1' WHERE key = 'finalized' AND value = '0'")
+            return cur.rowcount == 1
+
+    def unrecorded(self):
+        with self._connect() as con:
+            rows = con.execute(
+                "SELECT id, kind, site, payload, result FROM jobs WHERE state = 'done' AND recorded = 0"
+            ).fetchall()
+        return [(row["id"], row["kind"], row["site"], json.loads(row["payload"]), json.loads(row["result"]))
+                for row in rows]
+
+    def mark_recorded(self, job_ids):
+        with self._connect() as con:
+            con.executemany("UPDATE jobs SET recorded = 1 WHERE id = ?", [(i,) for i in job_ids])
+
+    def status(self):
+        """({(kind, state): count}, leased rows, failed rows)"""
+        with self._connect() as con:
+            counts = {(row["kind"], row["state"]): row["n"] for row in con.execute(
+                "SELECT kind, state, COUNT(*) AS n FROM jobs GROUP BY kind, state")}
+            leased = con.execute(
+                "SELECT id, worker, lease_until, attempts FROM jobs WHERE state = 'leased' ORDER BY id"
+            ).fetchall()
+            failed = con.execute("SELECT id, error FROM jobs WHERE state = 'failed' ORDER BY id").fetchall()
+        return counts, leased, failed
+
+class _Transaction:
+    """`with` block = one IMMEDIATE transaction (write lock taken up front, no upgrade deadlocks)."""
+
+    def __init__(self, con):
+        self.con = con
+
+    def __enter__(self):
+        self.con.execute("BEGIN IMMEDIATE")
+        return self.con
+
+    def __exit__(self, exc_type, *exc):
+        try:
+            self.con.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.con.close()
+
+# ================= SUBMIT =================
+
+def submit(force=False, path=QUEUE_PATH):
+    """Queues the conversions and merges a local `convert` + `merge` run would do."""
+    from .merge import combined_path_for, group_excel_files
+    from .pdf_store import get_store
+
+    store = get_store()
+    jobs = []
+    sites = set()
+    for filename in sorted(index_for(PDF_DIR, "pdf").names()):
+        pdf_path = os.path.join(PDF_DIR, filename)
+        if not force and not store.needs_conversion(pdf_path, EXCEL_DIR):
+            continue
+        key = parse_name(filename)
+        site = key.site if key else os.path.splitext(filename)[0]
+        jobs.append(Job(f"convert:{filename}", "convert", site,
+                        key.year if key else None, key.month if key else None, {"pdf": filename}))
+        sites.add(site)
+
+    for site, file_data_list in group_excel_files(EXCEL_DIR).items():
+        signature = store.merge_signature(file_data_list, EXCEL_DIR)
+        if force or store.needs_merge(site, signature, combined_path_for(site, COMBINED_DIR)):
+            sites.add(site)
+    jobs.extend(Job(f"merge:{site}", "merge", site, None, None, {}) for site in sorted(sites))
+
+    JobQueue(path).submit(jobs)
+    converts = sum(1 for job in jobs if job.kind == "convert")
+    print(f"📥 Queued {converts} conversion(s) and {len(jobs) - converts} merge(s) in {path}")
+    return len(jobs)
+
+# ================= WORKER =================
+
+def run_job(job):
+    if job.kind == "convert":
+        from .convert import convert_pdf
+        from .pdf_access import MappedPdf
+
+        pdf_path = os.path.join(PDF_DIR, job.payload["pdf"])
+        with MappedPdf(pdf_path) as mapped:
+            has_data = convert_pdf(pdf_path, EXCEL_DIR, mapped)
+            # The hash of the bytes that were converted, recorded at finalize
+            return {"has_data": bool(has_data), "sha256": mapped.digest()}
+
+    from .merge import group_excel_files, merge_site
+
+    os.makedirs(COMBINED_DIR, exist_ok=True)
+    file_data_list = group_excel_files(EXCEL_DIR).get(job.site)
+    if not file_data_list:
+        return {"merged": False}
+    merge_site(job.site, file_data_list, EXCEL_DIR, COMBINED_DIR)
+    return {"merged": True}
+
+class Heartbeat(threading.Thread):
+    """Renews a job's lease every QUEUE_HEARTBEAT_SECONDS until stopped."""
+
+    def __init__(self, jobs, job, worker):
+        super().__init__(daemon=True)
+        self.jobs, self.job, self.worker = jobs, job, worker
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(QUEUE_HEARTBEAT_SECONDS):
+            try:
+                if not self.jobs.heartbeat(self.job.id, self.worker):
+                    print(f"⚠️ Lost the lease on {self.job.id}, another worker will redo it")
+                    return
+            except sqlite3.Error as e:
+                print(f"⚠️ Heartbeat for {self.job.id} failed: {e}")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.join()
+
+def finalize(path=QUEUE_PATH):
+    """Records the batch's results in the PDF store and rebuilds the master dataset."""
+    from .master import build_master, master_path
+    from .merge import group_excel_files
+    from .pdf_store import PdfStore
+
+    jobs = JobQueue(path)
+    done = jobs.unrecorded()
+    # Fresh copy of index.json: another host may have finalized an earlier batch
+    store = PdfStore()
+    for _, kind, _, payload, result in done:
+        if kind == "convert":
+            store.mark_converted(os.path.join(PDF_DIR, payload["pdf"]), result["has_data"],
+                                 digest=result["sha256"])
+
+    groups = group_excel_files(EXCEL_DIR)
+    merged = [site for _, kind, site, _, result in done if kind == "merge" and result["merged"]]
+    for site in merged:
+        store.mark_merged(site, store.merge_signature(groups[site], EXCEL_DIR))
+    jobs.mark_recorded([job_id for job_id, *_ in done])
+
+    if merged or not os.path.exists(master_path(COMBINED_DIR)):
+        build_master(groups, COMBINED_DIR)
+    print(f"🏁 Batch finalized: {len(done) - len(merged)} conversion(s), {len(merged)} merge(s) recorded")
+
+def work(worker=None, follow=False, path=QUEUE_PATH):
+    """
+    Leases and runs jobs until the queue is drained (with `follow`, keeps
+    polling for new batches). Returns the number of jobs run.
+    """
+    worker = worker or worker_name()
+    jobs = JobQueue(path)
+    count = 0
+    while True:
+        job = jobs.lease(worker)
+        if job is None:
+            if jobs.drained():
+                if jobs.claim_finalize():
+                    finalize(path)
+                if not follow:
+                    return count
+            time.sleep(QUEUE_POLL_SECONDS)
+            continue
+
+        print(f"🧾 [{worker}] {job.id}")
+        with Heartbeat(jobs, job, worker):
+            try:
+                result = run_job(job)
+            except Exception as e:
+                print(f"❌ [{worker}] {job.id} failed: {e}")
+                jobs.fail(job.id, worker, f"{e.__class__.__name__}: {e}")
+                continue
+        if not jobs.complete(job.id, worker, result):
+            print(f"⚠️ [{worker}] {job.id} finished after its lease was lost, result dropped")
+        count += 1
+
+def _work_process(index, follow, path):
+    work(f"{worker_name()}#{index}", follow, path)
+
+def work_processes(processes, follow=False, path=QUEUE_PATH):
+    """Runs `processes` local workers (the same as starting `queue work` that many times)."""
+    if processes <= 1:
+        return work(follow=follow, path=path)
+    procs = [multiprocessing.Process(target=_work_process, args=(i, follow, path)) for i in range(processes)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+def print_status(path=QUEUE_PATH):
+    counts, leased, failed = JobQueue(path).status()
+    if not counts:
+        print(f"📭 No jobs in {path}")
+        return
+    print(f"📋 Jobs in {path}:")
+    for kind in ("convert", "merge"):
+        states = ", ".join(f"{state} {counts[(k, state)]}" for k, state in sorted(counts) if k == kind)
+        if states:
+            print(f"   {kind}: {states}")
+    now = time.time()
+    for row in leased:
+        print(f"   🔒 {row['id']} → {row['worker']} (lease {row['lease_until'] - now:.0f}s, attempt {row['attempts']})")
+    for row in failed:
+        print(f"   ❌ {row['id']}: {row['error']}")
@@ -0,0 +1,249 @@
+"""
+Consolidated master dataset across all sites, with monthly aggregates.
+
+merge_site() already holds every row of a site once its months are
+concatenated, so it also saves them as a tidy slice (one parquet file per
+site, see site_slice). build_master() then only stacks those slices and runs
+the groupbys; nobody has to re-read the combined workbooks.
+
+Owner and DISCOM are categoricals all the way (see dictionary.py): slices
+store them with their own sorted categories, and build_master() recodes the
+slices to the archive-wide dictionary before stacking them.
+"""
+import os
+
+import pandas as pd
+
+from .config import MASTER_FIELDS, MASTER_NAME, SECTIONS
+from .dictionary import decode, load_dictionary, strip
+from .partitions import plan_partitions, remove_stale_partitions
+from .profiling import profiled
+from .stable_output import write_excel, write_parquet
+
+# ================= PER-SITE SLICES =================
+
+def slice_dir(output_folder):
+    return os.path.join(output_folder, ".master")
+
+def slice_path(site_name, output_folder):
+    return os.path.join(slice_dir(output_folder), f"{site_name}.parquet")
+
+def aggregate_path(sheet, output_folder):
+    """Parquet copy of an aggregate sheet, e.g. "Monthly by Site" -> monthly_by_site.parquet."""
+    return os.path.join(slice_dir(output_folder), "aggregates", sheet.lower().replace(" ", "_") + ".parquet")
+
+def find_column(columns, keyword, exclude=None):
+    """First column whose upper-cased header contains `keyword` (headers can hold newlines)."""
+    for col in columns:
+        text = " ".join(str(col).upper().split())
+        if keyword in text and not (exclude and exclude in text):
+            return col
+    return None
+
+def text_fields():
+    """Master columns that hold repeating names rather than numbers."""
+    return ["Owner"] + [field for field, (_, _, numeric) in MASTER_FIELDS.items() if not numeric]
+
+def text_columns(columns, spec):
+    """{column: text field} of a section sheet's owner and non-numeric MASTER_FIELDS columns."""
+    found = {}
+    owner_col = find_column(columns, spec["name_column"])
+    if owner_col is not None:
+        found[owner_col] = "Owner"
+    for field, (keyword, exclude, numeric) in MASTER_FIELDS.items():
+        col = find_column(columns, keyword, exclude)
+        if not numeric and col is not None:
+            found[col] = field
+    return found
+
+def section_rows(site_name, spec, df):
+    """Tidy rows of one section sheet, Owner and DISCOM not yet stripped."""
+    out = pd.DataFrame({
+        "Site": site_name,
+        "Section": spec["name"],
+        "Date": df["Date"],
+    })
+    out["Month"] = pd.to_datetime(out["Date"], format="%d-%m-%Y", errors="coerce").dt.strftime("%Y-%m")
+
+    owner_col = find_column(df.columns, spec["name_column"])
+    out["Owner"] = df[owner_col] if owner_col is not None else pd.NA
+
+    for field, (keyword, exclude, numeric) in MASTER_FIELDS.items():
+        col = find_column(df.columns, keyword, exclude)
+        if col is None:
+            out[field] = pd.NA
+        elif numeric:
+            out[field] = pd.to_numeric(df[col].str.replace(",", "", regex=False), errors="coerce")
+        else:
+            out[field] = df[col]
+    return out
+
+def finish_slice(parts):
+    """Stacks section_rows() frames (section by section, months in order) into a slice."""
+    if not parts:
+        return pd.DataFrame()
+    tidy = pd.concat(parts, ignore_index=True)
+    # Stripped once over both sections; sorted categories keep the parquet bytes stable
+    for field in text_fields():
+        tidy[field] = strip(tidy[field])
+    return tidy
+
+def site_slice(site_name, merged):
+    """
+    Tidy rows of one site: {sheet: merged DataFrame} -> one frame with
+    Site, Section, Month, Date, Owner and the MASTER_FIELDS columns.
+    """
+    parts = []
+    for spec in SECTIONS:
+        df = merged.get(spec["sheet"])
+        if df is not None and not df.empty:
+            parts.append(section_rows(site_name, spec, df))
+    return finish_slice(parts)
+
+def save_slice(site_name, merged, output_folder):
+    write_slice(site_name, site_slice(site_name, merged), output_folder)
+
+def write_slice(site_name, tidy, output_folder):
+    os.makedirs(slice_dir(output_folder), exist_ok=True)
+    # Unchanged slices keep their mtime, so query.py's cache stays valid
+    write_parquet(slice_path(site_name, output_folder), tidy)
+
+def load_slice(site_name, output_folder):
+    path = slice_path(site_name, output_folder)
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    # Site merged before slices existed: read its combined workbook once
+    combined = os.path.join(output_folder, f"{site_name}_combined.xlsx")
+    if not os.path.exists(combined):
+        return pd.DataFrame()
+    print(f"   📄 No master slice for {site_name}, reading {os.path.basename(combined)}")
+    save_slice(site_name, read_combined(combined), output_folder)
+    return pd.read_parquet(slice_path(site_name, output_folder))
+
+def read_workbook(path):
+    with pd.ExcelFile(path, engine="openpyxl") as book:
+        return {sheet: pd.read_excel(book, sheet_name=sheet, dtype=str) for sheet in book.sheet_names}
+
+def read_combined(path):
+    """
+    {sheet: DataFrame} of a <site>_combined.xlsx. A split site's file only
+    has an Index sheet, so the partition files it lists are read and stacked.
+    """
+    sheets = read_workbook(path)
+    if "Index" not in sheets:
+        return sheets
+    parts = {}
+    for file in sheets["Index"]["File"].dropna().unique():
+        for sheet, df in read_workbook(os.path.join(os.path.dirname(path), file)).items():
+            parts.setdefault(sheet, []).append(df)
+    return {sheet: pd.concat(frames, ignore_index=True) for sheet, frames in parts.items()}
+
+# ================= MASTER + AGGREGATES =================
+
+def aggregate(master):
+    """Monthly totals of every numeric field by site, owner and DISCOM."""
+    numeric = [field for field, (_, _, is_numeric) in MASTER_FIELDS.items() if is_numeric]
+    tables = {}
+    for sheet, keys in (
+        ("Monthly by Site", ["Month", "Section", "Site"]),
+        ("Monthly by Owner", ["Month", "Section", "Owner"]),
+        ("Monthly by DISCOM", ["Month", "Section", "DISCOM"]),
+    ):
+        # Grouped on the codes, then sorted by value like a plain groupby
+        table = (
+            master.groupby(keys, dropna=False, sort=False, observed=True)[numeric]
+            .sum(min_count=1)
+            .reset_index()
+        )
+        for key in keys:
+            table[key] = decode(table[key])
+        tables[sheet] = table.sort_values(keys, na_position="last", kind="stable", ignore_index=True)
+    return tables
+
+def master_path(output_folder, label=None):
+    """<MASTER_NAME>.xlsx, or <MASTER_NAME>_<label>.xlsx for one partition of its Master sheet."""
+    suffix = f"_{label}" if label else ""
+    return os.path.join(output_folder, f"{MASTER_NAME}{suffix}.xlsx")
+
+def write_master(master, tables, output_folder):
+    """
+    Writes the Master sheet split like the combined workbooks
+    (COMBINED_PARTITION): one <MASTER_NAME>.xlsx while it fits, otherwise
+    <MASTER_NAME>_<label>.xlsx files of whole months and an Index sheet next
+    to the aggregates in <MASTER_NAME>.xlsx. Returns True if a file changed.
+    """
+    keys = sorted(master["Month"].dropna().unique())
+    counts = master["Month"].value_counts()
+    months = [tuple(int(part) for part in key.split("-")) for key in keys]
+    partitions = plan_partitions(months, [int(counts[key]) for key in keys])
+    path = master_path(output_folder)
+    written = set()
+
+    if len(partitions) == 1 and partitions[0][0] is None:
+        changed = write_excel(path, {"Master": master, **tables})
+    else:
+        index_rows = []
+        changed = False
+        for n, (label, positions) in enumerate(partitions):
+            wanted = [keys[i] for i in positions]
+            rows = master["Month"].isin(wanted)
+            if n == 0:
+                # Rows without a month go with the first partition
+                rows |= master["Month"].isna()
+            part = master[rows].reset_index(drop=True)
+            part_path = master_path(output_folder, label)
+            if write_excel(part_path, {"Master": part}):
+                changed = True
+                print(f"   💾 Wrote master partition {os.path.basename(part_path)}")
+            written.add(part_path)
+            index_rows.append({
+                "Partition": label,
+                "File": os.path.basename(part_path),
+                "Sheet": "Master",
+                "Rows": len(part),
+                "From": wanted[0],
+                "To": wanted[-1],
+            })
+        changed = write_excel(path, {"Index": pd.DataFrame(index_rows), **tables}) or changed
+    remove_stale_partitions(MASTER_NAME, output_folder, written)
+    return changed
+
+@profiled("build_master", snapshot=True)
+def build_master(sites, output_folder):
+    """
+    Stacks the slices of `sites` into <MASTER_NAME>.parquet and
+    <MASTER_NAME>.xlsx (Master sheet + aggregate sheets, the Master sheet
+    partitioned like the combined workbooks, see write_master). Returns the
+    path of the workbook, or None when there is no data.
+    """
+    slices = [load_slice(site, output_folder) for site in sorted(sites)]
+    slices = [df for df in slices if not df.empty]
+    if not slices:
+        print("⚠️ No merged data for the master dataset")
+        return None
+
+    # Recode every slice to the shared dictionary, so the stack stays categorical
+    dictionary = load_dictionary(slice_dir(output_folder))
+    for df in slices:
+        for field in text_fields():
+            dictionary.add(field, df[field])
+    for df in slices:
+        for field in text_fields():
+            df[field] = df[field].astype(dictionary.dtype(field))
+    master = pd.concat(slices, ignore_index=True)
+    tables = aggregate(master)
+    dictionary.save()
+
+    write_parquet(os.path.join(output_folder, f"{MASTER_NAME}.parquet"), master)
+    # Small parquet copies of the aggregates for the dashboard (query.py)
+    for sheet, table in tables.items():
+        path = aggregate_path(sheet, output_folder)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_parquet(path, table)
+    path = master_path(output_folder)
+    changed = write_master(master, tables, output_folder)
+
+    state = "✅ Master dataset" if changed else "⏭️ Master dataset unchanged"
+    print(f"{state}: {len(master)} rows from {len(slices)} sites → {path}")
+    return path
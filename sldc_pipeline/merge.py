@@ -0,0 +1,263 @@
+"""Stage 3: combine each site's monthly workbooks into <site>_combined.xlsx."""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+
+import pandas as pd
+
+from .config import COMBINED_DIR, EXCEL_DIR, GOVERNOR_INTERVAL, MEMORY_BUDGET_MB, MERGE_WORKERS, SECTIONS
+from .dictionary import load_dictionary
+from .governor import Governor, estimate_merge, run_measured
+from .master import (build_master, finish_slice, master_path, save_slice, section_rows, slice_dir, text_columns,
+                     write_slice)
+from .notify import toast
+from .partitions import index_for, plan_partitions, remove_stale_partitions
+from .pdf_store import get_store
+from .profiling import profiled
+from .stable_output import write_excel
+
+def group_excel_files(input_folder):
+    """Returns {site_name: [(file, (year, month_index)), ...]} for the converted workbooks."""
+    # Shared cached directory index, see partitions.py
+    excel_index = index_for(input_folder, "xlsx")
+    for file in excel_index.refresh().skipped:
+        print(f"⚠️ File '{file}' did not match pattern, skipping.")
+    return excel_index.groups()
+
+def combined_path_for(site_name, output_folder, label=None):
+    """<site>_combined.xlsx, or <site>_combined_<label>.xlsx for one partition of it."""
+    suffix = f"_{label}" if label else ""
+    return os.path.join(output_folder, f"{site_name}_combined{suffix}.xlsx")
+
+@profiled("merge_site")
+def merge_site(site_name, file_data_list, input_folder, output_folder):
+    """Combines one site's monthly workbooks into <site>_combined.xlsx."""
+    print(f"\n🔧 Merging for site: {site_name}")
+    
+    # Sort the list based on the tuple (year, month_index)
+    # This is the fix for Bug #1
+    files_sorted_tuples = sorted(file_data_list, key=lambda item: item[1])
+
+    # One list of monthly frames per configured section sheet
+    sheets = [spec["sheet"] for spec in SECTIONS]
+    data_all = {sheet: [] for sheet in sheets}
+    months = []  # (year, month) of each entry in data_all's lists
+    # Owner names and DISCOMs are kept as codes into the shared dictionary
+    dictionary = load_dictionary(slice_dir(output_folder))
+    specs = {spec["sheet"]: spec for spec in SECTIONS}
+
+    # Loop through the sorted tuples
+    for file_tuple in files_sorted_tuples:
+        file = file_tuple[0] # Get the filename from the tuple
+        path = os.path.join(input_folder, file)
+        print(f"   📄 Reading: {file}")
+        
+        try:
+            excel_files = pd.ExcelFile(path, engine="openpyxl")
+            month_frames = {}
+            for sheet in sheets:
+                # Use dtype=str to prevent pandas from breaking data
+                df = pd.read_excel(excel_files, sheet_name=sheet, dtype=str) if sheet in excel_files.sheet_names else pd.DataFrame()
+
+                # 🛡️ Ensure Date column exists
+                if not df.empty and "Date" not in df.columns:
+                    print(f"   ⚠️ Skipped {sheet} — 'Date' missing in {file}")
+                    df = pd.DataFrame()
+
+                for col, field in text_columns(df.columns, specs[sheet]).items():
+                    df[col] = dictionary.encode(df[col], field)
+                month_frames[sheet] = df
+
+            for sheet, df in month_frames.items():
+                data_all[sheet].append(df)
+            months.append(file_tuple[1])
+
+        except Exception as e:
+            print(f"   ❌ Error in {file}: {e}")
+
+    # Months read early hold a shorter dictionary; one dtype lets concat keep the codes
+    for sheet in sheets:
+        for df in data_all[sheet]:
+            for col, field in text_columns(df.columns, specs[sheet]).items():
+                df[col] = df[col].astype(dictionary.dtype(field))
+
+    def combine(positions):
+        book = {}
+        for sheet in sheets:
+            frames = [data_all[sheet][i] for i in positions if not data_all[sheet][i].empty]
+            if frames:
+                merged = pd.concat(frames, ignore_index=True)
+                merged["Sr No"] = range(1, len(merged) + 1)
+                book[sheet] = merged
+            else:
+                book[sheet] = pd.DataFrame(columns=["Sr No", "Date"])
+        return book
+
+    combined_path = combined_path_for(site_name, output_folder)
+    sizes = [max(len(data_all[sheet][i]) for sheet in sheets) for i in range(len(months))]
+    partitions = plan_partitions(months, sizes)
+    written = set()
+
+    if len(partitions) == 1 and partitions[0][0] is None:
+        full = combine(partitions[0][1])
+        changed = write_excel(combined_path, full)
+        # Same rows, tidied for the cross-site master dataset
+        save_slice(site_name, {sheet: df for sheet, df in full.items() if not df.empty}, output_folder)
+    else:
+        # One workbook per partition (Sr No restarts in each), each rewritten
+        # only when its own months changed, and an Index sheet in the main file
+        index_rows = []
+        changed = False
+        # The slice is tidied partition by partition, so the site's history is never stacked whole
+        tidy = {spec["name"]: [] for spec in SECTIONS}
+        for label, positions in partitions:
+            path = combined_path_for(site_name, output_folder, label)
+            book = combine(positions)
+            for spec in SECTIONS:
+                if not book[spec["sheet"]].empty:
+                    tidy[spec["name"]].append(section_rows(site_name, spec, book[spec["sheet"]]))
+            if write_excel(path, book):
+                changed = True
+                print(f"   💾 Wrote partition {os.path.basename(path)}")
+            written.add(path)
+            first, last = months[positions[0]], months[positions[-1]]
+            for sheet, df in book.items():
+                index_rows.append({
+                    "Partition": label,
+                    "File": os.path.basename(path),
+                    "Sheet": sheet,
+                    "Rows": len(df),
+                    "From": f"{first[0]}-{first[1]:02d}",
+                    "To": f"{last[0]}-{last[1]:02d}",
+                })
+        changed = write_excel(combined_path, {"Index": pd.DataFrame(index_rows)}) or changed
+        write_slice(site_name, finish_slice([part for parts in tidy.values() for part in parts]), output_folder)
+    remove_stale_partitions(f"{site_name}_combined", output_folder, written)
+
+    if changed:
+        print(f"✅ Combined Excel created: {combined_path}")
+    else:
+        print(f"⏭️ Combined Excel unchanged: {combined_path}")
+    return combined_path
+
+# ================= PARALLEL MERGE =================
+
+def timed_merge(site_name, file_data_list, input_folder, output_folder):
+    start = time.perf_counter()
+    merge_site(site_name, file_data_list, input_folder, output_folder)
+    return time.perf_counter() - start
+
+def merge_sites(jobs, input_folder, output_folder, workers=MERGE_WORKERS,
+                budget_mb=MEMORY_BUDGET_MB):
+    """
+    Merges {site: file_data_list} with up to `workers` processes. The biggest
+    sites start first, and a site waits until the governor admits it: the
+    estimated memory of the merges in flight plus its own must fit in
+    `budget_mb` and in the machine's free memory (a site over the budget on
+    its own runs alone), and fewer merges run under memory or CPU pressure.
+
+    Returns {site: (status, seconds)} with status "merged" or "failed".
+    """
+    results = {}
+
+    if workers <= 1 or len(jobs) <= 1:
+        for site_name, file_data_list in jobs.items():
+            try:
+                results[site_name] = ("merged", timed_merge(site_name, file_data_list, input_folder, output_folder))
+            except Exception as e:
+                print(f"❌ Merge failed for {site_name}: {e}")
+                results[site_name] = ("failed", 0.0)
+        return results
+
+    governor = Governor(min(workers, len(jobs)), budget_mb)
+    estimates = {site: estimate_merge(files, input_folder) for site, files in jobs.items()}
+    waiting = sorted(jobs, key=lambda site: (-estimates[site], site))
+    inflight = {}  # future -> (site, governor ticket)
+
+    with ProcessPoolExecutor(max_workers=governor.max_workers) as executor:
+        while waiting or inflight:
+            while waiting:
+                # Biggest site that the governor lets in now
+                for site_name in waiting:
+                    ticket = governor.admit("merge", estimates[site_name])
+                    if ticket:
+                        break
+                else:
+                    break  # wait for memory to free up
+                waiting.remove(site_name)
+                fut = executor.submit(run_measured, timed_merge, site_name, jobs[site_name],
+                                      input_folder, output_folder)
+                inflight[fut] = (site_name, ticket)
+
+            # Time out now and then, the governor may allow more merges by then
+            done, _ = wait_futures(inflight, timeout=GOVERNOR_INTERVAL, return_when=FIRST_COMPLETED)
+            for fut in done:
+                site_name, ticket = inflight.pop(fut)
+                try:
+                    seconds, peak = fut.result()
+                    results[site_name] = ("merged", seconds)
+                except Exception as e:
+                    print(f"❌ Merge failed for {site_name}: {e}")
+                    results[site_name] = ("failed", 0.0)
+                    peak = None
+                governor.release(ticket, peak)
+
+    return results
+
+@profiled("excel_merging", snapshot=True)
+def excel_merging(force=False, workers=None):
+    """
+    Merges every site whose monthly workbooks changed since its last merge
+    (all with force), up to `workers` (default MERGE_WORKERS) sites at a time.
+    """
+    if workers is None:
+        workers = MERGE_WORKERS
+    input_folder = EXCEL_DIR
+    output_folder = COMBINED_DIR
+    os.makedirs(output_folder, exist_ok=True)
+
+    energy_sites = group_excel_files(input_folder)
+    store = get_store()
+
+    jobs = {}
+    signatures = {}
+    results = {}
+    for site_name, file_data_list in energy_sites.items():
+        signature = store.merge_signature(file_data_list, input_folder)
+        if not force and not store.needs_merge(site_name, signature, combined_path_for(site_name, output_folder)):
+            results[site_name] = ("unchanged", 0.0)
+            continue
+        jobs[site_name] = file_data_list
+        signatures[site_name] = signature
+
+    # 🔁 Merge files for each energy site
+    start = time.perf_counter()
+    results.update(merge_sites(jobs, input_folder, output_folder, workers))
+    elapsed = time.perf_counter() - start
+
+    for site_name, (status, _) in results.items():
+        if status == "merged":
+            store.mark_merged(site_name, signatures[site_name])
+
+    # Summary in site order, whatever order the workers finished in
+    icons = {"merged": "✅", "unchanged": "⏭️", "failed": "❌"}
+    print("\n📊 Merge summary:")
+    for site_name in sorted(results):
+        status, seconds = results[site_name]
+        timing = f" ({seconds:.1f}s)" if status == "merged" else ""
+        print(f"   {icons[status]} {site_name}: {status}{timing}")
+
+    if any(status == "merged" for status, _ in results.values()) or not os.path.exists(master_path(output_folder)):
+        build_master(energy_sites, output_folder)
+
+    counts = {status: sum(1 for s, _ in results.values() if s == status) for status in icons}
+    msg = (f"Merged {counts['merged']} sites in {elapsed:.1f}s "
+           f"({counts['unchanged']} unchanged, {counts['failed']} failed).")
+    print(f"📢 {msg}")
+
+    toast(
+        app_id="SLDC Gujarat Data",
+        title="Excel Merging",
+        msg=msg,
+        duration="long"
+    )
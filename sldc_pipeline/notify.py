@@ -0,0 +1,148 @@
+"""
+Run notifications, delivered off the main thread.
+
+toast() only queues the message; a daemon thread hands it to the configured
+backend, so a slow or missing notifier never holds up the pipeline. Backends
+(SLDC_NOTIFY): "winotify", "stdout", "webhook", "file", "none", or "auto"
+(winotify when it can be imported, stdout otherwise). Each backend's
+dependencies are imported the first time it is used.
+"""
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from .config import NOTIFY_BACKEND, NOTIFY_FILE, NOTIFY_FLUSH_SECONDS, NOTIFY_WEBHOOK_URL
+
+# ================= BACKENDS =================
+
+class WinotifyBackend:
+    def __init__(self):
+        from winotify import Notification, audio
+        self.Notification = Notification
+        self.audio = audio
+
+    def send(self, note):
+        toast = self.Notification(
+            app_id=note["app_id"],
+            title=note["title"],
+            msg=note["msg"],
+            duration=note["duration"],
+            icon=note["icon"] if note["icon"] and os.path.exists(note["icon"]) else None
+        )
+        toast.set_audio(self.audio.Default, loop=False)
+        toast.show()
+
+class StdoutBackend:
+    def send(self, note):
+        print(f"\n🔔 [{note['app_id']}] {note['title']}\n{note['msg']}")
+
+class WebhookBackend:
+    """POSTs the notification as JSON, e.g. to a local relay."""
+
+    def __init__(self, url):
+        if not url:
+            raise ValueError("SLDC_NOTIFY_WEBHOOK is not set")
+        self.url = url
+
+    def send(self, note):
+        import urllib.request
+
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(note).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=10):
+            pass
+
+class FileBackend:
+    """Appends one JSON line per notification."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, note):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(note, ensure_ascii=False) + "\n")
+
+class NoopBackend:
+    def send(self, note):
+        pass
+
+def make_backend(name):
+    if name == "auto":
+        try:
+            return WinotifyBackend()
+        except Exception:
+            return StdoutBackend()
+    if name == "winotify":
+        return WinotifyBackend()
+    if name == "stdout":
+        return StdoutBackend()
+    if name == "webhook":
+        return WebhookBackend(NOTIFY_WEBHOOK_URL)
+    if name == "file":
+        return FileBackend(NOTIFY_FILE)
+    if name == "none":
+        return NoopBackend()
+    raise ValueError(f"Unknown notification backend: {name}")
+
+# ================= ASYNC DISPATCH =================
+
+class Notifier:
+    def __init__(self, backend_name):
+        self.backend_name = backend_name
+        self.backend = None
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def _run(self):
+        while True:
+            note = self.queue.get()
+            try:
+                if self.backend is None:
+                    self.backend = make_backend(self.backend_name)
+                self.backend.send(note)
+            except Exception as e:
+                print(f"⚠️ Notification '{note['title']}' not delivered ({self.backend_name}): {e}",
+                      file=sys.stderr)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, note):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+                self.thread.start()
+                atexit.register(self.flush, NOTIFY_FLUSH_SECONDS)
+        self.queue.put(note)
+
+    def flush(self, timeout):
+        """Waits up to `timeout` seconds for queued notifications, never longer."""
+        end = time.time() + timeout
+        while self.queue.unfinished_tasks and time.time() < end:
+            time.sleep(0.05)
+
+_notifier = None
+
+def get_notifier():
+    global _notifier
+    if _notifier is None:
+        _notifier = Notifier(NOTIFY_BACKEND)
+    return _notifier
+
+def toast(app_id, title, msg, duration="short", icon=None):
+    get_notifier().submit({
+        "app_id": app_id,
+        "title": title,
+        "msg": msg,
+        "duration": duration,
+        "icon": icon,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
@@ -0,0 +1,135 @@
+"""
+OCR fallback for scanned PDF pages (no text layer, so pdfplumber finds no
+tables).
+
+Only pages that come back with neither tables nor characters are sent here,
+so normal PDFs never pay for it. Each page is rasterized with pypdfium2 and
+read with Tesseract (pytesseract) on a small process pool of its own
+(OCR_WORKERS). The rows are cached under OCR_CACHE_DIR by the PDF's sha256,
+the page index and the DPI, so a scanned page is only rendered and read once;
+a cached page costs neither.
+
+pytesseract and the tesseract binary are optional; without them scanned pages
+are reported and skipped as before.
+"""
+import atexit
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import OCR_CACHE_DIR, OCR_DPI, OCR_ENABLED, OCR_WORKERS
+from .pdf_access import file_digest
+
+# ================= TABLE RECONSTRUCTION =================
+
+def rows_from_words(data, min_conf=0):
+    """
+    Rebuilds table rows from pytesseract.image_to_data() output (dict form).
+    Words on one text line form a row; a horizontal gap wider than about one
+    word height starts a new cell.
+    """
+    lines = {}
+    for i, text in enumerate(data["text"]):
+        text = (text or "").strip()
+        if not text or float(data["conf"][i]) < min_conf:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(
+            (data["left"][i], data["top"][i], data["width"][i], data["height"][i], text)
+        )
+
+    rows = []
+    for words in sorted(lines.values(), key=lambda ws: min(w[1] for w in ws)):
+        words.sort()
+        cells = [[words[0][4]]]
+        for prev, word in zip(words, words[1:]):
+            gap = word[0] - (prev[0] + prev[2])
+            if gap > 1.2 * max(prev[3], word[3]):
+                cells.append([word[4]])
+            else:
+                cells[-1].append(word[4])
+        rows.append([" ".join(cell) for cell in cells])
+    return rows
+
+# ================= PAGE WORKER =================
+
+def page_key(digest, page_index, dpi=OCR_DPI):
+    """Cache key of one page: the PDF's sha256, the page index and the DPI it is read at."""
+    return f"{digest}_p{page_index}_{dpi}"
+
+def cache_path(key, cache_dir=OCR_CACHE_DIR):
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
+
+def ocr_page(pdf_path, page_index, digest, dpi=OCR_DPI, cache_dir=OCR_CACHE_DIR):
+    """Rows of one rasterized page; runs in an OCR worker process. `digest` is the PDF's sha256."""
+    path = cache_path(page_key(digest, page_index, dpi), cache_dir)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    import pypdfium2 as pdfium
+    import pytesseract
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        image = pdf[page_index].render(scale=dpi / 72).to_pil().convert("L")
+    finally:
+        pdf.close()
+
+    data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT, config="--psm 6")
+    rows = rows_from_words(data)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    return rows
+
+# ================= POOL =================
+
+_pool = None
+_available = None
+
+def ocr_available():
+    """True when pypdfium2, pytesseract and the tesseract binary can all be used."""
+    global _available
+    if _available is None:
+        _available = False
+        if OCR_ENABLED:
+            try:
+                importlib.import_module("pypdfium2")
+                import pytesseract
+                pytesseract.get_tesseract_version()
+                _available = True
+            except Exception as e:
+                print(f"⚠️ OCR fallback unavailable ({e.__class__.__name__}: {e})")
+    return _available
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        atexit.register(_pool.shutdown)
+    return _pool
+
+def ocr_pages(pdf_path, page_indices, mapped=None):
+    """
+    {page index: [rows]} for the given scanned pages, read in parallel on the
+    OCR pool (hashed from `mapped`, a MappedPdf of it, when given). Pages that
+    fail are left out. Empty when OCR is unavailable.
+    """
+    if not page_indices or not ocr_available():
+        return {}
+
+    digest = mapped.digest() if mapped else file_digest(pdf_path)
+    pool = get_pool()
+    futures = {i: pool.submit(ocr_page, pdf_path, i, digest) for i in page_indices}
+    results = {}
+    for i, fut in futures.items():
+        try:
+            results[i] = fut.result()
+        except Exception as e:
+            print(f"❌ OCR failed on page {i + 1} of {os.path.basename(pdf_path)}: {e}")
+    return results
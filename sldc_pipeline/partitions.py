@@ -0,0 +1,173 @@
+import os
+import re
+import time
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+from .config import COMBINED_MAX_ROWS, COMBINED_PARTITION
+
+# ================= PARTITION KEYS =================
+
+# One monthly file per site; section is "wind"/"solar" when a key refers to one sheet
+Partition = namedtuple("Partition", ["site", "year", "month", "section"], defaults=[None])
+
+MONTH_ABBRS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN",
+               "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+MONTH_INDEX = {abbr: i + 1 for i, abbr in enumerate(MONTH_ABBRS)}
+
+# (Site_Name)_(YYYY)_(MON).ext or (Site_Name)_(MON)_(YYYY).ext
+# Non-greedy site to handle underscores in the site name
+NAME_PATTERN = re.compile(
+    r"(?P<site>.+?)_(?:(?P<year>\d{4})_(?P<mon>[A-Z]{3})|(?P<mon_alt>[A-Z]{3})_(?P<year_alt>\d{4}))"
+    r"\.(?P<ext>pdf|xlsx)$",
+    re.I,
+)
+
+# Date anywhere in a base name, YEAR_MON first, MON_YEAR as fallback
+YEAR_MON = re.compile(r"(\d{4})_([A-Z]{3})")
+MON_YEAR = re.compile(r"([A-Z]{3})_(\d{4})")
+
+@lru_cache(maxsize=None)
+def parse_name(filename):
+    """Partition key for a monthly .pdf/.xlsx file name, or None if it doesn't follow the pattern."""
+    match = NAME_PATTERN.match(filename)
+    if not match:
+        return None
+    if match.group("year"):
+        year, mon = match.group("year"), match.group("mon")
+    else:
+        year, mon = match.group("year_alt"), match.group("mon_alt")
+    return Partition(match.group("site"), int(year), MONTH_INDEX.get(mon.upper(), 99))
+
+@lru_cache(maxsize=None)
+def date_string(base_name):
+    """'01-MM-YYYY' for the month in a file's base name, '' if there is none."""
+    upper = base_name.upper()
+    match = YEAR_MON.search(upper)
+    if match:
+        year, mon = match.group(1), match.group(2)
+    else:
+        match = MON_YEAR.search(upper)
+        if not match:
+            print(f"DEBUG WARNING: No date found in filename: {base_name}")
+            return ""
+        mon, year = match.group(1), match.group(2)
+    month = MONTH_INDEX.get(mon)
+    return f"01-{month:02d}-{year}" if month else ""
+
+def make_name(site, year, month, ext):
+    """File name for a partition; month may be an index (1-12) or an abbreviation."""
+    mon = MONTH_ABBRS[month - 1] if isinstance(month, int) else month
+    return f"{site}_{year}_{mon}.{ext}"
+
+def site_of(path):
+    key = parse_name(os.path.basename(path))
+    return key.site if key else None
+
+# ================= DIRECTORY INDEX =================
+
+class DirectoryIndex:
+    """
+    Cached scandir listing of one folder's partition files. The cache is
+    rebuilt only when the folder's mtime changes (files added, removed or
+    renamed), so repeated listing and grouping cost one stat() call.
+    """
+
+    def __init__(self, folder, ext):
+        self.folder = folder
+        self.ext = "." + ext.lower()
+        self.mtime = None
+        self.scanned_at = 0.0
+        self.files = []     # [(name, Partition)]
+        self.skipped = []   # names with the right extension but no date
+
+    def refresh(self):
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            self.mtime, self.files, self.skipped = None, [], []
+            return self
+        # Coarse mtime clocks (FAT, some network shares) can miss a change made
+        # in the same tick as the last scan, so a very recent mtime is re-checked
+        if mtime == self.mtime and self.scanned_at - mtime / 1e9 > 2.0:
+            return self
+
+        files, skipped = [], []
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                if not entry.name.lower().endswith(self.ext) or not entry.is_file():
+                    continue
+                key = parse_name(entry.name)
+                if key:
+                    files.append((entry.name, key))
+                else:
+                    skipped.append(entry.name)
+        self.mtime, self.files, self.skipped = mtime, files, skipped
+        self.scanned_at = time.time()
+        return self
+
+    def names(self):
+        return [name for name, _ in self.refresh().files] + list(self.skipped)
+
+    def groups(self):
+        """{site: [(file, (year, month_index)), ...]} sorted by month."""
+        grouped = defaultdict(list)
+        for name, key in self.refresh().files:
+            grouped[key.site].append((name, (key.year, key.month)))
+        for site in grouped:
+            grouped[site].sort(key=lambda item: item[1])
+        return grouped
+
+_indexes = {}
+
+def index_for(folder, ext):
+    """Shared DirectoryIndex per (folder, ext) so every stage reuses the same cache."""
+    key = (os.path.abspath(folder), ext.lower())
+    if key not in _indexes:
+        _indexes[key] = DirectoryIndex(folder, ext)
+    return _indexes[key]
+
+# ================= OUTPUT PARTITIONS =================
+
+def plan_partitions(months, sizes, policy=COMBINED_PARTITION, max_rows=COMBINED_MAX_ROWS):
+    """
+    Splits a workbook's months (sorted (year, month) keys) into partitions of
+    whole months. sizes[i] is the row count of month i's largest sheet.
+    Returns [(label, [month positions])]; the label is None when the
+    workbook stays one plain file (e.g. <site>_combined.xlsx).
+    """
+    if policy == "year":
+        groups = {}
+        for i, (year, _) in enumerate(months):
+            groups.setdefault(str(year), []).append(i)
+        groups = list(groups.items()) or [(None, [])]
+    else:
+        groups = [(None, list(range(len(months))))]
+    if policy == "none":
+        return groups
+
+    partitions = []
+    for label, positions in groups:
+        # Greedy, so a new month only ever changes the last chunk
+        chunks, rows = [[]], 0
+        for i in positions:
+            if chunks[-1] and rows + sizes[i] > max_rows:
+                chunks.append([])
+                rows = 0
+            chunks[-1].append(i)
+            rows += sizes[i]
+        if len(chunks) == 1:
+            partitions.append((label, chunks[0]))
+        else:
+            partitions.extend(
+                (f"{label}_part{n}" if label else f"part{n}", chunk) for n, chunk in enumerate(chunks, 1)
+            )
+    return partitions
+
+def remove_stale_partitions(stem, output_folder, keep):
+    """Deletes <stem>_<label>.xlsx files of an earlier split that aren't in `keep`."""
+    pattern = re.compile(re.escape(stem) + r"_(\d{4}(_part\d+)?|part\d+)\.xlsx$")
+    for name in sorted(os.listdir(output_folder)):
+        if pattern.match(name) and os.path.join(output_folder, name) not in keep:
+            os.remove(os.path.join(output_folder, name))
+            print(f"   🗑️ Removed old partition {name}")
@@ -0,0 +1,59 @@
+"""
+One read-only memory map per PDF, shared by validation, hashing and parsing.
+
+is_valid() looks at the first bytes of the mapping, digest() hashes the
+mapping in place and open() hands the same mapping to pdfplumber, so a PDF is
+read from disk once however many of them are used. Close the mapping before
+the file is moved or deleted (Windows refuses to replace a mapped file).
+"""
+import hashlib
+import mmap
+
+PDF_MAGIC = b"%PDF-"
+
+class MappedPdf:
+    def __init__(self, path):
+        self.path = path
+        self._digest = None
+        with open(path, "rb") as f:
+            # mmap can't map an empty file
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if f.seek(0, 2) else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def is_valid(self):
+        return self.map is not None and self.map[:len(PDF_MAGIC)] == PDF_MAGIC
+
+    def digest(self):
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.map if self.map is not None else b"").hexdigest()
+        return self._digest
+
+    def open(self):
+        """pdfplumber.PDF reading straight from the mapping."""
+        import pdfplumber
+
+        if self.map is None:
+            raise ValueError(f"{self.path} is empty")
+        self.map.seek(0)
+        return pdfplumber.open(self.map)
+
+def is_valid_pdf(path):
+    try:
+        with MappedPdf(path) as pdf:
+            return pdf.is_valid()
+    except (OSError, ValueError):
+        return False
+
+def file_digest(path):
+    with MappedPdf(path) as pdf:
+        return pdf.digest()
@@ -0,0 +1,192 @@
+"""
+Content-addressed storage for downloaded PDFs.
+
+Every distinct PDF is kept once as blobs/<sha256[:2]>/<sha256>.pdf, and
+index.json records, per target filename (site, year, month), the list of
+revisions that were served. The file in PDF_DIR is a working copy of the
+latest revision. Conversion and merging remember which hashes they were
+built from, so a byte-identical republished PDF is neither stored twice nor
+converted or merged again.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+
+from .config import STORE_DIR
+from .pdf_access import file_digest
+
+class PdfStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.index_path = os.path.join(root, "index.json")
+        self.lock = threading.RLock()
+        self.index = self._load()
+
+    def _load(self):
+        index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read PDF store index {self.index_path}: {e}")
+        # revisions: name -> [{sha256, hrefs, saved}]  oldest first
+        # files:     name -> [size, mtime_ns, sha256]  digest cache for PDF_DIR
+        # converted: name -> {sha256, has_data}
+        # merged:    site -> signature of the workbooks it was built from
+        for key in ("revisions", "files", "converted", "merged"):
+            index.setdefault(key, {})
+        return index
+
+    def save(self):
+        with self.lock:
+            os.makedirs(self.root, exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.index_path)
+
+    # ================= BLOBS & REVISIONS =================
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.pdf")
+
+    def revisions(self, name):
+        return list(self.index["revisions"].get(name, []))
+
+    def current(self, name):
+        revisions = self.index["revisions"].get(name)
+        return revisions[-1] if revisions else None
+
+    def find_href(self, name, href):
+        """Stored revision of `name` that was downloaded from `href`, if its blob is still there."""
+        with self.lock:
+            for rev in reversed(self.index["revisions"].get(name, [])):
+                if href in rev["hrefs"] and os.path.exists(self.blob_path(rev["sha256"])):
+                    return rev
+        return None
+
+    def add(self, name, path, href=None, digest=None):
+        """
+        Moves the downloaded file at `path` into the store as a revision of
+        `name` (`digest` if the caller already hashed it). Returns
+        (sha256, changed); changed is False when it is the same content as
+        the latest revision.
+        """
+        digest = digest or file_digest(path)
+        blob = self.blob_path(digest)
+        with self.lock:
+            if os.path.exists(blob):
+                os.remove(path)  # already stored, no second copy
+            else:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                os.replace(path, blob)
+
+            latest = self.current(name)
+            changed = latest is None or latest["sha256"] != digest
+            if changed:
+                self.index["revisions"].setdefault(name, []).append({
+                    "sha256": digest,
+                    "hrefs": [href] if href else [],
+                    "saved": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                })
+                self.save()
+            elif href and href not in latest["hrefs"]:
+                # Same file republished under another link
+                latest["hrefs"].append(href)
+                self.save()
+        return digest, changed
+
+    def checkout(self, digest, target_path):
+        """
+        Copies the blob to `target_path` (temp file + atomic rename) unless
+        that file already has this content. Not a hard link: a PDF copied over
+        the working file by hand would otherwise overwrite the blob too.
+        """
+        name = os.path.basename(target_path)
+        if os.path.exists(target_path) and self.digest(target_path) == digest:
+            return False
+        tmp = target_path + ".part"
+        shutil.copyfile(self.blob_path(digest), tmp)
+        os.replace(tmp, target_path)
+        with self.lock:
+            self._remember(name, target_path, digest)
+            self.save()
+        return True
+
+    # ================= DERIVED OUTPUTS =================
+
+    def _remember(self, name, path, digest):
+        st = os.stat(path)
+        self.index["files"][name] = [st.st_size, st.st_mtime_ns, digest]
+
+    def digest(self, path, mapped=None):
+        """
+        sha256 of a PDF in PDF_DIR, rehashed (from `mapped`, a MappedPdf of
+        it, when given) only when its size or mtime changed.
+        """
+        name = os.path.basename(path)
+        st = os.stat(path)
+        with self.lock:
+            cached = self.index["files"].get(name)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = mapped.digest() if mapped else file_digest(path)
+        with self.lock:
+            self._remember(name, path, digest)
+        return digest
+
+    def needs_conversion(self, pdf_path, excel_folder, mapped=None):
+        name = os.path.basename(pdf_path)
+        with self.lock:
+            done = self.index["converted"].get(name)
+        if not done or done["sha256"] != self.digest(pdf_path, mapped):
+            return True
+        excel_path = os.path.join(excel_folder, os.path.splitext(name)[0] + ".xlsx")
+        return done["has_data"] and not os.path.exists(excel_path)
+
+    def mark_converted(self, pdf_path, has_data, mapped=None, digest=None):
+        """`digest` is the hash the conversion actually read, when known (queue workers report it)."""
+        name = os.path.basename(pdf_path)
+        if digest is None:
+            digest = self.digest(pdf_path, mapped)
+        with self.lock:
+            self.index["converted"][name] = {"sha256": digest, "has_data": bool(has_data)}
+            self.save()
+
+    def merge_signature(self, file_data_list, excel_folder):
+        """Which PDF content every monthly workbook of a site came from."""
+        signature = []
+        for file, _ in sorted(file_data_list, key=lambda item: item[1]):
+            pdf_name = os.path.splitext(file)[0] + ".pdf"
+            with self.lock:
+                done = self.index["converted"].get(pdf_name)
+            if done and done["has_data"]:
+                signature.append([file, done["sha256"]])
+            else:
+                # Workbook not converted through the store, fall back to its stat
+                st = os.stat(os.path.join(excel_folder, file))
+                signature.append([file, f"{st.st_size}:{st.st_mtime_ns}"])
+        return signature
+
+    def needs_merge(self, site, signature, combined_path):
+        with self.lock:
+            return self.index["merged"].get(site) != signature or not os.path.exists(combined_path)
+
+    def mark_merged(self, site, signature):
+        with self.lock:
+            self.index["merged"][site] = signature
+            self.save()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PdfStore()
+        return _store
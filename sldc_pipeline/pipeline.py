@@ -0,0 +1,271 @@
+"""Overlapping scrape -> convert -> merge run, and the watch-folder mode."""
+import os
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+
+from .config import (COMBINED_DIR, CONVERT_WORKERS, EXCEL_DIR, GOVERNOR_INTERVAL, PDF_DIR,
+                     PIPELINE_QUEUE_SIZE, WATCH_DEBOUNCE_SECONDS)
+from .convert import convert_pdf
+from .governor import Governor, estimate_convert, estimate_merge, run_measured
+from .master import build_master, master_path
+from .merge import combined_path_for, group_excel_files, merge_site
+from .notify import toast
+from .partitions import index_for, site_of
+from .pdf_store import get_store
+
+# ================= STREAMING PIPELINE =================
+
+def streaming_pipeline(force=False):
+    """
+    Scrape, convert and merge with the stages overlapping: every PDF is
+    converted as soon as it is saved, and a site is merged as soon as its
+    scraping and conversions are finished, while other sites are still
+    downloading. PDFs and sites whose content did not change since the last
+    run are skipped unless `force` is set.
+    """
+    os.makedirs(EXCEL_DIR, exist_ok=True)
+    os.makedirs(COMBINED_DIR, exist_ok=True)
+
+    events = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    summary = {"converted": 0, "no_data": 0, "failed": 0, "unchanged": 0, "merged": 0}
+    store = get_store()
+    # Set when the consumer stops for good; whatever it raised is kept in `crashed`
+    stopped = threading.Event()
+    crashed = []
+
+    def hand_off(kind, value):
+        # A consumer that died must not leave the scraper blocked on a full queue
+        while not stopped.is_set():
+            try:
+                events.put((kind, value), timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    def feed_existing():
+        # PDFs already on disk go through the same unchanged-content check
+        for filename in sorted(index_for(PDF_DIR, "pdf").names()):
+            hand_off("pdf", os.path.join(PDF_DIR, filename))
+        hand_off("feed_done", None)
+
+    def consume():
+        pending = defaultdict(int)
+        seen_sites = set()
+        scrape_done = set()
+        merged = set()
+        feed_done = False
+        scraping_over = False
+        inflight = {}  # future -> ("convert", site, pdf path) | ("merge", site, signature)
+        tickets = {}   # future -> governor ticket
+        digests = {}   # pdf path being converted -> hash of the content it read
+        again = set()  # PDFs saved again while their conversion was running
+        retry = []     # ... queued again once that conversion is done
+        # Conversions and merges share the pool; the governor decides how many run
+        governor = Governor(CONVERT_WORKERS)
+
+        def collect(done):
+            for fut in done:
+                kind, site, key = inflight.pop(fut)
+                try:
+                    result, peak = fut.result()
+                except Exception as e:
+                    print(f"❌ {kind} failed for {site}: {e}")
+                    result, peak = None, None
+                    if kind == "convert":
+                        summary["failed"] += 1
+                governor.release(tickets.pop(fut), peak)
+                if kind == "convert":
+                    pending[site] -= 1
+                    digest = digests.pop(key)
+                    if key in again:
+                        again.discard(key)
+                        retry.append(key)
+                    if result is not None:
+                        store.mark_converted(key, result, digest=digest)
+                    if result:
+                        summary["converted"] += 1
+                    elif result is False:
+                        summary["no_data"] += 1
+                elif result:
+                    store.mark_merged(site, key)
+                    summary["merged"] += 1
+
+        def submit_conversion(executor, path):
+            site = site_of(path)
+            seen_sites.add(site)
+            if path in digests:
+                # Its conversion is running; a second process must not write the same workbook
+                again.add(path)
+                return
+            if not force and not store.needs_conversion(path, EXCEL_DIR):
+                summary["unchanged"] += 1
+                return
+            digest = store.digest(path)
+            # Wait until the governor admits the conversion; meanwhile the
+            # bounded queue pushes back on the scraper
+            estimate = estimate_convert(path)
+            ticket = governor.admit("convert", estimate)
+            while ticket is None:
+                done, _ = wait_futures(list(inflight), timeout=GOVERNOR_INTERVAL,
+                                       return_when=FIRST_COMPLETED)
+                collect(done)
+                ticket = governor.admit("convert", estimate)
+            try:
+                fut = executor.submit(run_measured, convert_pdf, path, EXCEL_DIR)
+            except Exception:
+                governor.release(ticket, None)
+                raise
+            pending[site] += 1
+            digests[path] = digest
+            inflight[fut] = ("convert", site, path)
+            tickets[fut] = ticket
+
+        def start_merge(executor, site, files):
+            signature = store.merge_signature(files, EXCEL_DIR)
+            if not force and not store.needs_merge(site, signature, combined_path_for(site, COMBINED_DIR)):
+                print(f"⏭️ {site}: no new data since the last merge, skipped")
+                merged.add(site)
+                return
+            ticket = governor.admit("merge", estimate_merge(files, EXCEL_DIR))
+            if ticket is None:
+                return  # retried on the next loop, once memory frees up
+            merged.add(site)
+            fut = executor.submit(run_measured, merge_site, site, files, EXCEL_DIR, COMBINED_DIR)
+            inflight[fut] = ("merge", site, signature)
+            tickets[fut] = ticket
+
+        def start_ready_merges(executor):
+            if not feed_done:
+                return
+            ready = [site for site in scrape_done if site not in merged and pending[site] == 0]
+            if not ready:
+                return
+            groups = group_excel_files(EXCEL_DIR)
+            for site in ready:
+                if not groups.get(site):
+                    merged.add(site)
+                    continue
+                try:
+                    start_merge(executor, site, groups[site])
+                except Exception as e:
+                    print(f"❌ merge failed for {site}: {e}")
+                    merged.add(site)
+
+        with ProcessPoolExecutor(max_workers=CONVERT_WORKERS) as executor:
+            while not (scraping_over and feed_done and not inflight and not retry):
+                if retry:
+                    kind, value = "pdf", retry.pop()
+                else:
+                    try:
+                        kind, value = events.get(timeout=0.2)
+                    except queue.Empty:
+                        kind, value = None, None
+
+                if kind == "pdf":
+                    # One unreadable PDF costs its own conversion, not the run
+                    try:
+                        submit_conversion(executor, value)
+                    except Exception as e:
+                        print(f"❌ convert failed for {os.path.basename(value)}: {e}")
+                        summary["failed"] += 1
+                elif kind == "site_done":
+                    scrape_done.add(value)
+                elif kind == "feed_done":
+                    feed_done = True
+                elif kind == "end":
+                    scraping_over = True
+                    # Sites that only have PDFs on disk (not in ENERGY_NAMES)
+                    scrape_done |= seen_sites
+
+                collect([f for f in inflight if f.done()])
+                start_ready_merges(executor)
+
+    def run_consumer():
+        try:
+            consume()
+        except BaseException as e:
+            crashed.append(e)
+            print(f"❌ Conversion stage stopped: {e}")
+        finally:
+            stopped.set()
+            # Unblock anything still putting; the scraper's later PDFs wait for the next run
+            while True:
+                try:
+                    events.get_nowait()
+                except queue.Empty:
+                    break
+
+    # Selenium is only needed once scraping actually starts
+    from .scrape import pdf_extraction
+
+    consumer = threading.Thread(target=run_consumer, daemon=True)
+    consumer.start()
+    threading.Thread(target=feed_existing, daemon=True).start()
+
+    try:
+        pdf_extraction(
+            on_pdf=lambda path: hand_off("pdf", path),
+            on_site_done=lambda site: hand_off("site_done", site),
+        )
+    finally:
+        hand_off("end", None)
+        consumer.join()
+
+    if crashed:
+        raise RuntimeError("the conversion stage stopped before the run finished") from crashed[0]
+
+    if summary["merged"] or not os.path.exists(master_path(COMBINED_DIR)):
+        build_master(group_excel_files(EXCEL_DIR), COMBINED_DIR)
+
+    msg = (f"Converted {summary['converted']} PDFs ({summary['no_data']} without data, "
+           f"{summary['failed']} failed, {summary['unchanged']} unchanged), "
+           f"merged {summary['merged']} sites.")
+    print(f"\n📢 {msg}")
+
+    toast(
+        app_id="SLDC Gujarat Data",
+        title="SLDC Pipeline Complete",
+        msg=msg,
+        duration="long"
+    )
+
+# ================= WATCH MODE =================
+
+def watch_downloads():
+    """
+    Long-running mode for PDFs that arrive in PDF_DIR by hand: each new or
+    replaced PDF is converted on its own and only its site is re-merged.
+    """
+    from .folder_watch import PdfFolderWatcher
+
+    os.makedirs(EXCEL_DIR, exist_ok=True)
+    os.makedirs(COMBINED_DIR, exist_ok=True)
+
+    store = get_store()
+
+    def handle(paths):
+        sites = set()
+        for path in paths:
+            if not store.needs_conversion(path, EXCEL_DIR):
+                print(f"⏭️ {os.path.basename(path)} has the same content as last time, skipped")
+                continue
+            try:
+                has_data = convert_pdf(path, EXCEL_DIR)
+                store.mark_converted(path, has_data)
+                if has_data:
+                    sites.add(site_of(path))
+            except Exception as e:
+                print(f"❌ Could not convert {os.path.basename(path)}: {e}")
+
+        groups = group_excel_files(EXCEL_DIR)
+        for site in sorted(site for site in sites if site):
+            if groups.get(site):
+                signature = store.merge_signature(groups[site], EXCEL_DIR)
+                merge_site(site, groups[site], EXCEL_DIR, COMBINED_DIR)
+                store.mark_merged(site, signature)
+        if sites:
+            build_master(groups, COMBINED_DIR)
+
+    PdfFolderWatcher(PDF_DIR, handle, debounce=WATCH_DEBOUNCE_SECONDS).run()
@@ -0,0 +1,214 @@
+"""
+`--profile` mode: `python -m sldc_pipeline --profile <command> ...`.
+
+Stages are marked in the code with @profiled("name") (pdf_extraction,
+excel_conversion, extract_sections, write_excel, excel_merging, merge_site,
+build_master). Outside a profiling run the decorator costs one global lookup
+per call. During one, everything goes to
+PROFILE_DIR/<time>_<command>/:
+
+    cprofile.prof / cprofile.txt  deterministic profile of the main thread
+                                  (pstats, snakeviz)
+    stacks.folded                 stacks of every thread sampled every
+                                  PROFILE_SAMPLE_INTERVAL, stage as the root
+                                  frame ("frame;frame;... count", for
+                                  flamegraph.pl or speedscope)
+    memory_<n>_<stage>.txt        tracemalloc: allocations that grew over the
+                                  stage, by line
+    summary.json                  calls, wall time and memory per stage
+
+Work done in process pools (parallel merges, the streaming run's
+conversions) is not profiled. Use `merge --workers 1` or `run --sequential`
+to see it.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from .config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_TRACEBACK_DEPTH
+
+_session = None
+
+class Sampler(threading.Thread):
+    """Samples every thread's Python stack into folded-stack counts."""
+
+    def __init__(self, session, interval):
+        super().__init__(daemon=True, name="profile-sampler")
+        self.session = session
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.counts = Counter()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            if self.session.paused:
+                continue
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stages = self.session.stages.get(ident) or [self.session.command]
+                self.counts[";".join(stages + frames[::-1])] += 1
+
+class Session:
+    def __init__(self, command, folder=PROFILE_DIR, interval=PROFILE_SAMPLE_INTERVAL):
+        self.command = command
+        self.pid = os.getpid()
+        self.folder = os.path.join(folder, f"{datetime.now():%Y%m%d-%H%M%S}_{command}")
+        self.stages = defaultdict(list)  # thread id -> open stage names, outermost first
+        self.summary = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+        self.snapshots = 0
+        # Time spent taking tracemalloc snapshots, left out of stage timings and stacks
+        self.overhead = 0.0
+        self.paused = False
+        self.lock = threading.Lock()
+        self.profile = cProfile.Profile()
+        self.sampler = Sampler(self, interval)
+
+    def start(self):
+        os.makedirs(self.folder, exist_ok=True)
+        tracemalloc.start(PROFILE_TRACEBACK_DEPTH)
+        self.started = time.perf_counter()
+        self.thread = threading.get_ident()
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+        self.sampler.stopped.set()
+        self.sampler.join()
+        elapsed = time.perf_counter() - self.started - self.overhead
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.profile.dump_stats(os.path.join(self.folder, "cprofile.prof"))
+        text = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=text).sort_stats("cumulative")
+        stats.print_stats(60)
+        stats.sort_stats("tottime").print_stats(30)
+        with open(os.path.join(self.folder, "cprofile.txt"), "w", encoding="utf-8") as f:
+            f.write(text.getvalue())
+
+        with open(os.path.join(self.folder, "stacks.folded"), "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.sampler.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+        summary = {
+            "command": self.command,
+            "seconds": round(elapsed, 3),
+            "snapshot_overhead_seconds": round(self.overhead, 3),
+            "samples": sum(self.sampler.counts.values()),
+            "memory_peak_mb": round(peak / 2**20, 1),
+            "memory_end_mb": round(current / 2**20, 1),
+            "stages": dict(self.summary),
+        }
+        with open(os.path.join(self.folder, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"📈 Profile of '{self.command}' ({elapsed:.1f}s) written to {self.folder}")
+
+    @contextmanager
+    def pause(self):
+        # Only called on the profiled thread; cProfile can only be toggled there
+        start = time.perf_counter()
+        self.profile.disable()
+        self.paused = True
+        try:
+            yield
+        finally:
+            self.paused = False
+            self.profile.enable()
+            self.overhead += time.perf_counter() - start
+
+    def snapshot(self):
+        with self.pause():
+            return tracemalloc.take_snapshot()
+
+    def snapshot_report(self, name, before, seconds):
+        with self.pause():
+            return self._write_report(name, before, seconds)
+
+    def _write_report(self, name, before, seconds):
+        after = tracemalloc.take_snapshot()
+        with self.lock:
+            self.snapshots += 1
+            path = os.path.join(self.folder, f"memory_{self.snapshots:02d}_{name}.txt")
+        current, peak = tracemalloc.get_traced_memory()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# {name}: {seconds:.2f}s, traced now {current / 2**20:.1f} MB, "
+                    f"peak so far {peak / 2**20:.1f} MB\n")
+            f.write("# Allocation growth over the stage, by line\n")
+            for diff in after.compare_to(before, "lineno")[:40]:
+                f.write(f"{diff}\n")
+        return current
+
+@contextmanager
+def stage(name, snapshot=False):
+    """
+    Marks a stage of a profiling run: its wall time, its root frame in the
+    sampled stacks and (with `snapshot`, on the main thread) a tracemalloc
+    report of what it allocated. Does nothing outside a profiling run.
+    """
+    session = _session
+    # Forked pool workers inherit the session object but not its threads
+    if session is None or session.pid != os.getpid():
+        yield
+        return
+
+    ident = threading.get_ident()
+    stages = session.stages[ident]
+    stages.append(name)
+    before = session.snapshot() if snapshot and ident == session.thread else None
+    start = time.perf_counter()
+    overhead = session.overhead
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start - (session.overhead - overhead)
+        stages.pop()
+        with session.lock:
+            entry = session.summary[name]
+            entry["calls"] += 1
+            entry["seconds"] = round(entry["seconds"] + seconds, 6)
+        if before is not None:
+            entry["memory_end_mb"] = round(session.snapshot_report(name, before, seconds) / 2**20, 1)
+
+def profiled(name, snapshot=False):
+    """Decorator form of stage()."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _session is None:
+                return func(*args, **kwargs)
+            with stage(name, snapshot):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def profile_run(command):
+    """Profiles everything inside the block as one run of `command`."""
+    global _session
+    session = Session(command)
+    session.start()
+    _session = session
+    try:
+        with stage(command, snapshot=True):
+            yield session
+    finally:
+        _session = None
+        session.stop()
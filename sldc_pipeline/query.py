@@ -0,0 +1,51 @@
+"""
+Read side of the merge outputs, used by the dashboard.
+
+Everything is served from the parquet files merging already writes (see
+master.py): the per-site slices in COMBINED_DIR/.master/ and the small
+aggregate tables next to them. No workbook is parsed per request. Reads are
+cached per file and keyed on its mtime, so the cache is invalidated exactly
+when a merge rewrites that file.
+"""
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from .config import COMBINED_DIR
+from .master import aggregate_path, slice_dir, slice_path
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+@lru_cache(maxsize=256)
+def _read(path, mtime_ns, months=None, section=None):
+    if mtime_ns is None:
+        return pd.DataFrame()
+    filters = []
+    if months:
+        filters.append(("Month", "in", list(months)))
+    if section:
+        filters.append(("Section", "==", section))
+    # Only the row groups / rows of the requested months are read
+    return pd.read_parquet(path, filters=filters or None)
+
+def sites(folder=COMBINED_DIR):
+    """Sites that have merged data."""
+    directory = slice_dir(folder)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name[:-len(".parquet")] for name in os.listdir(directory) if name.endswith(".parquet"))
+
+def aggregate(sheet, folder=COMBINED_DIR):
+    """An aggregate table of the master dataset, e.g. "Monthly by Site"."""
+    path = aggregate_path(sheet, folder)
+    return _read(path, _mtime(path))
+
+def site_rows(site_name, months=None, section=None, folder=COMBINED_DIR):
+    """Rows of one site, optionally only some months ("YYYY-MM") and one section."""
+    path = slice_path(site_name, folder)
+    return _read(path, _mtime(path), tuple(sorted(months)) if months else None, section)
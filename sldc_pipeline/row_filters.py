@@ -0,0 +1,46 @@
+"""
+Per-PDF row filters (config.ROW_FILTERS), applied by extract_sections() to
+each raw table row before it is aligned to the section header.
+
+- keep: the texts are part of the RowClassifier's one scan of the row, so a
+  row that mentions none of them is skipped right after it is classified.
+  Sites that keep only a few owners' rows skip nearly all the per-row work.
+- drop: only the owner/entity cell counts, and which cell that is is known
+  only after alignment. A drop text can only be in that cell if it is in the
+  row text, so the upper-cased drop texts join the same scan and rule out
+  almost every row. The few left are checked on their aligned owner/entity
+  cell.
+
+The rows kept are exactly the ones the old filters kept, when the owner
+filter ran on aligned rows and UNWANTED_TEXT on the finished DataFrame.
+"""
+import re
+
+from .config import ROW_FILTERS
+
+class RowFilter:
+    def __init__(self, keep=(), drop=()):
+        # Row text is upper-cased, so keep texts are too
+        self.keep = tuple(dict.fromkeys(text.upper() for text in keep))
+        self.drop = tuple(dict.fromkeys(drop))
+        self.drop_markers = tuple(dict.fromkeys(text.upper() for text in self.drop))
+        self.drop_pattern = (
+            re.compile("|".join(re.escape(text) for text in self.drop), re.IGNORECASE) if self.drop else None
+        )
+
+    def drops(self, cell):
+        """Drop check of a row's aligned owner/entity cell."""
+        return self.drop_pattern is not None and self.drop_pattern.search(str(cell)) is not None
+
+def row_filter_for(base_name, filters=ROW_FILTERS):
+    """The combined filter of every ROW_FILTERS entry whose key is in the PDF name ("*" = all)."""
+    keep, drop = [], []
+    for key, rules in filters.items():
+        if key == "*" or key in base_name.upper():
+            keep.extend(rules.get("keep", ()))
+            drop.extend(rules.get("drop", ()))
+    return RowFilter(keep, drop)
+
+def name_index(header, name_column):
+    """Position of the owner/entity column in a captured header, or None."""
+    return next((i for i, cell in enumerate(header) if name_column in str(cell).upper()), None)
@@ -0,0 +1,379 @@
+"""Stage 1: download monthly SLDC PDFs with a pool of headless browsers."""
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from .browser_pool import BrowserPool
+from .config import (BASE_URL, ICON_PATH, MONTH_INDEX, PDF_DIR, POOL_SIZE,
+                     RETRY_QUEUE_PATH, SCRAPE_SITES, SESSION_DIR, YEAR)
+from .fetch_resilience import LatencyTracker, CircuitBreaker, CircuitOpen, RetryQueue, resilient_call
+from .notify import toast
+from .partitions import make_name
+from .pdf_access import MappedPdf
+from .pdf_store import get_store
+from .profiling import profiled
+from .site_catalog import get_catalog, options_from_page, select_option, wanted_sites
+
+# ================= HELPERS =================
+
+def sanitize_name(s):
+    for ch in r'<>:"/\\|?*':
+        s = s.replace(ch, "")
+    return s.replace(" ", "_").replace("(", "").replace(")", "")
+
+def list_pdfs(folder=PDF_DIR):
+    return [f for f in os.listdir(folder) if f.lower().endswith(".pdf")]
+
+def wait_for_download(before_files, folder=PDF_DIR, timeout=30):
+    end = time.time() + timeout
+    while time.time() < end:
+        current = set(list_pdfs(folder))
+        new_files = current - before_files
+        if new_files:
+            return max(
+                new_files,
+                key=lambda f: os.path.getmtime(os.path.join(folder, f))
+            )
+        time.sleep(0.5)
+    return None
+
+def normalize(s):
+    return s.replace(" ", "").upper()
+
+def target_path_for(energy_name, year, month_name):
+    target_filename = make_name(sanitize_name(energy_name), year, month_name, "pdf")
+    return target_filename, os.path.join(PDF_DIR, target_filename)
+
+class SiteCountdown:
+    """
+    Calls on_site_done(site) exactly once per energy: when its last queued
+    month is handled, from report() when it has nothing to fetch, or from
+    finish() when some of its months crashed every attempt.
+    """
+
+    def __init__(self, tasks, on_site_done):
+        self.on_site_done = on_site_done
+        self.remaining = defaultdict(int)
+        for task in tasks:
+            self.remaining[task[0]] += 1
+        self.reported = set()
+        self.lock = threading.Lock()
+
+    def report(self, energy_name):
+        with self.lock:
+            if energy_name in self.reported:
+                return
+            self.reported.add(energy_name)
+        if self.on_site_done:
+            self.on_site_done(sanitize_name(energy_name))
+
+    def task_done(self, energy_name):
+        with self.lock:
+            self.remaining[energy_name] -= 1
+            finished = self.remaining[energy_name] == 0
+        if finished:
+            self.report(energy_name)
+
+    def finish(self, energy_names=()):
+        """Reports every energy not reported yet."""
+        for energy_name in list(energy_names) + list(self.remaining):
+            self.report(energy_name)
+
+@profiled("pdf_extraction", snapshot=True)
+def pdf_extraction(on_pdf=None, on_site_done=None, sites=None, refresh_catalog=False):
+    """
+    Downloads the latest PDF per (energy, month) into PDF_DIR.
+
+    `sites` picks the energies like SCRAPE_SITES (the default): "" for
+    ENERGY_NAMES, "all", or comma-separated names. on_pdf(path) is called as
+    soon as a PDF is saved and on_site_done(site) once an energy has no
+    months left in the queue (used by the streaming pipeline).
+    """
+    os.makedirs(PDF_DIR, exist_ok=True)
+
+    downloaded = []
+    already_present = []
+    no_pdf = []
+    skipped_future = []
+
+    # Energies whose dropdown option could not be found (skip their other months)
+    missing_energies = set()
+
+    # Names are matched to dropdown options from the cached site catalog, so
+    # an unknown name is known before any page is loaded
+    catalog = get_catalog(refresh_catalog)
+    catalog_lock = threading.Lock()
+    energy_names = wanted_sites(SCRAPE_SITES if sites is None else sites, catalog)
+    options = {}
+    for energy_name in energy_names:
+        option = catalog.resolve(energy_name)
+        if option is not None:
+            options[energy_name] = option
+            if option["name"] != energy_name:
+                print(f"🔎 {energy_name} → {option['name']}")
+        elif catalog.options:
+            print(f"❌ ENERGY not in the site list: {energy_name}")
+            missing_energies.add(energy_name)
+
+    # Shared by all pool sessions: adaptive timeout, site-down breaker, retry queue
+    latency = LatencyTracker(initial=30)
+    breaker = CircuitBreaker(threshold=5, cooldown=120)
+    retry_queue = RetryQueue(RETRY_QUEUE_PATH)
+    store = get_store()
+    RETRYABLE = {"timeout", "deferred", "error"}
+
+    # ================= SCRAPE ONE (ENERGY, MONTH) =================
+
+    def select_energy(session, energy_name, year):
+        driver, wait = session.driver, session.wait
+
+        driver.get(BASE_URL)
+        time.sleep(1)
+
+        # ---------- ENERGY DROPDOWN ----------
+        energy_select = wait.until(
+            EC.presence_of_element_located((By.ID, "energy_name"))
+        )
+
+        driver.execute_script(
+            "arguments[0].scrollIntoView({block:'center'});",
+            energy_select
+        )
+
+        with catalog_lock:
+            option = options.get(energy_name) or catalog.resolve(energy_name)
+        if option is None or not select_option(driver, energy_select, option["value"]):
+            # No catalog yet, or the dropdown changed: re-read it from this page
+            with catalog_lock:
+                catalog.update(options_from_page(driver, energy_select))
+                option = catalog.resolve(energy_name)
+            if option is None or not select_option(driver, energy_select, option["value"]):
+                return False
+        options[energy_name] = option
+        print(f"✅ [S{session.index}] Selected ENERGY: {option['name']}")
+
+        # ---------- YEAR ----------
+        Select(driver.find_element(By.ID, "year")).select_by_visible_text(year)
+        session.loaded_energy = (energy_name, year)
+        return True
+
+    def scrape_month(session, task):
+        energy_name, year, month_name = task
+        driver = session.driver
+
+        if energy_name in missing_energies:
+            return "not_found"
+
+        def fetch_links(timeout):
+            # Reuse the loaded page when this session already has the energy selected
+            if session.loaded_energy != (energy_name, year):
+                if not select_energy(session, energy_name, year):
+                    return None
+
+            Select(driver.find_element(By.ID, "month")).select_by_visible_text(month_name)
+            submit_btn = session.wait.until(
+                EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']"))
+            )
+            driver.execute_script("arguments[0].click();", submit_btn)
+
+            try:
+                WebDriverWait(driver, timeout).until(
+                    EC.presence_of_all_elements_located(
+                        (By.XPATH, "//a[contains(@href, '.pdf')]")
+                    )
+                )
+            except TimeoutException:
+                print(f"⏳ [S{session.index}] No PDF links after {timeout:.0f}s, backing off")
+                # Page state is unknown after a timeout, force a reload next attempt
+                session.loaded_energy = None
+                raise
+
+            return driver.find_elements(By.XPATH, "//a[contains(@href, '.pdf')]")
+
+        print(f"📅 [S{session.index}] {energy_name} → {month_name} {year}")
+
+        target_filename, target_path = target_path_for(energy_name, year, month_name)
+
+        try:
+            all_pdf_links = resilient_call(fetch_links, breaker, latency, TimeoutException)
+        except CircuitOpen:
+            print(f"🚫 Site looks down, deferring {energy_name} {month_name} {year} to next run")
+            return "deferred"
+        except TimeoutException:
+            print("❌ Timeout waiting for PDF links")
+            return "timeout"
+
+        if all_pdf_links is None:
+            print(f"❌ ENERGY not found: {energy_name}")
+            missing_energies.add(energy_name)
+            return "not_found"
+
+        # The configured name and the dropdown's spelling of it
+        energy_norms = {normalize(energy_name), normalize(options[energy_name]["name"])}
+
+        filtered_links = []
+        for link in all_pdf_links:
+            href = link.get_attribute("href") or ""
+            href_norm = href.replace(" ", "").upper()
+
+            # ✅ keep only PDFs that belong to this ENERGY
+            if any(norm in href_norm for norm in energy_norms):
+                filtered_links.append(link)
+
+        if not filtered_links:
+            print("❌ No ENERGY-specific PDF links found on page")
+            print("   PDFs seen on page:")
+            for l in all_pdf_links:
+                print("   →", l.get_attribute("href"))
+            return "no_pdf"
+
+        # ✅ NOW pick the last ENERGY-specific PDF
+        selected_link = filtered_links[-1]
+
+        href = selected_link.get_attribute("href")
+        print(f"⬇️ [S{session.index}] Clicking LAST PDF on page:")
+        print("   ", href)
+
+        # Same link as a stored revision: restore it instead of downloading again
+        known = store.find_href(target_filename, href)
+        if known:
+            store.checkout(known["sha256"], target_path)
+            print(f"♻️ Restored from store: {target_filename}")
+            return "downloaded"
+
+        before_files = set(list_pdfs(session.download_dir))
+
+        # 🔴 IMPORTANT: click link (do NOT driver.get)
+        driver.execute_script("arguments[0].click();", selected_link)
+
+        new_file = wait_for_download(before_files, session.download_dir)
+
+        if not new_file:
+            print("❌ PDF download did not complete")
+            return "timeout"
+
+        new_path = os.path.join(session.download_dir, new_file)
+
+        # Validate and hash from one mapping; it is closed before the file moves
+        with MappedPdf(new_path) as mapped:
+            valid = mapped.is_valid()
+            digest = mapped.digest() if valid else None
+
+        if not valid:
+            print("⚠️ Downloaded file is not a valid PDF")
+            os.remove(new_path)
+            return "no_pdf"
+
+        digest, changed = store.add(target_filename, new_path, href, digest)
+        store.checkout(digest, target_path)
+        if changed:
+            print(f"✅ Saved as: {target_filename}")
+        else:
+            print(f"✅ Saved as: {target_filename} (same content as the stored revision)")
+        return "downloaded"
+
+    # ================= MAIN =================
+
+    def status_entry(energy_name, year, month_name):
+        return f"{energy_name}-{month_name}" if year == YEAR else f"{energy_name}-{month_name} {year}"
+
+    # Failed months from earlier runs go first
+    tasks = []
+    for task in retry_queue.drain():
+        energy_name, year, month_name = task
+        if not os.path.exists(target_path_for(energy_name, year, month_name)[1]):
+            print(f"🔁 Retrying from last run: {energy_name} → {month_name} {year}")
+            tasks.append(task)
+
+    for ENERGY_NAME in energy_names:
+        print(f"\n🔄 Queueing ENERGY: {ENERGY_NAME}")
+
+        for month_name, month_num in MONTH_INDEX.items():
+            if datetime(int(YEAR), int(month_num), 1) > datetime.now():
+                print(f"⏩ Skipping future month: {month_name}")
+                skipped_future.append(status_entry(ENERGY_NAME, YEAR, month_name))
+                continue
+
+            target_filename, target_path = target_path_for(ENERGY_NAME, YEAR, month_name)
+            if os.path.exists(target_path):
+                print(f"✔️ Already exists: {target_filename}")
+                already_present.append(status_entry(ENERGY_NAME, YEAR, month_name))
+                continue
+
+            if (ENERGY_NAME, YEAR, month_name) not in tasks:
+                tasks.append((ENERGY_NAME, YEAR, month_name))
+
+    # Streaming hooks: hand each saved PDF to the caller as soon as it is valid,
+    # and report an energy as done once none of its months are left in the queue
+    countdown = SiteCountdown(tasks, on_site_done)
+
+    def handle(session, task):
+        status = scrape_month(session, task)
+        if status == "downloaded" and on_pdf:
+            on_pdf(target_path_for(*task)[1])
+        countdown.task_done(task[0])
+        return status
+
+    for energy_name in energy_names:
+        if not countdown.remaining.get(energy_name):
+            countdown.report(energy_name)  # nothing to fetch
+
+    pool = BrowserPool(POOL_SIZE, SESSION_DIR)
+    failed = []
+    for task, status in pool.run(tasks, handle):
+        if status == "downloaded":
+            downloaded.append(status_entry(*task))
+        else:
+            no_pdf.append(status_entry(*task))
+            if status in RETRYABLE:
+                failed.append(task)
+
+    retry_queue.save(failed)
+    if failed:
+        print(f"\n🔁 {len(failed)} month(s) queued for retry next run")
+
+    # Tasks that crashed every attempt never reached handle()'s countdown
+    countdown.finish(energy_names)
+
+    print("\n🎯 DONE — all energies processed.")
+
+    status_map = defaultdict(lambda: defaultdict(list))
+    for entry in downloaded:
+        energy, month = entry.rsplit("-", 1)
+        status_map[energy]["✅ Downloaded"].append(month)
+    for entry in already_present:
+        energy, month = entry.rsplit("-", 1)
+        status_map[energy]["✔️ Existing"].append(month)
+    for entry in no_pdf:
+        energy, month = entry.rsplit("-", 1)
+        status_map[energy]["❌ Not Found"].append(month)
+    for entry in skipped_future:
+        energy, month = entry.rsplit("-", 1)
+        status_map[energy]["⏩ Skipped"].append(month)
+
+    lines = []
+    for energy, statuses in status_map.items():
+        lines.append(f"📌 {energy}")
+        for status, months in statuses.items():
+            lines.append(f"  {status}: {', '.join(months)}")
+
+    summary_msg = "\n".join(lines) if lines else "No files processed."
+
+    # ---------------- Notification ----------------
+    toast(
+        app_id="SLDC Gujarat Multi-Energy",
+        title="🔔 SLDC PDF Download Summary",
+        msg=summary_msg,
+        duration="long",
+        icon=ICON_PATH
+    )
+
+    print("\n📢 Done. Summary:\n")
+    print(summary_msg)
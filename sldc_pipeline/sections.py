@@ -0,0 +1,103 @@
+"""Precompiled marker matching and row classification for the section engine in convert.py."""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .config import SECTIONS, TOTAL_MARKER
+
+class MarkerMatcher:
+    """
+    Finds which of a fixed set of markers occur in a text with one regex scan.
+
+    The pattern is a lookahead alternation tried at every position, longest
+    marker first, so overlapping markers are all seen. A marker that is a
+    substring of a longer hit (e.g. "WIND FARM OWNER" inside "SHARE OF WIND
+    FARM OWNER") is implied by it. Most rows are plain data rows, so a
+    plain alternation search rules them out first.
+    """
+
+    def __init__(self, markers):
+        self.markers = sorted(set(markers), key=len, reverse=True)
+        alternation = "|".join(re.escape(m) for m in self.markers)
+        self.any = re.compile(alternation)
+        self.pattern = re.compile("(?=(" + alternation + "))")
+        self.implied = {
+            m: frozenset(other for other in self.markers if other in m)
+            for m in self.markers
+        }
+
+    def find(self, text):
+        hits = set()
+        if not self.any.search(text):
+            return hits
+        for match in self.pattern.finditer(text):
+            hits |= self.implied[match.group(1)]
+        return hits
+
+@lru_cache(maxsize=None)
+def _matcher_for(markers):
+    return MarkerMatcher(markers)
+
+def section_markers(sections=SECTIONS):
+    markers = [TOTAL_MARKER]
+    for spec in sections:
+        markers.append(spec["start"])
+        markers.extend(spec["header"])
+    return markers
+
+def section_matcher(sections=SECTIONS):
+    """Shared matcher for every start, header and TOTAL marker of `sections`."""
+    return _matcher_for(tuple(section_markers(sections)))
+
+# ================= ROW CLASSIFIER =================
+
+def row_text(cells):
+    """The text markers are matched against: non-empty cells, stripped, upper-cased, space-joined."""
+    return " ".join([c.strip().upper() if isinstance(c, str) else "" for c in cells if c])
+
+# text     normalized row text (row_text), kept so it is never rebuilt
+# start    name of the section this row opens, or None
+# total    row contains the TOTAL marker
+# headers  names of the sections whose header markers are all in the row
+# data     first cell is a serial number
+# owner    row passes the file's owner filter (always True without one)
+# drop     row mentions one of the file's drop texts (see row_filters.py)
+RowTags = namedtuple("RowTags", "text start total headers data owner drop")
+
+class RowClassifier:
+    """
+    Tags a table row in one go: its text is normalized once and every start,
+    header, TOTAL, owner and drop marker is found in the same scan.
+    """
+
+    def __init__(self, sections=SECTIONS, owner_markers=(), drop_markers=()):
+        self.owner_markers = frozenset(owner_markers)
+        self.drop_markers = frozenset(drop_markers)
+        self.matcher = _matcher_for(
+            tuple(section_markers(sections)) + tuple(sorted(self.owner_markers | self.drop_markers))
+        )
+        # Config order decides which section a row opens if it has several start markers
+        self.starts = [(spec["start"], spec["name"]) for spec in sections]
+        self.headers = [(spec["name"], frozenset(spec["header"])) for spec in sections]
+
+    def owner_hit(self, hits):
+        return not self.owner_markers or not self.owner_markers.isdisjoint(hits)
+
+    def classify(self, cells, text=None):
+        if text is None:
+            text = row_text(cells)
+        hits = self.matcher.find(text)
+        first = cells[0] if cells and isinstance(cells[0], str) else ""
+        return RowTags(
+            text=text,
+            start=next((name for marker, name in self.starts if marker in hits), None),
+            total=TOTAL_MARKER in hits,
+            headers=frozenset(name for name, markers in self.headers if markers <= hits),
+            data=first.strip().isdigit(),
+            owner=self.owner_hit(hits),
+            drop=not self.drop_markers.isdisjoint(hits),
+        )
+
+    def owner_ok(self, cells):
+        """Owner filter for a row rebuilt from a subset of the classified cells."""
+        return self.owner_hit(self.matcher.find(row_text(cells)))
@@ -0,0 +1,218 @@
+"""
+Catalog of the energy sites in the SLDC page's `energy_name` dropdown.
+
+The option list is read once, over plain HTTP (or from a page a browser
+already loaded), and cached in CATALOG_PATH for CATALOG_TTL_HOURS. Site
+names from ENERGY_NAMES, SLDC_SITES or `scrape --sites` are resolved against
+it before scraping starts, so an unknown name costs no page load and the
+scraper selects each site's option by value instead of reading every option
+through the browser.
+
+Lookups are loose: case, spaces and punctuation don't matter, nor does a
+missing voltage prefix or bracketed part ("66 KV GHELDA(GNESL)",
+"66KV_GHELDA (GNESL)" and "ghelda gnesl" are one site), and a near miss is
+accepted when it points to exactly one site.
+"""
+import difflib
+import json
+import os
+import re
+import time
+import urllib.request
+from html.parser import HTMLParser
+
+from .config import BASE_URL, CATALOG_PATH, CATALOG_TTL_HOURS, ENERGY_NAMES
+from .stable_output import write_json
+
+VOLTAGE_PREFIX = re.compile(r"^\s*\d+[\s_]*KV[\s_]*", re.IGNORECASE)
+BRACKETS = re.compile(r"\(.*?\)")
+
+# One round trip for the whole list, instead of one per option element
+OPTIONS_SCRIPT = "return Array.from(arguments[0].options).map(o => [o.text, o.value]);"
+SELECT_SCRIPT = """
+var select = arguments[0];
+var option = Array.from(select.options).find(o => o.value === arguments[1]);
+if (!option) return false;
+option.selected = true;
+select.dispatchEvent(new Event('change'));
+return true;
+"""
+
+# ================= LOOKUP KEYS =================
+
+def site_key(text):
+    """Letters and digits only, upper-cased: "66 KV Ghelda(GNESL)" -> "66KVGHELDAGNESL"."""
+    return re.sub(r"[^A-Z0-9]", "", text.upper())
+
+def alias_keys(text):
+    """Keys of a site name, most specific first: full, without voltage, without brackets."""
+    bare = VOLTAGE_PREFIX.sub("", text)
+    keys = []
+    for key in (site_key(text), site_key(bare), site_key(BRACKETS.sub("", bare))):
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+# ================= DROPDOWN =================
+
+class _OptionParser(HTMLParser):
+    def __init__(self, select_id):
+        super().__init__()
+        self.select_id = select_id
+        self.inside = False
+        self.current = None
+        self.options = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "select":
+            self.inside = attrs.get("id") == self.select_id
+        elif tag == "option" and self.inside:
+            # An <option> without value= submits its text
+            self.current = [attrs.get("value"), ""]
+            self.options.append(self.current)
+
+    def handle_data(self, data):
+        if self.current is not None:
+            self.current[1] += data
+
+    def handle_endtag(self, tag):
+        if tag in ("option", "select"):
+            self.current = None
+        if tag == "select":
+            self.inside = False
+
+def clean_options(pairs):
+    """[(text, value)] -> [{"name", "value"}], whitespace collapsed like Selenium's .text."""
+    options = []
+    for text, value in pairs:
+        name = " ".join(text.split())
+        value = name if value is None else value
+        # Skip the "-- Select --" placeholder
+        if name and value.strip():
+            options.append({"name": name, "value": value})
+    return options
+
+def fetch_options(url=BASE_URL, timeout=30):
+    """The dropdown's options, read from the page's HTML without a browser."""
+    request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        html = response.read().decode(response.headers.get_content_charset() or "utf-8", "replace")
+    parser = _OptionParser("energy_name")
+    parser.feed(html)
+    return clean_options((text, value) for value, text in parser.options)
+
+def options_from_page(driver, select_element):
+    """The dropdown's options from a page loaded in Selenium."""
+    return clean_options((text, value) for text, value in driver.execute_script(OPTIONS_SCRIPT, select_element))
+
+def select_option(driver, select_element, value):
+    """Selects the option with `value` and fires the change event; False if there is none."""
+    return driver.execute_script(SELECT_SCRIPT, select_element, value)
+
+# ================= CATALOG =================
+
+class SiteCatalog:
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self.options = []
+        self.fetched = 0.0
+        self._index = None
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self.options = data["options"]
+                self.fetched = data["fetched"]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Ignoring unreadable site catalog {path}: {e}")
+
+    def is_fresh(self, ttl_hours=CATALOG_TTL_HOURS):
+        return bool(self.options) and time.time() - self.fetched < ttl_hours * 3600
+
+    def update(self, options):
+        self.options = options
+        self.fetched = time.time()
+        self._index = None
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        write_json(self.path, {"fetched": self.fetched, "options": options})
+
+    def names(self):
+        return [option["name"] for option in self.options]
+
+    def index(self):
+        """{lookup key: {option position: rank of the key, 0 = full name}}, built once per option list."""
+        if self._index is None:
+            self._index = {}
+            for i, option in enumerate(self.options):
+                for rank, key in enumerate(alias_keys(option["name"])):
+                    self._index.setdefault(key, {}).setdefault(i, rank)
+        return self._index
+
+    def _unique(self, hits):
+        # Options that own the key most directly; more than one is ambiguous
+        best = min(hits.values())
+        top = [i for i, rank in hits.items() if rank == best]
+        return self.options[top[0]] if len(top) == 1 else None
+
+    def resolve(self, name):
+        """The option {"name", "value"} meant by `name`, or None if unknown or ambiguous."""
+        index = self.index()
+        for key in alias_keys(name):
+            if key in index:
+                return self._unique(index[key])
+        close = difflib.get_close_matches(site_key(name), list(index), n=2, cutoff=0.9)
+        found = [self._unique(index[key]) for key in close]
+        found = {option["value"]: option for option in found if option is not None}
+        return found.popitem()[1] if len(found) == 1 else None
+
+def get_catalog(refresh=False, path=CATALOG_PATH, url=BASE_URL):
+    """
+    The cached catalog, re-read from the site when it is older than
+    CATALOG_TTL_HOURS (or with refresh). If the site can't be reached, the
+    stale copy is kept; with no copy at all the catalog is empty and the
+    scraper fills it from the first page it loads.
+    """
+    catalog = SiteCatalog(path)
+    if refresh or not catalog.is_fresh():
+        try:
+            options = fetch_options(url)
+        except (OSError, ValueError) as e:
+            options = []
+            print(f"⚠️ Could not read the site list from {url}: {e}")
+        if options:
+            catalog.update(options)
+            print(f"📇 Site catalog refreshed: {len(options)} sites")
+        elif catalog.options:
+            print(f"⚠️ Using the site catalog from {time.ctime(catalog.fetched)}")
+    return catalog
+
+def wanted_sites(spec, catalog):
+    """
+    Site names a `--sites` / SLDC_SITES value asks for: "" = ENERGY_NAMES,
+    "all" = every site in the catalog, else a comma-separated list.
+    """
+    spec = spec.strip()
+    if not spec:
+        return list(ENERGY_NAMES)
+    if spec.lower() == "all":
+        if not catalog.options:
+            print("⚠️ Site catalog is empty, scraping ENERGY_NAMES instead of all sites")
+            return list(ENERGY_NAMES)
+        return catalog.names()
+    return [name.strip() for name in spec.split(",") if name.strip()]
+
+def print_catalog(names=(), refresh=False):
+    """Lists the catalog's sites, or shows which site each of `names` resolves to."""
+    catalog = get_catalog(refresh)
+    if not catalog.options:
+        print("⚠️ Site catalog is empty")
+        return
+    if not names:
+        print(f"📇 {len(catalog.options)} sites (read {time.ctime(catalog.fetched)}):")
+        for name in catalog.names():
+            print(f"   {name}")
+        return
+    for name in names:
+        option = catalog.resolve(name)
+        print(f"   {name} → {option['name']}" if option else f"   ❌ {name}: no single matching site")
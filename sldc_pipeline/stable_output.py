@@ -0,0 +1,92 @@
+"""
+Byte-stable output files.
+
+openpyxl stamps every workbook with the current time (docProps/core.xml and
+the zip entry dates), so re-running on unchanged data still produces new
+bytes, and the daily workflow commits a new blob for every file. The writers
+here build the file in memory with those stamps fixed, compare it with the
+file on disk and leave the file untouched (same bytes, same mtime) when
+nothing changed.
+"""
+import io
+import json
+import os
+import re
+import zipfile
+
+import pandas as pd
+
+from .config import OUTPUT_SINKS
+from .profiling import profiled
+
+# Zip entries can't be dated before 1980
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+FIXED_STAMP = "1980-01-01T00:00:00Z"
+CORE_DATES = re.compile(rb"(<dcterms:(created|modified)[^>]*>)[^<]*(</dcterms:\2>)")
+
+def write_if_changed(path, data):
+    """Writes `data` to `path` atomically unless the file already holds exactly it. Returns True if written."""
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+def stable_zip(data):
+    """Re-packs an xlsx with fixed entry dates/attributes and fixed created/modified properties."""
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w") as dst:
+        for info in src.infolist():
+            content = src.read(info.filename)
+            if info.filename == "docProps/core.xml":
+                content = CORE_DATES.sub(rb"\g<1>" + FIXED_STAMP.encode() + rb"\g<3>", content)
+            entry = zipfile.ZipInfo(info.filename, date_time=ZIP_DATE)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            entry.create_system = 0  # same bytes whether written on Windows or Linux
+            entry.external_attr = 0
+            dst.writestr(entry, content, compresslevel=6)
+    return out.getvalue()
+
+@profiled("write_excel")
+def write_excel(path, sheets):
+    """Writes {sheet name: DataFrame} (index=False) as a byte-stable xlsx. Returns True if the file changed."""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for sheet, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet, index=False)
+    return write_if_changed(path, stable_zip(buf.getvalue()))
+
+def write_parquet(path, df):
+    buf = io.BytesIO()
+    df.to_parquet(buf, index=False)
+    return write_if_changed(path, buf.getvalue())
+
+def write_json(path, obj):
+    return write_if_changed(path, json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8"))
+
+def write_outputs(excel_path, sheets, sinks=OUTPUT_SINKS):
+    """
+    Writes one converted PDF's {sheet: DataFrame} to every sink: "xlsx" is
+    `excel_path`, "csv" is <name>.<sheet>.csv beside it. Returns True if any file changed.
+    """
+    changed = False
+    if "xlsx" in sinks:
+        changed = write_excel(excel_path, sheets) or changed
+    if "csv" in sinks:
+        base = os.path.splitext(excel_path)[0]
+        for sheet, df in sheets.items():
+            path = f"{base}.{sheet.lower().replace(' ', '_')}.csv"
+            changed = write_if_changed(path, df.to_csv(index=False).encode("utf-8")) or changed
+    return changed
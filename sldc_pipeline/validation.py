@@ -0,0 +1,107 @@
+"""
+Data-quality checks of a converted PDF against the TOTAL rows SLDC prints.
+
+For every section the summed energy columns of the extracted rows are
+compared with the section's TOTAL row, the row count with the last serial
+number printed in the PDF, and rows that could not be mapped onto the header
+are listed. The result goes to QUALITY_DIR/<pdf name>.json.
+"""
+import os
+
+import pandas as pd
+
+from .config import MASTER_FIELDS, QUALITY_DIR, VALIDATION_TOLERANCE
+from .master import find_column
+from .stable_output import write_json
+
+def to_numbers(frame):
+    """Element-wise numeric version of a frame of PDF strings ("1,234.5" -> 1234.5)."""
+    # apply() hands a frame without rows back as it is, still text; the cast
+    # makes its sums 0.0 instead of ""
+    return frame.apply(
+        lambda col: pd.to_numeric(col.astype(str).str.replace(",", "", regex=False).str.strip(),
+                                  errors="coerce")
+    ).astype("float64")
+
+def check_section(section, df, filtered):
+    """Quality report of one section; `df` is the frame that was written to Excel."""
+    header, rows, totals, dropped, unwanted = section
+    report = {
+        "rows": len(df),
+        "last_sr_no": None,
+        "totals_found": len(totals),
+        "checks": [],
+        "dropped_rows": dropped,
+    }
+    if not header:
+        report["status"] = "no_section"
+        return report
+
+    # Serial numbers as printed in the PDF (the Excel ones are renumbered)
+    serials = to_numbers(pd.DataFrame({"sr": [row[0] for row in rows + unwanted]}))["sr"]
+    if serials.notna().any():
+        report["last_sr_no"] = int(serials.max())
+
+    if totals:
+        # One vectorized pass each over the written rows and the TOTAL rows
+        written = to_numbers(df)
+        total_sums = to_numbers(pd.DataFrame(totals, columns=range(len(header)))).sum(min_count=1)
+
+        for field, (keyword, exclude, numeric) in MASTER_FIELDS.items():
+            if not numeric:
+                continue
+            col = find_column(header, keyword, exclude)
+            if col is None:
+                continue
+            expected = total_sums[header.index(col)]
+            if pd.isna(expected):
+                continue
+            extracted = written[col].sum() if col in written.columns else 0.0
+            diff = float(extracted) - float(expected)
+            report["checks"].append({
+                "field": field,
+                "extracted": round(float(extracted), 6),
+                "total": float(expected),
+                "diff": round(diff, 6),
+                "ok": abs(diff) <= VALIDATION_TOLERANCE * max(1.0, abs(float(expected))),
+            })
+
+    count_ok = report["last_sr_no"] is None or report["last_sr_no"] == len(df)
+    sums_ok = all(check["ok"] for check in report["checks"])
+    if filtered:
+        # Owner filter keeps only some rows, the PDF totals can't match
+        report["status"] = "filtered"
+    elif dropped or not count_ok or not sums_ok:
+        report["status"] = "mismatch"
+    elif not totals:
+        report["status"] = "no_total"
+    else:
+        report["status"] = "ok"
+    return report
+
+def write_report(base_name, sections, frames, filtered, folder=QUALITY_DIR):
+    """
+    Checks every section and writes <folder>/<base_name>.json.
+    `frames` maps section name -> the DataFrame written to Excel.
+    """
+    report = {
+        "file": base_name,
+        "owner_filter": filtered,
+        "sections": {
+            name: check_section(section, frames[name], filtered)
+            for name, section in sections.items()
+        },
+    }
+    statuses = {s["status"] for s in report["sections"].values()}
+    report["status"] = "mismatch" if "mismatch" in statuses else "ok"
+
+    os.makedirs(folder, exist_ok=True)
+    write_json(os.path.join(folder, f"{base_name}.json"), report)
+
+    for name, section_report in report["sections"].items():
+        if section_report["status"] == "mismatch":
+            failed = [c["field"] for c in section_report["checks"] if not c["ok"]]
+            print(f"⚠️ Validation mismatch in {base_name} [{name}]: "
+                  f"{section_report['rows']} rows vs Sr No {section_report['last_sr_no']}, "
+                  f"{len(section_report['dropped_rows'])} dropped, totals off: {failed or 'none'}")
+    return report
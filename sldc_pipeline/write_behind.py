@@ -0,0 +1,66 @@
+"""
+Write-behind output stage for the conversion loop.
+
+Serializing a workbook with openpyxl is about as slow as parsing the PDF, and
+both are pure Python, so a thread would only take turns with the parser. The
+writer therefore runs in its own processes. convert_pdf() hands the finished
+DataFrames to submit() and goes on to the next PDF. At most
+OUTPUT_QUEUE_SIZE writes wait at a time; beyond that submit() blocks until
+the oldest is done, so memory stays bounded.
+
+Results come back on the main thread through `on_done(key, changed, error)`,
+called from submit(), poll() and flush(), so store bookkeeping never runs
+concurrently. Leaving the `with` block flushes every pending write, also
+when the loop stops on an exception.
+"""
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait as wait_futures
+
+from .config import OUTPUT_QUEUE_SIZE, OUTPUT_SINKS, OUTPUT_WRITERS
+from .stable_output import write_outputs
+
+class WriteBehind:
+    def __init__(self, on_done, workers=OUTPUT_WRITERS, max_pending=OUTPUT_QUEUE_SIZE, sinks=OUTPUT_SINKS):
+        self.on_done = on_done
+        self.max_pending = max(1, max_pending)
+        self.sinks = sinks
+        self.pool = ProcessPoolExecutor(max_workers=max(1, workers))
+        self.pending = OrderedDict()  # future -> key, oldest first
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, key, excel_path, sheets):
+        """Queues the sheets of one PDF for writing; blocks while the queue is full."""
+        while len(self.pending) >= self.max_pending:
+            self._collect(wait_futures(list(self.pending), return_when=FIRST_COMPLETED)[0])
+        self.pending[self.pool.submit(write_outputs, excel_path, sheets, self.sinks)] = key
+        self.poll()
+
+    def poll(self):
+        """Reports the writes that finished so far, without waiting."""
+        self._collect([fut for fut in self.pending if fut.done()])
+
+    def flush(self):
+        """Waits for every queued write and reports it."""
+        while self.pending:
+            self._collect(wait_futures(list(self.pending), return_when=FIRST_COMPLETED)[0])
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.pool.shutdown()
+
+    def _collect(self, done):
+        # Report in submission order
+        for fut in [f for f in self.pending if f in done]:
+            key = self.pending.pop(fut)
+            try:
+                changed, error = fut.result(), None
+            except Exception as e:
+                changed, error = False, e
+            self.on_done(key, changed, error)
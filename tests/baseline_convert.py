@@ -0,0 +1,157 @@
+"""
+The row logic of the original pdftoexcelcode.py, before SECTIONS, the
+RowClassifier and ROW_FILTERS, kept as the reference for test_sections.py.
+It reads a list of pages (each a list of tables) instead of a PDF, and
+returns the two DataFrames the original wrote instead of writing them.
+"""
+import os
+
+import pandas as pd
+
+UNWANTED_TEXT = ["Period Considered for the month",
+                 "Active Energy Received From",
+                 "Reactive Energy Supplied to",
+                 "GUJARAT ENERGY TRANSMISSION CORPORATION LIMITED"]
+
+def clean_for_check(cell):
+    if isinstance(cell, str):
+        return cell.strip().upper()
+    return ""
+
+def clean_empty_columns(df):
+    if df.empty:
+        return df
+    is_blank_col = (df.columns.astype(str).str.strip() == '') | (df.columns.isna())
+    is_all_na_col = df.replace('', pd.NA).isna().all()
+    return df.loc[:, ~(is_blank_col & is_all_na_col)]
+
+def align_to_header(row, full_header):
+    header_len = len(full_header)
+    data_values = [cell for cell in row]
+    if len(row) == header_len:
+        return row
+
+    header_nonempty_indices = [i for i, h in enumerate(full_header) if h and h.strip()]
+    if len(data_values) == len(header_nonempty_indices):
+        aligned = [""] * header_len
+        for di, idx in enumerate(header_nonempty_indices):
+            aligned[idx] = data_values[di]
+        return aligned
+
+    aligned_row = [""] * header_len
+    data_index = 0
+    for i in range(header_len):
+        if full_header[i] and full_header[i].strip() and data_index < len(data_values):
+            aligned_row[i] = data_values[data_index]
+            data_index += 1
+    if data_index < len(data_values) and len(data_values) > 0:
+        return None
+    return aligned_row
+
+def extract_sections(pdf_path, pages):
+    wind_rows, solar_rows = [], []
+    wind_header, solar_header = None, None
+    current_section = None
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+
+    def keep(norm_row):
+        row_text = " ".join([clean_for_check(c) for c in norm_row if c])
+        if "SEPC" in base_name.upper():
+            return "CLEAN MAX" in row_text or "CLEANMAX" in row_text
+        return True
+
+    for page_num, tables in enumerate(pages):
+        for table in tables:
+            if not table:
+                continue
+            for row in table:
+                if not row:
+                    continue
+                clean_row = [cell if cell else "" for cell in row]
+                if all(cell == "" for cell in clean_row):
+                    continue
+                check_row_text = " ".join([clean_for_check(c) for c in clean_row if c])
+
+                if "SHARE OF WIND FARM OWNER" in check_row_text:
+                    current_section = "wind"
+                    continue
+                elif "SHARE OF SOLAR GENERATOR" in check_row_text:
+                    current_section = "solar"
+                    continue
+
+                if "TOTAL" in check_row_text and current_section is not None:
+                    current_section = None
+                    continue
+
+                if (current_section == "wind" and not wind_header and "SR NO" in check_row_text
+                        and "WIND FARM OWNER" in check_row_text):
+                    wind_header = [cell if cell else "" for cell in row]
+                    continue
+                elif current_section == "solar" and not solar_header and "SOLAR ENTITY NAME" in check_row_text:
+                    solar_header = [cell if cell else "" for cell in row]
+                    continue
+
+                norm_row = None
+                first_cell_val = clean_for_check(clean_row[0])
+
+                if current_section == "wind" and wind_header:
+                    if page_num > 0 and first_cell_val.isdigit() and len(clean_row) < len(wind_header):
+                        try:
+                            data_list = [clean_row[i] for i in (0, 2, 3, 4, 5, 6, 7)]
+                            norm_row = [""] * len(wind_header)
+                            slots = [i for i, h in enumerate(wind_header) if h and h.strip()]
+                            if len(data_list) == len(slots):
+                                for idx, val in zip(slots, data_list):
+                                    norm_row[idx] = val
+                            else:
+                                norm_row = None
+                        except IndexError:
+                            norm_row = None
+                    elif first_cell_val.isdigit():
+                        norm_row = align_to_header(clean_row, wind_header)
+
+                    if norm_row and len(norm_row) == len(wind_header) and keep(norm_row):
+                        wind_rows.append(norm_row)
+
+                elif current_section == "solar" and solar_header:
+                    if not first_cell_val.isdigit():
+                        continue
+                    norm_row = align_to_header(clean_row, solar_header)
+                    if norm_row and len(norm_row) == len(solar_header) and keep(norm_row):
+                        solar_rows.append(norm_row)
+
+    # Rows that are just header remnants
+    if wind_header:
+        text = " ".join([clean_for_check(c) for c in wind_header if c])
+        wind_rows = [r for r in wind_rows if " ".join([clean_for_check(c) for c in r if c]) != text]
+    if solar_header:
+        text = " ".join([clean_for_check(c) for c in solar_header if c])
+        solar_rows = [r for r in solar_rows if " ".join([clean_for_check(c) for c in r if c]) != text]
+
+    return wind_header, wind_rows, solar_header, solar_rows
+
+def section_frame(header, rows, name_column, date_str):
+    df = pd.DataFrame(rows, columns=header) if header else pd.DataFrame()
+    df = clean_empty_columns(df)
+    if not df.empty:
+        name_col = [col for col in df.columns if name_column in str(col).upper()]
+        if name_col:
+            df = df[~df[name_col[0]].astype(str).str.contains('|'.join(UNWANTED_TEXT), case=False, na=False)]
+    df = df.replace(r'^\s*$', pd.NA, regex=True)
+    df = df.dropna(thresh=2).reset_index(drop=True)
+    if not df.empty:
+        df.insert(1, "Date", date_str)
+        df.rename(columns={"SSr No": "Sr No"}, inplace=True)
+        if "Sr No" in df.columns:
+            df["Sr No"] = range(1, len(df) + 1)
+    return df
+
+def convert(pdf_path, pages, date_str):
+    """{sheet: DataFrame} the original would write, or None when it found no rows."""
+    wind_header, wind_rows, solar_header, solar_rows = extract_sections(pdf_path, pages)
+    if not wind_rows and not solar_rows:
+        return None
+    return {
+        "Wind Energy": section_frame(wind_header, wind_rows, "WIND FARM OWNER", date_str),
+        "Solar Energy": section_frame(solar_header, solar_rows, "SOLAR ENTITY NAME", date_str),
+    }
@@ -0,0 +1,88 @@
+"""
+Shared test setup. The package reads its folders from the environment at
+import time, so every SLDC_* folder points into one temporary directory
+before sldc_pipeline is imported.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_DIR = tempfile.mkdtemp(prefix="sldc_tests_")
+
+os.environ["SLDC_PDF_DIR"] = os.path.join(WORK_DIR, "downloads")
+os.environ["SLDC_EXCEL_DIR"] = os.path.join(WORK_DIR, "excel_conversion")
+os.environ["SLDC_COMBINED_DIR"] = os.path.join(WORK_DIR, "combined")
+os.environ["SLDC_NOTIFY"] = "none"
+os.environ["SLDC_OCR"] = "0"
+sys.path.insert(0, ROOT)
+
+# ================= FAKE PDFS =================
+
+class FakePage:
+    def __init__(self, tables):
+        self.tables = tables
+        self.chars = [None] if tables else []
+
+    def extract_tables(self):
+        return self.tables
+
+class FakePdf:
+    """Stands in for a MappedPdf: open() yields pages whose tables are given rows."""
+
+    def __init__(self, pages):
+        self.pages = [FakePage(tables) for tables in pages]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def open(self):
+        return self
+
+WIND_HEADER = ["Sr No", "Name of Wind Farm Owner", "DISCOM", "Installed Capacity", "Active Energy", "Reactive Energy"]
+SOLAR_HEADER = ["Sr No", "Solar Entity Name", "DISCOM", "Installed Capacity", "Active Energy", "Reactive Energy"]
+
+def wind_table(owners, total=True):
+    """Rows of a wind section: start row, header, one row per owner and the TOTAL row."""
+    rows = [["SHARE OF WIND FARM OWNER", None, None, None, None, None], list(WIND_HEADER)]
+    for sr, owner in enumerate(owners, 1):
+        rows.append([str(sr), owner, "UGVCL", "2.1", f"{100 * sr}", "5"])
+    if total:
+        rows.append(["TOTAL", None, None, f"{2.1 * len(owners):.1f}",
+                     f"{sum(100 * sr for sr in range(1, len(owners) + 1))}", f"{5 * len(owners)}"])
+    return rows
+
+def solar_table(owners, total=True):
+    rows = [["SHARE OF SOLAR GENERATOR", None, None, None, None, None], list(SOLAR_HEADER)]
+    for sr, owner in enumerate(owners, 1):
+        rows.append([str(sr), owner, "MGVCL", "1.0", "50", "2"])
+    if total:
+        rows.append(["TOTAL", None, None, f"{1.0 * len(owners):.1f}", f"{50 * len(owners)}", f"{2 * len(owners)}"])
+    return rows
+
+@pytest.fixture
+def fake_pdf():
+    return FakePdf
+
+def convert_from_tables(monkeypatch, tables, pdf_dir, excel_dir, store=None):
+    """
+    Points excel_conversion() at `pdf_dir`/`excel_dir`, reading each PDF's
+    pages from `tables[filename]` (and keeping its hashes in `store` when given).
+    """
+    from sldc_pipeline import convert
+    from sldc_pipeline.pdf_access import MappedPdf
+
+    class TablesPdf(MappedPdf):
+        def open(self):
+            return FakePdf(tables[os.path.basename(self.path)])
+
+    monkeypatch.setattr(convert, "MappedPdf", TablesPdf)
+    monkeypatch.setattr(convert, "PDF_DIR", str(pdf_dir))
+    monkeypatch.setattr(convert, "EXCEL_DIR", str(excel_dir))
+    if store is not None:
+        monkeypatch.setattr(convert, "get_store", lambda: store)
@@ -0,0 +1,32 @@
+import os
+import runpy
+
+import pytest
+
+from conftest import ROOT
+from sldc_pipeline import cli
+
+SCRIPTS = {
+    "pdftoexcelcode.py": ["convert"],
+    "excelmerging.py": ["merge"],
+    "Data Scraping from Website.py": ["scrape"],
+    "Everything Combined.py": ["run"],
+}
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cli, "main", calls.append)
+    return calls
+
+@pytest.mark.parametrize("script", sorted(SCRIPTS))
+def test_spawned_worker_import_does_not_run_the_stage(script, calls):
+    # multiprocessing's spawn re-imports the parent's script as __mp_main__
+    runpy.run_path(os.path.join(ROOT, script), run_name="__mp_main__")
+    assert calls == []
+
+@pytest.mark.parametrize("script", sorted(SCRIPTS))
+def test_script_runs_its_stage(script, calls, monkeypatch):
+    monkeypatch.setattr("sys.argv", [script])
+    runpy.run_path(os.path.join(ROOT, script), run_name="__main__")
+    assert calls == [SCRIPTS[script]]
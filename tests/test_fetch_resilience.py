@@ -0,0 +1,155 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from sldc_pipeline import fetch_resilience
+from sldc_pipeline.fetch_resilience import CircuitBreaker, CircuitOpen, LatencyTracker, RetryQueue, resilient_call
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(fetch_resilience, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+# ================= CIRCUIT BREAKER =================
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    breaker.failure()
+    breaker.failure()
+    # A success in between starts the count again
+    breaker.success()
+    breaker.failure()
+    breaker.failure()
+    assert breaker.allow() and not breaker.is_open
+
+    breaker.failure()
+
+    assert breaker.is_open
+    assert not breaker.allow()
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.failure()
+
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    # Only the one probe while it runs
+    assert not breaker.allow()
+
+    breaker.success()
+    assert not breaker.is_open
+    assert breaker.allow() and breaker.allow()
+
+def test_failed_probe_reopens_for_a_full_cooldown(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    breaker.failure()
+    clock.now += 60
+    assert breaker.allow()
+
+    breaker.failure()
+
+    assert breaker.is_open
+    clock.now += 59
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+def test_resilient_call_does_not_call_through_an_open_circuit(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    calls = []
+
+    def fetch(timeout):
+        calls.append(timeout)
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        resilient_call(fetch, breaker, LatencyTracker(initial=30), TimeoutError, attempts=1)
+    with pytest.raises(CircuitOpen):
+        resilient_call(fetch, breaker, LatencyTracker(initial=30), TimeoutError, attempts=1)
+    assert calls == [30]
+
+# ================= ADAPTIVE TIMEOUT =================
+
+def test_timeout_stays_initial_until_enough_samples():
+    tracker = LatencyTracker(initial=30)
+    for _ in range(4):
+        tracker.record(2.0)
+
+    assert tracker.timeout() == 30
+
+def test_timeout_follows_the_high_percentile():
+    tracker = LatencyTracker(initial=30, minimum=1, maximum=60, percentile=95, factor=3)
+    for seconds in range(1, 21):
+        tracker.record(seconds / 10)
+
+    # 20 samples: index 19 is the 95th percentile, 2.0 s x 3
+    assert tracker.timeout() == pytest.approx(6.0)
+
+def test_timeout_is_clamped():
+    fast, slow = LatencyTracker(minimum=5, maximum=60), LatencyTracker(minimum=5, maximum=60)
+    for _ in range(10):
+        fast.record(0.1)
+        slow.record(45.0)
+
+    assert fast.timeout() == 5
+    assert slow.timeout() == 60
+
+def test_only_the_latest_window_counts():
+    tracker = LatencyTracker(minimum=0, maximum=100, factor=1, window=5)
+    for seconds in [50, 50, 50, 50, 50, 1, 1, 1, 1, 1]:
+        tracker.record(seconds)
+
+    assert tracker.samples == [1, 1, 1, 1, 1]
+    assert tracker.timeout() == 1
+
+# ================= PERSISTENT RETRY QUEUE =================
+
+def test_failures_are_drained_by_the_next_run(tmp_path):
+    path = str(tmp_path / "retry_queue.json")
+    RetryQueue(path).save([("SITEA", 2025, 1), ("SITEB", 2025, 2)])
+
+    queue = RetryQueue(path)
+    assert queue.drain() == [("SITEA", 2025, 1), ("SITEB", 2025, 2)]
+
+    # SITEA failed again, SITEB went through
+    queue.save([("SITEA", 2025, 1)])
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [{"task": ["SITEA", 2025, 1], "runs": 2}]
+    assert not (tmp_path / "retry_queue.json.tmp").exists()
+
+def test_queue_file_goes_away_when_nothing_failed(tmp_path):
+    path = str(tmp_path / "retry_queue.json")
+    RetryQueue(path).save([("SITEA", 2025, 1)])
+
+    queue = RetryQueue(path)
+    queue.drain()
+    queue.save([])
+
+    assert not (tmp_path / "retry_queue.json").exists()
+    assert RetryQueue(path).drain() == []
+
+def test_task_is_dropped_after_max_runs(tmp_path):
+    path = str(tmp_path / "retry_queue.json")
+    for _ in range(3):
+        queue = RetryQueue(path, max_runs=3)
+        queue.drain()
+        queue.save([("SITEA", 2025, 1)])
+
+    assert RetryQueue(path, max_runs=3).drain() == []
+
+def test_unreadable_queue_is_skipped(tmp_path):
+    path = tmp_path / "retry_queue.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert RetryQueue(str(path)).drain() == []
@@ -0,0 +1,117 @@
+import pytest
+
+from sldc_pipeline import governor
+from sldc_pipeline.governor import MB, Governor
+
+class Machine:
+    """Stands in for the clock, free memory and CPU load the governor reads."""
+
+    def __init__(self, free_mb=10_000, load=0.1):
+        self.now = 100.0
+        self.free = free_mb * MB
+        self.load = load
+
+    def monotonic(self):
+        return self.now
+
+    def tick(self, seconds=1.0):
+        self.now += seconds
+
+@pytest.fixture
+def machine(monkeypatch):
+    machine = Machine()
+    monkeypatch.setattr(governor, "free_memory", lambda: machine.free)
+    monkeypatch.setattr(governor, "cpu_load", lambda: machine.load)
+    monkeypatch.setattr(governor.time, "monotonic", machine.monotonic)
+    return machine
+
+def test_job_over_the_budget_waits(machine):
+    gov = Governor(4, budget_mb=100, reserve_mb=10)
+
+    first = gov.admit("merge", 60 * MB)
+    assert first is not None
+    assert gov.admit("merge", 50 * MB) is None
+    gov.release(first)
+    assert gov.admit("merge", 50 * MB) is not None
+
+def test_job_bigger_than_the_budget_runs_alone(machine):
+    gov = Governor(4, budget_mb=100, reserve_mb=10)
+
+    big = gov.admit("convert", 500 * MB)
+    assert big is not None
+    assert gov.admit("convert", 1 * MB) is None
+    gov.release(big)
+    assert gov.admit("convert", 1 * MB) is not None
+
+def test_low_memory_drops_the_limit(machine):
+    gov = Governor(4, budget_mb=1000, reserve_mb=100)
+    for _ in range(3):
+        assert gov.admit("convert", 10 * MB) is not None
+
+    machine.free = 50 * MB
+    machine.tick()
+
+    assert gov.admit("convert", 10 * MB) is None
+    assert gov.limit == 2
+
+def test_high_cpu_holds_the_limit(machine):
+    gov = Governor(4, budget_mb=1000, reserve_mb=100)
+    tickets = [gov.admit("convert", 10 * MB) for _ in range(2)]
+    machine.load = 0.99
+    machine.tick()
+
+    assert gov.admit("convert", 10 * MB) is None
+    assert gov.limit == 2
+    # A slot freed inside the interval is taken again, but the limit doesn't grow
+    gov.release(tickets[0])
+    assert gov.admit("convert", 10 * MB) is not None
+    machine.tick()
+    assert gov.admit("convert", 10 * MB) is None
+    assert gov.limit == 2
+
+def test_limit_grows_back_one_worker_per_interval(machine):
+    gov = Governor(4, budget_mb=1000, reserve_mb=100)
+    gov.admit("convert", 10 * MB)
+    gov.admit("convert", 10 * MB)
+    machine.free = 50 * MB
+    machine.tick()
+    gov.admit("convert", 10 * MB)
+    assert gov.limit == 1
+
+    machine.free = 10_000 * MB
+    machine.tick()
+    gov.admit("convert", 10 * MB)
+    assert gov.limit == 2
+    # No new reading inside the interval
+    machine.tick(0.5)
+    gov.admit("convert", 10 * MB)
+    assert gov.limit == 2
+    machine.tick(0.5)
+    gov.admit("convert", 10 * MB)
+    assert gov.limit == 3
+
+def test_observed_peak_scales_estimates_up_at_once_and_down_slowly(machine):
+    gov = Governor(4, budget_mb=1000, reserve_mb=10)
+
+    gov.release(gov.admit("merge", 10 * MB), observed=30 * MB)
+    assert gov.scale["merge"] == 3.0
+    assert gov.admit("merge", 10 * MB).cost == 30 * MB
+
+    gov.release(gov.admit("merge", 10 * MB), observed=1 * MB)
+    assert gov.scale["merge"] == pytest.approx(2.4)
+    gov.release(gov.admit("merge", 10 * MB), observed=1 * MB)
+    assert gov.scale["merge"] == pytest.approx(1.92)
+    assert "convert" not in gov.scale
+
+def test_released_jobs_give_back_the_free_memory_they_reserved(machine):
+    machine.free = 100 * MB
+    gov = Governor(4, budget_mb=1000, reserve_mb=10)
+
+    first = gov.admit("convert", 40 * MB)
+    second = gov.admit("convert", 40 * MB)
+    assert gov.admit("convert", 40 * MB) is None
+    gov.release(second)
+
+    # Same reading: 100 - 40 still reserved - 40 keeps the 10 MB reserve
+    assert gov.admit("convert", 40 * MB) is not None
+    gov.release(first)
@@ -0,0 +1,80 @@
+import multiprocessing
+import time
+
+from sldc_pipeline import job_queue
+from sldc_pipeline.job_queue import Job, JobQueue, worker_name
+
+def convert_job(n):
+    return Job(f"convert:SITEA_2025_{n:02d}.pdf", "convert", "SITEA", 2025, n, {"pdf": f"SITEA_2025_{n:02d}.pdf"})
+
+def lease_and_die(path, lease_seconds, leased):
+    """Worker process that takes a job and stops without completing it or sending heartbeats."""
+    job_queue.QUEUE_LEASE_SECONDS = lease_seconds
+    job = JobQueue(path).lease(worker_name())
+    leased.put((job.id, worker_name()))
+
+def lease_all(path, leased):
+    queue = JobQueue(path)
+    while True:
+        job = queue.lease(worker_name())
+        if job is None:
+            return
+        leased.put(job.id)
+        queue.complete(job.id, worker_name(), {"has_data": True})
+
+def test_expired_lease_of_a_dead_worker_is_reclaimed(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    queue = JobQueue(path)
+    queue.submit([convert_job(1)])
+    ctx = multiprocessing.get_context("spawn")
+    leased = ctx.Queue()
+
+    dead = ctx.Process(target=lease_and_die, args=(path, 1.0, leased))
+    dead.start()
+    job_id, dead_worker = leased.get(timeout=60)
+    dead.join(60)
+
+    # Still leased to the dead worker until the lease runs out
+    assert queue.lease(worker_name()) is None
+    time.sleep(1.2)
+    job = queue.lease(worker_name())
+
+    assert job.id == job_id
+    assert not queue.heartbeat(job_id, dead_worker)
+    assert not queue.complete(job_id, dead_worker, {"has_data": True})
+    assert queue.complete(job_id, worker_name(), {"has_data": True})
+    counts, leased_rows, failed = queue.status()
+    assert counts == {("convert", "done"): 1}
+    assert failed == []
+
+def test_lease_expiring_too_often_fails_the_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "QUEUE_LEASE_SECONDS", -1)
+    monkeypatch.setattr(job_queue, "QUEUE_MAX_ATTEMPTS", 2)
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    queue.submit([convert_job(1)])
+
+    assert queue.lease("a") is not None
+    assert queue.lease("b") is not None
+    # Second lease expired too: no attempts left
+    assert queue.lease("c") is None
+    _, _, failed = queue.status()
+    assert [row["id"] for row in failed] == [convert_job(1).id]
+
+def test_two_processes_never_lease_the_same_job(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    jobs = [convert_job(n) for n in range(1, 13)]
+    merge = Job("merge:SITEA", "merge", "SITEA", None, None, {})
+    JobQueue(path).submit(jobs + [merge])
+    ctx = multiprocessing.get_context("spawn")
+    leased = ctx.Queue()
+
+    workers = [ctx.Process(target=lease_all, args=(path, leased)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    ids = [leased.get(timeout=60) for _ in range(len(jobs) + 1)]
+    for worker in workers:
+        worker.join(60)
+
+    assert sorted(ids) == sorted(job.id for job in jobs + [merge])
+    counts, _, _ = JobQueue(path).status()
+    assert counts == {("convert", "done"): len(jobs), ("merge", "done"): 1}
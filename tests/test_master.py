@@ -0,0 +1,108 @@
+import hashlib
+import os
+from functools import partial
+
+import pandas as pd
+
+from sldc_pipeline import master, merge
+from sldc_pipeline.config import MASTER_NAME
+from sldc_pipeline.master import build_master, load_slice, master_path, slice_path
+from sldc_pipeline.merge import combined_path_for, merge_site
+from sldc_pipeline.partitions import MONTH_ABBRS, plan_partitions
+from sldc_pipeline.stable_output import write_excel
+
+def section_sheet(name_column, owners, month, discom):
+    return pd.DataFrame({
+        "Sr No": [str(sr) for sr in range(1, len(owners) + 1)],
+        "Date": f"01-{month:02d}-2025",
+        name_column: [f" {owner} " for owner in owners],
+        "DISCOM": discom,
+        "Installed Capacity": "2.1",
+        "Active Energy": [str(100 + sr) for sr in range(len(owners))],
+        "Reactive Energy": "5",
+    })
+
+def monthly_workbook(folder, site, owners, month=1, solar=()):
+    """<site>_2025_<MON>.xlsx as convert_pdf() writes it, one wind row per owner (and solar entity)."""
+    name = f"{site}_2025_{MONTH_ABBRS[month - 1]}.xlsx"
+    sheets = {"Wind Energy": section_sheet("Name of Wind Farm Owner", owners, month, "UGVCL")}
+    if solar:
+        sheets["Solar Energy"] = section_sheet("Solar Entity Name", solar, month, "MGVCL")
+    write_excel(str(folder / name), sheets)
+    return [(name, (2025, month))]
+
+def md5(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+def test_new_site_leaves_existing_slices_byte_identical(tmp_path):
+    excel, combined = tmp_path / "excel", tmp_path / "combined"
+    excel.mkdir()
+    combined.mkdir()
+    sites = {
+        "SITEA": monthly_workbook(excel, "SITEA", ["OWNER A LTD", "OWNER B LTD"]),
+        "SITEB": monthly_workbook(excel, "SITEB", ["OWNER C LTD"]),
+    }
+    for site, files in sites.items():
+        merge_site(site, files, str(excel), str(combined))
+    build_master(sites, str(combined))
+    before = {site: md5(slice_path(site, str(combined))) for site in sites}
+
+    # A new site with a new owner grows the shared dictionary
+    sites["SITEC"] = monthly_workbook(excel, "SITEC", ["Brand New Owner"])
+    merge_site("SITEC", sites["SITEC"], str(excel), str(combined))
+    build_master(sites, str(combined))
+
+    # merge --force of the unchanged sites
+    for site in ("SITEA", "SITEB"):
+        merge_site(site, sites[site], str(excel), str(combined))
+        assert md5(slice_path(site, str(combined))) == before[site]
+
+    owners = load_slice("SITEA", str(combined))["Owner"]
+    assert list(owners.cat.categories) == ["OWNER A LTD", "OWNER B LTD"]
+
+def split_every_two_rows(monkeypatch):
+    small = partial(plan_partitions, max_rows=2)
+    monkeypatch.setattr(merge, "plan_partitions", small)
+    monkeypatch.setattr(master, "plan_partitions", small)
+
+def test_master_sheet_is_partitioned_like_the_combined_files(tmp_path, monkeypatch):
+    split_every_two_rows(monkeypatch)
+    excel, combined = tmp_path / "excel", tmp_path / "combined"
+    excel.mkdir()
+    combined.mkdir()
+    files = [item for month in (1, 2, 3) for item in monthly_workbook(excel, "SITEA", ["OWNER A", "OWNER B"], month)]
+    merge_site("SITEA", files, str(excel), str(combined))
+
+    build_master({"SITEA": files}, str(combined))
+
+    with pd.ExcelFile(master_path(str(combined))) as book:
+        assert "Master" not in book.sheet_names
+        index = pd.read_excel(book, sheet_name="Index")
+    assert list(index["File"]) == [f"{MASTER_NAME}_part{n}.xlsx" for n in (1, 2, 3)]
+    assert list(index["From"]) == ["2025-01", "2025-02", "2025-03"]
+    for n, file in enumerate(index["File"], 1):
+        part = pd.read_excel(combined / file, sheet_name="Master")
+        assert len(part) == 2
+        assert set(part["Month"]) == {f"2025-{n:02d}"}
+
+    # A bigger budget needs fewer files; the old third one goes away
+    monkeypatch.setattr(master, "plan_partitions", partial(plan_partitions, max_rows=4))
+    build_master({"SITEA": files}, str(combined))
+    assert not os.path.exists(master_path(str(combined), "part3"))
+
+def test_slice_of_a_split_site_is_read_from_its_partitions(tmp_path, monkeypatch):
+    split_every_two_rows(monkeypatch)
+    excel, combined = tmp_path / "excel", tmp_path / "combined"
+    excel.mkdir()
+    combined.mkdir()
+    files = [item for month in (1, 2) for item in monthly_workbook(excel, "SITEA", ["OWNER A", "OWNER B"], month)]
+    merge_site("SITEA", files, str(excel), str(combined))
+    assert os.path.exists(combined_path_for("SITEA", str(combined), "part2"))
+
+    # Merged before slices existed
+    os.remove(slice_path("SITEA", str(combined)))
+    tidy = load_slice("SITEA", str(combined))
+
+    assert len(tidy) == 4
+    assert sorted(tidy["Month"].unique()) == ["2025-01", "2025-02"]
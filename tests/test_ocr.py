@@ -0,0 +1,55 @@
+import json
+import os
+
+from sldc_pipeline.ocr import cache_path, ocr_page, page_key, rows_from_words
+
+def image_to_data(words):
+    """pytesseract.image_to_data() dict for (line, left, top, width, height, text, conf) words."""
+    data = {field: [] for field in ("block_num", "par_num", "line_num", "left", "top", "width", "height",
+                                    "text", "conf")}
+    for line, left, top, width, height, text, conf in words:
+        for field, value in zip(data, (1, 1, line, left, top, width, height, text, conf)):
+            data[field].append(value)
+    return data
+
+def test_words_are_grouped_into_lines_and_cells():
+    data = image_to_data([
+        # Second line listed first: rows follow the page from top to bottom
+        (2, 10, 60, 10, 20, "1", "96"),
+        (2, 60, 60, 30, 20, "ABC", "95"),
+        (2, 95, 61, 30, 20, "LTD", "91"),
+        (2, 200, 60, 50, 20, "UGVCL", "90"),
+        (1, 10, 20, 30, 20, "Sr", "93"),
+        (1, 45, 20, 30, 20, "No", "92"),
+        (1, 120, 20, 40, 20, "Name", "94"),
+        (1, 0, 20, 5, 20, " ", "-1"),
+    ])
+
+    assert rows_from_words(data) == [["Sr No", "Name"], ["1", "ABC LTD", "UGVCL"]]
+
+def test_gap_is_measured_against_the_taller_word():
+    data = image_to_data([
+        (1, 0, 0, 20, 10, "2.1", "90"),
+        # 30 px gap: more than 1.2 x 10 px, less than 1.2 x 30 px
+        (1, 50, 0, 20, 30, "100", "90"),
+        (1, 120, 0, 20, 10, "5", "90"),
+    ])
+
+    assert rows_from_words(data) == [["2.1 100", "5"]]
+
+def test_low_confidence_words_are_dropped():
+    data = image_to_data([(1, 0, 0, 20, 10, "ABC", "80"), (1, 22, 0, 20, 10, "~~", "12")])
+
+    assert rows_from_words(data, min_conf=50) == [["ABC"]]
+    assert rows_from_words(data) == [["ABC ~~"]]
+
+def test_cached_page_is_not_rendered(tmp_path):
+    cache = str(tmp_path / "cache")
+    path = cache_path(page_key("ab" * 32, 3, 300), cache)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([["1", "ABC LTD"]], f)
+
+    # No such PDF: a render would fail
+    assert ocr_page(str(tmp_path / "missing.pdf"), 3, "ab" * 32, dpi=300, cache_dir=cache) == [["1", "ABC LTD"]]
+    assert page_key("ab" * 32, 3, 300) != page_key("ab" * 32, 3, 200) != page_key("ab" * 32, 4, 300)
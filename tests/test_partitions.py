@@ -0,0 +1,70 @@
+import os
+from functools import partial
+
+from sldc_pipeline import merge
+from sldc_pipeline.master import slice_path
+from sldc_pipeline.merge import combined_path_for, merge_site
+from sldc_pipeline.partitions import plan_partitions, remove_stale_partitions
+from test_master import monthly_workbook
+
+MONTHS = [(2024, 11), (2024, 12), (2025, 1), (2025, 2), (2025, 3)]
+
+def test_rows_mode_splits_on_whole_months():
+    # A month that would cross the budget starts the next part
+    assert plan_partitions(MONTHS, [40, 40, 40, 40, 40], "rows", 100) == [
+        ("part1", [0, 1]), ("part2", [2, 3]), ("part3", [4]),
+    ]
+    assert plan_partitions(MONTHS, [20, 20, 20, 20, 20], "rows", 100) == [(None, [0, 1, 2, 3, 4])]
+
+def test_rows_mode_fills_up_to_the_budget_exactly():
+    assert plan_partitions(MONTHS[:4], [50, 50, 50, 50], "rows", 100) == [("part1", [0, 1]), ("part2", [2, 3])]
+
+def test_oversized_month_gets_a_part_of_its_own():
+    assert plan_partitions(MONTHS[:3], [10, 500, 10], "rows", 100) == [
+        ("part1", [0]), ("part2", [1]), ("part3", [2]),
+    ]
+
+def test_year_mode_splits_by_year_then_by_budget():
+    assert plan_partitions(MONTHS, [10] * 5, "year", 100) == [("2024", [0, 1]), ("2025", [2, 3, 4])]
+    assert plan_partitions(MONTHS, [10, 10, 60, 60, 10], "year", 100) == [
+        ("2024", [0, 1]), ("2025_part1", [2]), ("2025_part2", [3, 4]),
+    ]
+
+def test_none_mode_never_splits():
+    assert plan_partitions(MONTHS, [10 ** 6] * 5, "none", 100) == [(None, [0, 1, 2, 3, 4])]
+
+def test_no_months():
+    assert plan_partitions([], [], "rows", 100) == [(None, [])]
+    assert plan_partitions([], [], "year", 100) == [(None, [])]
+
+def test_remove_stale_partitions_keeps_only_current_files(tmp_path):
+    names = ["SITEA_combined.xlsx", "SITEA_combined_part1.xlsx", "SITEA_combined_part2.xlsx",
+             "SITEA_combined_2024.xlsx", "SITEA_combined_2025_part1.xlsx",
+             "SITEAB_combined_part1.xlsx", "SITEA_combined_notes.xlsx"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"")
+    keep = {str(tmp_path / "SITEA_combined_part1.xlsx")}
+
+    remove_stale_partitions("SITEA_combined", str(tmp_path), keep)
+
+    assert sorted(os.listdir(tmp_path)) == ["SITEAB_combined_part1.xlsx", "SITEA_combined.xlsx",
+                                            "SITEA_combined_notes.xlsx", "SITEA_combined_part1.xlsx"]
+
+def test_site_back_under_budget_drops_its_part_files(tmp_path, monkeypatch):
+    excel, combined = tmp_path / "excel", tmp_path / "combined"
+    excel.mkdir()
+    combined.mkdir()
+    files = [item for month in (1, 2, 3)
+             for item in monthly_workbook(excel, "SITEA", ["OWNER A", "OWNER B"], month, solar=[f"SOLAR {month}"])]
+
+    monkeypatch.setattr(merge, "plan_partitions", partial(plan_partitions, policy="rows", max_rows=2))
+    merge_site("SITEA", files, str(excel), str(combined))
+    assert os.path.exists(combined_path_for("SITEA", str(combined), "part3"))
+    split_slice = open(slice_path("SITEA", str(combined)), "rb").read()
+
+    monkeypatch.setattr(merge, "plan_partitions", partial(plan_partitions, policy="rows", max_rows=100))
+    merge_site("SITEA", files, str(excel), str(combined))
+
+    assert sorted(name for name in os.listdir(combined) if name.endswith(".xlsx")) == ["SITEA_combined.xlsx"]
+    # The slice built partition by partition is the one the whole history gives
+    assert open(slice_path("SITEA", str(combined)), "rb").read() == split_slice
@@ -0,0 +1,158 @@
+import os
+
+from conftest import convert_from_tables, wind_table
+from sldc_pipeline import convert
+from sldc_pipeline.pdf_access import file_digest
+from sldc_pipeline.pdf_store import PdfStore
+
+NAME = "SITEA_2025_JAN.pdf"
+
+def download(folder, content, name="download.part"):
+    """A freshly downloaded file, as scrape.py hands it to add()."""
+    path = folder / name
+    path.write_bytes(content)
+    return str(path)
+
+# ================= BLOBS & REVISIONS =================
+
+def test_identical_republish_adds_no_revision(tmp_path):
+    store = PdfStore(str(tmp_path / "store"))
+
+    digest, changed = store.add(NAME, download(tmp_path, b"%PDF-1.4 jan"), href="link-1")
+    again, changed_again = store.add(NAME, download(tmp_path, b"%PDF-1.4 jan"), href="link-2")
+
+    assert changed and not changed_again
+    assert again == digest
+    assert [rev["hrefs"] for rev in store.revisions(NAME)] == [["link-1", "link-2"]]
+    # The second download is dropped, the content is kept once
+    assert not (tmp_path / "download.part").exists()
+    assert os.listdir(os.path.dirname(store.blob_path(digest))) == [f"{digest}.pdf"]
+    assert store.find_href(NAME, "link-2")["sha256"] == digest
+
+def test_changed_content_adds_a_revision(tmp_path):
+    store = PdfStore(str(tmp_path / "store"))
+    first, _ = store.add(NAME, download(tmp_path, b"%PDF-1.4 jan"))
+
+    second, changed = store.add(NAME, download(tmp_path, b"%PDF-1.4 jan, revised"))
+
+    assert changed
+    assert [rev["sha256"] for rev in store.revisions(NAME)] == [first, second]
+    assert store.current(NAME)["sha256"] == second
+    assert os.path.exists(store.blob_path(first))
+
+def test_checkout_writes_the_working_copy_only_when_it_differs(tmp_path):
+    store = PdfStore(str(tmp_path / "store"))
+    digest, _ = store.add(NAME, download(tmp_path, b"%PDF-1.4 jan"))
+    target = tmp_path / NAME
+
+    assert store.checkout(digest, str(target))
+    assert not store.checkout(digest, str(target))
+    assert target.read_bytes() == b"%PDF-1.4 jan"
+
+    # Overwritten by hand: restored, and the blob is untouched
+    target.write_bytes(b"edited")
+    assert store.checkout(digest, str(target))
+    assert target.read_bytes() == b"%PDF-1.4 jan"
+    assert file_digest(store.blob_path(digest)) == digest
+    assert not (tmp_path / (NAME + ".part")).exists()
+
+def test_index_survives_a_reload(tmp_path):
+    root = str(tmp_path / "store")
+    store = PdfStore(root)
+    digest, _ = store.add(NAME, download(tmp_path, b"%PDF-1.4 jan"), href="link-1")
+    store.checkout(digest, str(tmp_path / NAME))
+    store.mark_converted(str(tmp_path / NAME), True)
+    store.mark_merged("SITEA", [["SITEA_2025_JAN.xlsx", digest]])
+
+    reloaded = PdfStore(root)
+
+    assert reloaded.index == store.index
+    assert reloaded.current(NAME)["hrefs"] == ["link-1"]
+    assert not os.path.exists(reloaded.index_path + ".tmp")
+
+def test_unreadable_index_starts_empty(tmp_path):
+    root = tmp_path / "store"
+    root.mkdir()
+    (root / "index.json").write_text("{broken", encoding="utf-8")
+
+    store = PdfStore(str(root))
+
+    assert store.index == {"revisions": {}, "files": {}, "converted": {}, "merged": {}}
+
+# ================= DERIVED OUTPUTS =================
+
+def test_conversion_is_redone_only_for_new_content_or_a_lost_workbook(tmp_path):
+    store = PdfStore(str(tmp_path / "store"))
+    pdf = tmp_path / NAME
+    pdf.write_bytes(b"%PDF-1.4 jan")
+    workbook = tmp_path / "SITEA_2025_JAN.xlsx"
+
+    assert store.needs_conversion(str(pdf), str(tmp_path))
+    workbook.write_bytes(b"xlsx")
+    store.mark_converted(str(pdf), True)
+    assert not store.needs_conversion(str(pdf), str(tmp_path))
+
+    workbook.unlink()
+    assert store.needs_conversion(str(pdf), str(tmp_path))
+
+    # A PDF without data has no workbook to lose
+    store.mark_converted(str(pdf), False)
+    assert not store.needs_conversion(str(pdf), str(tmp_path))
+
+    pdf.write_bytes(b"%PDF-1.4 jan, revised")
+    assert store.needs_conversion(str(pdf), str(tmp_path))
+
+def test_merge_is_redone_when_a_month_changes_or_the_workbook_is_gone(tmp_path):
+    store = PdfStore(str(tmp_path / "store"))
+    for name, content in ((NAME, b"%PDF-1.4 jan"), ("SITEA_2025_FEB.pdf", b"%PDF-1.4 feb")):
+        (tmp_path / name).write_bytes(content)
+        store.mark_converted(str(tmp_path / name), True)
+    # A workbook put there by hand, not converted through the store
+    (tmp_path / "SITEA_2025_MAR.xlsx").write_bytes(b"xlsx")
+    files = [("SITEA_2025_MAR.xlsx", (2025, 3)), ("SITEA_2025_JAN.xlsx", (2025, 1)),
+             ("SITEA_2025_FEB.xlsx", (2025, 2))]
+    combined = tmp_path / "SITEA_combined.xlsx"
+
+    signature = store.merge_signature(files, str(tmp_path))
+
+    assert [entry[0] for entry in signature] == ["SITEA_2025_JAN.xlsx", "SITEA_2025_FEB.xlsx", "SITEA_2025_MAR.xlsx"]
+    assert signature[0][1] == file_digest(str(tmp_path / NAME))
+    assert store.needs_merge("SITEA", signature, str(combined))
+    combined.write_bytes(b"xlsx")
+    store.mark_merged("SITEA", signature)
+    assert not store.needs_merge("SITEA", signature, str(combined))
+
+    combined.unlink()
+    assert store.needs_merge("SITEA", signature, str(combined))
+    combined.write_bytes(b"xlsx")
+
+    (tmp_path / NAME).write_bytes(b"%PDF-1.4 jan, revised")
+    store.mark_converted(str(tmp_path / NAME), True)
+    assert store.needs_merge("SITEA", store.merge_signature(files, str(tmp_path)), str(combined))
+
+def test_conversion_skips_unchanged_pdfs_unless_forced(tmp_path, monkeypatch):
+    pdfs, excel = tmp_path / "pdf", tmp_path / "excel"
+    pdfs.mkdir()
+    (pdfs / NAME).write_bytes(b"%PDF-1.4 jan")
+    convert_from_tables(monkeypatch, {NAME: [[wind_table(["OWNER A LTD"])]]}, pdfs, excel,
+                        PdfStore(str(tmp_path / "store")))
+    converted = []
+    real_convert_pdf = convert.convert_pdf
+
+    def counting_convert_pdf(pdf_path, *args, **kwargs):
+        converted.append(os.path.basename(pdf_path))
+        return real_convert_pdf(pdf_path, *args, **kwargs)
+
+    monkeypatch.setattr(convert, "convert_pdf", counting_convert_pdf)
+
+    convert.excel_conversion()
+    convert.excel_conversion()
+    assert converted == [NAME]
+
+    convert.excel_conversion(force=True)
+    assert converted == [NAME, NAME]
+
+    (excel / "SITEA_2025_JAN.xlsx").unlink()
+    convert.excel_conversion()
+    assert converted == [NAME, NAME, NAME]
+    assert (excel / "SITEA_2025_JAN.xlsx").exists()
@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sldc_pipeline import pipeline
+from sldc_pipeline.config import PDF_DIR, PIPELINE_QUEUE_SIZE
+
+def fake_scraper(monkeypatch, paths, before=None):
+    """Replaces the scrape stage by one that reports `paths` as downloaded, after `before()`."""
+    def pdf_extraction(on_pdf=None, on_site_done=None, **kwargs):
+        if before:
+            before()
+        for path in paths:
+            on_pdf(path)
+        for site in sorted({pipeline.site_of(path) for path in paths}):
+            on_site_done(site)
+
+    module = types.ModuleType("sldc_pipeline.scrape")
+    module.pdf_extraction = pdf_extraction
+    monkeypatch.setitem(sys.modules, "sldc_pipeline.scrape", module)
+
+def run_with_timeout(func, seconds=60):
+    """Runs `func` in a thread; fails the test if it is still running after `seconds`."""
+    outcome = {}
+
+    def target():
+        try:
+            func()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "pipeline hung"
+    return outcome.get("error")
+
+@pytest.fixture(autouse=True)
+def threads_for_processes(monkeypatch):
+    # Same pool interface, but the patched convert_pdf is seen by the workers
+    monkeypatch.setattr(pipeline, "ProcessPoolExecutor", ThreadPoolExecutor)
+    os.makedirs(PDF_DIR, exist_ok=True)
+
+def test_unreadable_pdfs_fail_without_hanging(monkeypatch, capsys):
+    # More PDFs than the queue holds, none of them on disk
+    paths = [os.path.join(PDF_DIR, f"GONE{i}_2025_JAN.pdf") for i in range(PIPELINE_QUEUE_SIZE * 3)]
+    fake_scraper(monkeypatch, paths)
+
+    assert run_with_timeout(pipeline.streaming_pipeline) is None
+    assert f"{len(paths)} failed" in capsys.readouterr().out
+
+def test_consumer_crash_stops_the_run_without_hanging(monkeypatch):
+    def broken_governor(*args, **kwargs):
+        raise MemoryError("no governor")
+
+    monkeypatch.setattr(pipeline, "Governor", broken_governor)
+    fake_scraper(monkeypatch, [os.path.join(PDF_DIR, f"CRASH{i}_2025_JAN.pdf") for i in range(PIPELINE_QUEUE_SIZE * 3)])
+
+    error = run_with_timeout(pipeline.streaming_pipeline)
+    assert isinstance(error, RuntimeError)
+    assert isinstance(error.__cause__, MemoryError)
+
+def test_pdf_saved_again_during_its_conversion_is_not_converted_twice_at_once(monkeypatch):
+    paths = []
+    for i in range(3):
+        path = os.path.join(PDF_DIR, f"TWICE{i}_2025_JAN.pdf")
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.4 test " + bytes([i]))
+        paths.append(path)
+
+    lock = threading.Lock()
+    running, overlaps, calls = {}, [], []
+    started = threading.Event()
+
+    def convert_pdf(path, output_folder):
+        with lock:
+            calls.append(path)
+            if running.get(path):
+                overlaps.append(path)
+            running[path] = running.get(path, 0) + 1
+        started.set()
+        time.sleep(0.3)
+        with lock:
+            running[path] -= 1
+        return False
+
+    monkeypatch.setattr(pipeline, "convert_pdf", convert_pdf)
+    # The scraper hands the same PDFs over while the copies on disk are converting
+    fake_scraper(monkeypatch, paths, before=lambda: started.wait(10))
+
+    assert run_with_timeout(pipeline.streaming_pipeline) is None
+    assert overlaps == []
+    assert sorted(calls) == sorted(paths)
@@ -0,0 +1,51 @@
+from conftest import FakePdf, WIND_HEADER, wind_table
+from sldc_pipeline.convert import extract_sections
+from sldc_pipeline.row_filters import RowFilter, name_index, row_filter_for
+
+FILTERS = {
+    "*": {"drop": ["Period Considered for the month"]},
+    "SEPC": {"keep": ["Clean Max", "CLEANMAX"]},
+}
+
+def test_filters_of_every_matching_key_combine():
+    sepc = row_filter_for("SEPCHYBRID_2025_JAN", FILTERS)
+    other = row_filter_for("ABC_2025_JAN", FILTERS)
+
+    assert sepc.keep == ("CLEAN MAX", "CLEANMAX")
+    assert sepc.drop == other.drop == ("Period Considered for the month",)
+    assert other.keep == ()
+
+def test_drop_texts_match_the_name_cell_in_any_case():
+    row_filter = RowFilter(drop=["Period Considered for the month"])
+
+    assert row_filter.drops("  PERIOD considered FOR THE MONTH: Jan ")
+    assert not row_filter.drops("ABC LTD")
+    assert row_filter.drop_markers == ("PERIOD CONSIDERED FOR THE MONTH",)
+
+def test_name_index():
+    assert name_index(WIND_HEADER, "WIND FARM OWNER") == 1
+    assert name_index(WIND_HEADER, "SOLAR ENTITY NAME") is None
+
+def test_drop_text_outside_the_name_column_keeps_the_row(tmp_path):
+    table = wind_table(["ABC LTD", "Period Considered for the month", "XYZ LTD"])
+    # Same text, but in the DISCOM column
+    table[4][2] = "Period Considered for the month"
+    pdf = FakePdf([[table]])
+
+    wind = extract_sections(str(tmp_path / "ABC_2025_JAN.pdf"), mapped=pdf,
+                            row_filter=RowFilter(drop=["Period Considered for the month"]))["wind"]
+
+    assert [row[1] for row in wind.rows] == ["ABC LTD", "XYZ LTD"]
+    assert [row[1] for row in wind.unwanted] == ["Period Considered for the month"]
+
+def test_rows_failing_the_keep_filter_are_never_aligned(tmp_path):
+    table = wind_table(["CLEAN MAX ENVIRO", "ABC LTD"])
+    # A row that can't be mapped onto the header, but isn't kept anyway
+    table.insert(4, ["3", "ABC LTD", "UGVCL", "2.1", "100", "5", "extra", "extra"])
+    pdf = FakePdf([[table]])
+
+    wind = extract_sections(str(tmp_path / "SEPC_2025_JAN.pdf"), mapped=pdf,
+                            row_filter=RowFilter(keep=["CLEAN MAX"]))["wind"]
+
+    assert [row[1] for row in wind.rows] == ["CLEAN MAX ENVIRO"]
+    assert wind.dropped == []
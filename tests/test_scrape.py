@@ -0,0 +1,40 @@
+import threading
+
+from sldc_pipeline.scrape import SiteCountdown
+
+def test_each_site_is_reported_once():
+    done = []
+    tasks = [("SITE A", 2025, "JAN"), ("SITE A", 2025, "FEB"), ("SITE B(X)", 2025, "JAN")]
+    countdown = SiteCountdown(tasks, done.append)
+
+    countdown.report("SITE C")  # nothing to fetch
+    countdown.task_done("SITE A")
+    assert done == ["SITE_C"]
+    countdown.task_done("SITE A")
+    assert done == ["SITE_C", "SITE_A"]
+
+    # SITE B's month crashed every attempt and never counted down
+    countdown.finish(["SITE A", "SITE B(X)", "SITE C"])
+
+    assert done == ["SITE_C", "SITE_A", "SITE_BX"]
+
+def test_countdown_from_many_workers():
+    done = []
+    tasks = [(f"SITE {n % 5}", 2025, month) for n, month in enumerate(["JAN", "FEB", "MAR", "APR"] * 5)]
+    countdown = SiteCountdown(tasks, done.append)
+
+    workers = [threading.Thread(target=countdown.task_done, args=(task[0],)) for task in tasks]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    countdown.finish([f"SITE {n}" for n in range(5)])
+
+    assert sorted(done) == [f"SITE_{n}" for n in range(5)]
+
+def test_without_a_hook_sites_are_still_counted():
+    countdown = SiteCountdown([("SITE A", 2025, "JAN")], None)
+    countdown.task_done("SITE A")
+    countdown.finish(["SITE A", "SITE B"])
+
+    assert countdown.reported == {"SITE A", "SITE B"}
@@ -0,0 +1,118 @@
+import random
+
+import pandas as pd
+import pytest
+
+import baseline_convert
+from conftest import FakePdf
+from sldc_pipeline.convert import convert_pdf
+from sldc_pipeline.partitions import date_string
+from sldc_pipeline.sections import MarkerMatcher, RowClassifier
+
+def test_matcher_finds_overlapping_markers():
+    matcher = MarkerMatcher(["SHARE OF WIND FARM OWNER", "WIND FARM OWNER", "SR NO", "TOTAL"])
+
+    assert matcher.find("SHARE OF WIND FARM OWNER") == {"SHARE OF WIND FARM OWNER", "WIND FARM OWNER"}
+    assert matcher.find("SR NO NAME OF WIND FARM OWNER") == {"SR NO", "WIND FARM OWNER"}
+    assert matcher.find("12 ABC LTD UGVCL") == set()
+
+def test_classifier_tags_a_row_in_one_pass():
+    tags = RowClassifier().classify(["Sr No", None, "Name of Wind Farm Owner", "DISCOM"])
+
+    assert tags.text == "SR NO NAME OF WIND FARM OWNER DISCOM"
+    assert tags.headers == {"wind"}
+    assert (tags.start, tags.total, tags.data) == (None, False, False)
+
+# ================= DIFFERENTIAL TEST =================
+
+WIND_HEADER = ["Sr No", "", "", "", "Name of Wind Farm Owner", "DISCOM", "Under REC", "",
+               "Installed Capacity", "Active Energy", "", "Reactive Energy", ""]
+SOLAR_HEADER = ["SSr No", "", "", "", "Solar Entity Name", "DISCOM", "Under REC", "",
+                "Installed Capacity", "Active Energy", "", "Reactive Energy", ""]
+NAMES = ["CLEAN MAX ENVIRO", "CLEANMAX X", "ABC LTD", "Period Considered for the month",
+         "reactive energy supplied to x", "HARSHA ENG", "TOTAL POWER LTD", None, ""]
+
+class TableGenerator:
+    """Random SLDC-like page tables: well-formed sections mixed with stray and broken rows."""
+
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+
+    def cell(self):
+        return self.random.choice(NAMES + ["12.5", "UGVCL", "", None, "  ", "3"])
+
+    def stray_row(self):
+        r = self.random.random()
+        if r < 0.06:
+            return self.random.choice([["SHARE OF WIND FARM OWNER", None, None, None],
+                                       ["x share of solar generator y", None],
+                                       ["SHARE OF WIND FARM OWNER SHARE OF SOLAR GENERATOR"]])
+        if r < 0.1:
+            return [self.random.choice(["TOTAL", "Total", None]), "", "5"]
+        if r < 0.16:
+            return list(self.random.choice([WIND_HEADER, SOLAR_HEADER]))
+        if r < 0.2:
+            return [None, None]
+        if r < 0.22:
+            return []
+        width = self.random.choice([5, 7, 8, 9, 13, 13, 13, 14])
+        first = str(self.random.randint(1, 40)) if self.random.random() < 0.85 else "x"
+        return [first] + [self.cell() for _ in range(width - 1)]
+
+    def structured(self):
+        pages = []
+        for page in range(self.random.randint(1, 3)):
+            rows = []
+            for start, header in (("SHARE OF WIND FARM OWNER", WIND_HEADER), ("SHARE OF SOLAR GENERATOR", SOLAR_HEADER)):
+                if self.random.random() >= 0.8:
+                    continue
+                if page == 0 or self.random.random() < 0.3:
+                    rows += [[start] + [None] * 5, list(header)]
+                for sr in range(1, self.random.randint(2, 9)):
+                    if self.random.random() < 0.2:
+                        rows.append(self.stray_row())
+                    else:
+                        width = self.random.choice([7, 8, 12, 12])
+                        rows.append([str(sr)] + [self.cell() for _ in range(width)])
+                if self.random.random() < 0.7:
+                    rows.append(["TOTAL", None, "1"])
+            pages.append([rows])
+        return pages
+
+    def document(self):
+        if self.random.random() < 0.6:
+            return self.structured()
+        return [
+            [[self.stray_row() for _ in range(self.random.randint(0, 25))] for _ in range(self.random.randint(0, 3))] + [None]
+            for _ in range(self.random.randint(1, 4))
+        ]
+
+class Capture:
+    """WriteBehind stand-in that keeps the sheets convert_pdf() would write."""
+
+    def __init__(self):
+        self.sheets = None
+
+    def submit(self, pdf_path, excel_path, sheets):
+        self.sheets = sheets
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("name", ["SEPCHYBRID_2025_JAN", "ABC_2025_FEB"])
+def test_extraction_matches_the_original_row_logic(seed, name, tmp_path):
+    generator = TableGenerator(seed)
+    pdf_path = str(tmp_path / f"{name}.pdf")
+    for _ in range(40):
+        pages = generator.document()
+        expected = baseline_convert.convert(pdf_path, pages, date_string(name))
+        writer = Capture()
+
+        has_data = convert_pdf(pdf_path, str(tmp_path), mapped=FakePdf(pages), writer=writer)
+
+        if expected is None or all(df.empty for df in expected.values()):
+            assert has_data is False
+            continue
+        assert has_data is True
+        expected = {sheet: df for sheet, df in expected.items() if not df.empty}
+        assert list(writer.sheets) == list(expected)
+        for sheet, df in expected.items():
+            pd.testing.assert_frame_equal(writer.sheets[sheet], df)
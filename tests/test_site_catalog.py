@@ -0,0 +1,97 @@
+import json
+import time
+
+import pytest
+
+from sldc_pipeline import site_catalog
+from sldc_pipeline.site_catalog import SiteCatalog, alias_keys, clean_options, get_catalog
+
+OPTIONS = [
+    {"name": "66 KV GHELDA(GNESL)", "value": "101"},
+    {"name": "220 KV KUTCH(ALFA)", "value": "102"},
+    {"name": "66 KV KUTCH(BETA)", "value": "103"},
+    {"name": "SEPC HYBRID", "value": "104"},
+    {"name": "SEPC", "value": "105"},
+    {"name": "110 KV SEPC", "value": "106"},
+]
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = SiteCatalog(str(tmp_path / "catalog.json"))
+    catalog.options = OPTIONS
+    return catalog
+
+def test_alias_keys_most_specific_first():
+    assert alias_keys("66 KV GHELDA(GNESL)") == ["66KVGHELDAGNESL", "GHELDAGNESL", "GHELDA"]
+    assert alias_keys("66KV_GHELDA (GNESL)") == ["66KVGHELDAGNESL", "GHELDAGNESL", "GHELDA"]
+    assert alias_keys("SEPC HYBRID") == ["SEPCHYBRID"]
+
+@pytest.mark.parametrize("name", ["66 KV GHELDA(GNESL)", "66KV_GHELDA (GNESL)", "ghelda gnesl", "GHELDA"])
+def test_spellings_of_one_site_resolve_to_it(catalog, name):
+    assert catalog.resolve(name)["value"] == "101"
+
+def test_full_name_beats_a_shorter_alias(catalog):
+    # "SEPC" is one option's full name and another's name without voltage
+    assert catalog.resolve("sepc")["value"] == "105"
+    assert catalog.resolve("110kv sepc")["value"] == "106"
+    assert catalog.resolve("SEPC-HYBRID")["value"] == "104"
+
+def test_short_name_of_two_sites_is_rejected(catalog):
+    assert catalog.resolve("KUTCH") is None
+    assert catalog.resolve("KUTCH(ALFA)")["value"] == "102"
+
+def test_near_miss_resolves_only_when_it_points_to_one_site(catalog):
+    assert catalog.resolve("GHELDA GNESSL")["value"] == "101"
+    assert catalog.resolve("KUTCHH") is None
+    assert catalog.resolve("NOWHERE") is None
+
+def test_clean_options_drops_the_placeholder():
+    assert clean_options([("-- Select --", ""), ("  66 KV\n GHELDA(GNESL) ", "101"), ("SEPC", None)]) == [
+        {"name": "66 KV GHELDA(GNESL)", "value": "101"}, {"name": "SEPC", "value": "SEPC"},
+    ]
+
+# ================= CACHE =================
+
+def write_catalog(path, fetched, options=OPTIONS):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"fetched": fetched, "options": options}, f)
+
+def test_fresh_catalog_is_not_fetched_again(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.json")
+    write_catalog(path, time.time() - 3600)
+    monkeypatch.setattr(site_catalog, "fetch_options", lambda url: pytest.fail("fetched a fresh catalog"))
+
+    assert get_catalog(path=path).options == OPTIONS
+
+def test_expired_catalog_is_fetched_and_saved(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.json")
+    write_catalog(path, time.time() - 25 * 3600)
+    monkeypatch.setattr(site_catalog, "fetch_options", lambda url: OPTIONS[:1])
+
+    assert get_catalog(path=path).options == OPTIONS[:1]
+    reloaded = SiteCatalog(path)
+    assert reloaded.options == OPTIONS[:1]
+    assert reloaded.is_fresh()
+
+def test_stale_catalog_is_kept_when_the_site_is_down(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.json")
+    fetched = time.time() - 25 * 3600
+    write_catalog(path, fetched)
+
+    def unreachable(url):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(site_catalog, "fetch_options", unreachable)
+    catalog = get_catalog(path=path)
+
+    assert catalog.options == OPTIONS
+    assert catalog.resolve("66 KV GHELDA(GNESL)")["value"] == "101"
+    assert SiteCatalog(path).fetched == fetched
+
+def test_no_catalog_and_no_site_gives_an_empty_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(site_catalog, "fetch_options", lambda url: [])
+
+    catalog = get_catalog(path=str(tmp_path / "catalog.json"))
+
+    assert catalog.options == []
+    assert catalog.resolve("GHELDA") is None
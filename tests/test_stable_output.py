@@ -0,0 +1,69 @@
+import os
+import time
+
+import pandas as pd
+
+from conftest import convert_from_tables, solar_table, wind_table
+from sldc_pipeline import convert, merge
+from sldc_pipeline.stable_output import write_excel, write_if_changed
+
+def snapshot(*folders):
+    """{path: (bytes, mtime_ns)} of every file under `folders`."""
+    files = {}
+    for folder in folders:
+        for root, _, names in os.walk(folder):
+            for name in names:
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    files[path] = (f.read(), os.stat(path).st_mtime_ns)
+    return files
+
+def test_write_if_changed_leaves_same_bytes_alone(tmp_path):
+    path = str(tmp_path / "out.json")
+
+    assert write_if_changed(path, b"{}")
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_if_changed(path, b"{}")
+    assert os.stat(path).st_mtime_ns == mtime
+    assert write_if_changed(path, b"[]")
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_same_frames_give_same_workbook_bytes(tmp_path):
+    sheets = {"Wind Energy": pd.DataFrame({"Sr No": [1, 2], "Owner": ["A", "B"]})}
+    write_excel(str(tmp_path / "a.xlsx"), sheets)
+    # openpyxl stamps the time in seconds; zip entry dates have a 2 s resolution
+    time.sleep(2.1)
+    write_excel(str(tmp_path / "b.xlsx"), sheets)
+
+    assert (tmp_path / "a.xlsx").read_bytes() == (tmp_path / "b.xlsx").read_bytes()
+
+def test_forced_rerun_rewrites_nothing(tmp_path, monkeypatch):
+    pdfs, excel, combined = tmp_path / "pdf", tmp_path / "excel", tmp_path / "combined"
+    pdfs.mkdir()
+    tables = {
+        "STABLEA_2025_JAN.pdf": [[wind_table(["OWNER A LTD", "OWNER B LTD"]) + solar_table(["SOLAR X"])]],
+        "STABLEA_2025_FEB.pdf": [[wind_table(["OWNER A LTD"])]],
+        "STABLEB_2025_JAN.pdf": [[wind_table(["OWNER C LTD"])]],
+    }
+    for name in tables:
+        # Content only matters for the hash, the tables come from `tables`
+        (pdfs / name).write_bytes(b"%PDF-1.4 " + name.encode())
+
+    convert_from_tables(monkeypatch, tables, pdfs, excel)
+    monkeypatch.setattr(merge, "EXCEL_DIR", str(excel))
+    monkeypatch.setattr(merge, "COMBINED_DIR", str(combined))
+
+    def run():
+        convert.excel_conversion(force=True)
+        merge.excel_merging(force=True, workers=1)
+
+    run()
+    first = snapshot(excel, combined)
+    assert os.path.join(excel, "STABLEA_2025_JAN.xlsx") in first
+    assert os.path.join(combined, "STABLEA_combined.xlsx") in first
+    assert os.path.join(combined, ".master", "STABLEA.parquet") in first
+
+    time.sleep(2.1)
+    run()
+
+    assert snapshot(excel, combined) == first
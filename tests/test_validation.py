@@ -0,0 +1,59 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import SOLAR_HEADER, FakePdf, solar_table, wind_table
+from sldc_pipeline import convert
+from sldc_pipeline.config import QUALITY_DIR
+from sldc_pipeline.convert import Section
+from sldc_pipeline.validation import check_section
+
+def test_check_section_with_every_row_dropped():
+    # A header and a TOTAL row but no written rows: the written frame is empty text
+    totals = [["TOTAL", "", "", "1.0", "50", "2"]]
+    section = Section(list(SOLAR_HEADER), [], totals, [], [])
+    df = pd.DataFrame(columns=SOLAR_HEADER, dtype=str)
+
+    report = check_section(section, df, False)
+
+    assert report["rows"] == 0
+    assert {check["field"]: check["extracted"] for check in report["checks"]} == {
+        "Installed Capacity": 0.0, "Active Energy": 0.0, "Reactive Energy": 0.0,
+    }
+    assert report["status"] == "mismatch"
+
+def test_section_emptied_by_drop_text_still_writes_workbook(tmp_path):
+    pdf = FakePdf([[wind_table(["OWNER A LTD", "OWNER B LTD"]) + solar_table(["Period Considered for the month"])]])
+
+    assert convert.convert_pdf(str(tmp_path / "SITEA_2025_JAN.pdf"), str(tmp_path), mapped=pdf)
+
+    with pd.ExcelFile(tmp_path / "SITEA_2025_JAN.xlsx") as book:
+        assert book.sheet_names == ["Wind Energy"]
+    with open(os.path.join(QUALITY_DIR, "SITEA_2025_JAN.json"), encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["sections"]["wind"]["status"] == "ok"
+    assert report["sections"]["solar"]["rows"] == 0
+
+def test_failed_report_does_not_block_workbook(tmp_path, monkeypatch):
+    def broken_report(*args, **kwargs):
+        raise ValueError("broken check")
+
+    monkeypatch.setattr(convert, "write_report", broken_report)
+    pdf = FakePdf([[wind_table(["OWNER A LTD"])]])
+
+    assert convert.convert_pdf(str(tmp_path / "SITEB_2025_JAN.pdf"), str(tmp_path), mapped=pdf)
+    assert (tmp_path / "SITEB_2025_JAN.xlsx").exists()
+
+@pytest.mark.parametrize("owners", [["OWNER A LTD"], ["OWNER A LTD", "OWNER B LTD", "OWNER C LTD"]])
+def test_report_ok_when_rows_add_up(tmp_path, owners):
+    pdf = FakePdf([[wind_table(owners)]])
+    name = f"SITEC{len(owners)}_2025_FEB"
+
+    assert convert.convert_pdf(str(tmp_path / f"{name}.pdf"), str(tmp_path), mapped=pdf)
+
+    with open(os.path.join(QUALITY_DIR, f"{name}.json"), encoding="utf-8") as f:
+        wind = json.load(f)["sections"]["wind"]
+    assert wind["status"] == "ok"
+    assert wind["last_sr_no"] == len(owners)
@@ -0,0 +1,55 @@
+import os
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from conftest import convert_from_tables, wind_table
+from sldc_pipeline import convert
+from sldc_pipeline.pdf_store import PdfStore
+from sldc_pipeline.write_behind import WriteBehind
+
+PDFS = ["SITEA_2025_JAN.pdf", "SITEA_2025_FEB.pdf", "SITEA_2025_MAR.pdf"]
+
+def leftovers(folder):
+    return [name for name in os.listdir(folder) if name.endswith(".tmp")]
+
+def test_failed_write_is_retried_on_the_next_run(tmp_path, monkeypatch):
+    pdfs, excel = tmp_path / "pdf", tmp_path / "excel"
+    pdfs.mkdir()
+    for name in PDFS:
+        (pdfs / name).write_bytes(b"%PDF-1.4 " + name.encode())
+    store = PdfStore(str(tmp_path / "store"))
+    convert_from_tables(monkeypatch, {name: [[wind_table(["OWNER A LTD"])]] for name in PDFS}, pdfs, excel, store)
+    # One write at a time: each submit() waits for the previous one
+    monkeypatch.setattr(convert, "WriteBehind", partial(WriteBehind, max_pending=1))
+    # A directory where the FEB workbook goes: its write fails in the writer process
+    (excel / "SITEA_2025_FEB.xlsx").mkdir(parents=True)
+
+    convert.excel_conversion()
+
+    assert sorted(store.index["converted"]) == ["SITEA_2025_JAN.pdf", "SITEA_2025_MAR.pdf"]
+    assert (excel / "SITEA_2025_MAR.xlsx").is_file()
+    assert leftovers(excel) == []
+
+    (excel / "SITEA_2025_FEB.xlsx").rmdir()
+    convert.excel_conversion()
+
+    assert sorted(store.index["converted"]) == sorted(PDFS)
+    assert (excel / "SITEA_2025_FEB.xlsx").is_file()
+    assert leftovers(excel) == []
+
+def test_pending_writes_are_flushed_when_the_loop_fails(tmp_path):
+    sheets = {"Wind Energy": pd.DataFrame({"Sr No": ["1"], "Owner": ["A"]})}
+    done = []
+
+    with pytest.raises(RuntimeError):
+        with WriteBehind(on_done=lambda key, changed, error: done.append((key, changed, error)),
+                         workers=1, max_pending=2) as writer:
+            for n in range(3):
+                writer.submit(n, str(tmp_path / f"book{n}.xlsx"), sheets)
+            raise RuntimeError("parser crashed")
+
+    # Reported in submission order, every workbook on disk
+    assert done == [(0, True, None), (1, True, None), (2, True, None)]
+    assert sorted(os.listdir(tmp_path)) == ["book0.xlsx", "book1.xlsx", "book2.xlsx"]